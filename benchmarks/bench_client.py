@@ -0,0 +1,92 @@
+"""End-to-end client benchmark against the local Dog API stub.
+
+Measures throughput and tail latency of search, get_images and
+save_all at several concurrency levels.
+
+Usage: python benchmarks/bench_client.py [--latency 0.02] [--calls 200]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# the checkout is imported, not an installed copy of catdog
+sys.path.insert(0, os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))))
+from catdog import DogApi  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from stub_server import run_server  # noqa: E402
+
+
+def percentile(samples, fraction):
+    """Get percentile of sorted samples."""
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def run_calls(func, calls, concurrency):
+    """Run func calls times using concurrency threads.
+
+    :return: Elapsed seconds and sorted per-call latencies.
+    :rtype: tuple
+    """
+    def timed(index):
+        start = time.perf_counter()
+        func(index)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = sorted(executor.map(timed, range(calls)))
+    return time.perf_counter() - start, latencies
+
+
+def report(name, concurrency, calls, elapsed, latencies):
+    """Print benchmark row."""
+    print('%-10s %5d %9.1f %9.2f %9.2f %9.2f' % (
+        name, concurrency, calls / elapsed,
+        percentile(latencies, 0.50) * 1000,
+        percentile(latencies, 0.95) * 1000,
+        percentile(latencies, 0.99) * 1000))
+
+
+def main():
+    """Run the benchmark and print results."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, nargs='+',
+                        default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    server, url = run_server(latency=args.latency, images=args.calls * 25)
+    print('%-10s %5s %9s %9s %9s %9s' % (
+        'endpoint', 'conc', 'calls/s', 'p50 ms', 'p95 ms', 'p99 ms'))
+
+    for concurrency in args.concurrency:
+        api = DogApi('bench-key', base_url=url, pool_maxsize=concurrency)
+
+        elapsed, latencies = run_calls(
+            lambda index: api.search(limit=25), args.calls, concurrency)
+        report('search', concurrency, args.calls, elapsed, latencies)
+
+        elapsed, latencies = run_calls(
+            lambda index: api.get_images(limit=25, page=index),
+            args.calls, concurrency)
+        report('get_images', concurrency, args.calls, elapsed, latencies)
+
+        dogs = api.get_images(limit=args.calls)
+        with tempfile.TemporaryDirectory() as out_dir:
+            results = api.save_all(dogs, out_dir=out_dir + '/',
+                                   workers=concurrency)
+        report('save_all', concurrency, len(results), results.elapsed,
+               sorted(result.duration for result in results))
+        api.close()
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""CPU benchmark of decoding search pages into Dog objects.
+
+Compares the old resp.json() + Model(**data) path with the decoder
+hook and Model.from_dict for every installed JSON backend.
+
+Usage: python benchmarks/bench_decode.py [page_size] [rounds]
+"""
+import json
+import os
+import sys
+import time
+
+# the checkout is imported, not an installed copy of catdog
+sys.path.insert(0, os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))))
+from catdog import Animal, Breed, Category, Dog, DogApi  # noqa: E402
+from catdog.decoders import LOADS  # noqa: E402
+
+BREED = {
+    'id': 1, 'name': 'Affenpinscher', 'bred_for': 'Small rodent hunting',
+    'breed_group': 'Toy', 'life_span': '10 - 12 years',
+    'temperament': 'Stubborn, Curious, Playful, Adventurous, Active',
+    'weight': {'imperial': '6 - 13', 'metric': '3 - 6'},
+    'height': {'imperial': '9 - 11.5', 'metric': '23 - 29'}
+}
+
+
+def make_page(page_size):
+    """Compose search response body.
+
+    :return body: JSON encoded page.
+    :rtype: bytes
+    """
+    return json.dumps([
+        {'id': 'img%d' % i, 'width': 640, 'height': 480,
+         'url': 'https://cdn2.thedogapi.com/images/img%d.jpg' % i,
+         'breeds': [dict(BREED, id=i % 170)],
+         'categories': [{'id': 5, 'name': 'boxes'}]}
+        for i in range(page_size)
+    ]).encode('utf-8')
+
+
+def legacy_process_response(resp_data):
+    """Dog construction as it was done before the decoder hook."""
+    breeds = [Breed(**breed) for breed in resp_data.get('breeds') or []]
+    animals = [Animal(**animal) for animal in resp_data.get('animals') or []]
+    categories = [Category(**category)
+                  for category in resp_data.get('categories') or []]
+    return Dog(id=resp_data['id'], url=resp_data['url'],
+               image_width=resp_data['width'],
+               image_height=resp_data['height'],
+               breeds=breeds, animals=animals, categories=categories)
+
+
+def run(decode, body, rounds):
+    """Time decode over the body.
+
+    :return elapsed: Elapsed seconds.
+    :rtype: float
+    """
+    start = time.perf_counter()
+    for _ in range(rounds):
+        decode(body)
+    return time.perf_counter() - start
+
+
+def main(page_size=100, rounds=500):
+    """Run the benchmark and print results."""
+    body = make_page(page_size)
+    process_response = DogApi.process_response
+
+    cases = [('legacy', lambda data: [
+        legacy_process_response(dog)
+        for dog in json.loads(data.decode('utf-8'))
+    ])]
+    for name, loads in sorted(LOADS.items()):
+        cases.append((name, lambda data, loads=loads: [
+            process_response(dog) for dog in loads(data)
+        ]))
+
+    for name, decode in cases:
+        elapsed = run(decode, body, rounds)
+        print('%-7s %9.1f dogs/s  %.2f ms/page' % (
+            name, page_size * rounds / elapsed, elapsed / rounds * 1000))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,73 @@
+"""Benchmark of DogFrame analytics against loops over Dog objects.
+
+Usage: python benchmarks/bench_frame.py [count]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+# the checkout is imported, not an installed copy of catdog
+sys.path.insert(0, os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))))
+from catdog import Breed, Dog  # noqa: E402
+from catdog.frame import DogFrame  # noqa: E402
+
+BREEDS = [Breed(id=i, name='Breed %d' % i, breed_group='Toy')
+          for i in range(1, 173)]
+
+
+def make_dogs(count):
+    """Build count dogs with one or two breeds each."""
+    return [
+        Dog(id='img%d' % i, url='https://cdn2.thedogapi.com/%d.jpg' % i,
+            image_width=400 + i % 800, image_height=300 + i % 600,
+            breeds=BREEDS[i % 172:i % 172 + 1 + i % 2], animals=[],
+            categories=[])
+        for i in range(count)
+    ]
+
+
+def loop_stats(dogs):
+    """Aspect ratio histogram and per-breed counts with Python loops."""
+    breed_counts = Counter()
+    histogram = [0] * 10
+    for dog in dogs:
+        ratio = dog.image_width / dog.image_height
+        histogram[min(9, int((ratio - 0.5) / 0.25))] += 1
+        for breed in dog.breeds:
+            breed_counts[breed.id] += 1
+    return histogram, breed_counts
+
+
+def frame_stats(frame):
+    """Aspect ratio histogram and per-breed counts with DogFrame."""
+    return (DogFrame.histogram(frame.aspect_ratios, 10, (0.5, 3.0)),
+            frame.breed_counts())
+
+
+def main(count=200000):
+    """Run the benchmark and print results."""
+    tracemalloc.start()
+    dogs = make_dogs(count)
+    dogs_size, _ = tracemalloc.get_traced_memory()
+    frame = DogFrame.from_dogs(dogs)
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    loop_stats(dogs)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame_stats(frame)
+    frame_time = time.perf_counter() - start
+
+    print('objects %8.1f bytes/row  stats %.3fs' % (
+        dogs_size / count, loop_time))
+    print('frame   %8.1f bytes/row  stats %.3fs' % (
+        frame.nbytes / count, frame_time))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
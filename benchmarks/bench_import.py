@@ -0,0 +1,70 @@
+"""Import time benchmark of catdog entry points.
+
+Runs every statement in a fresh interpreter with -X importtime and
+reports the time spent on imports it triggered. Exits with status 1
+if a statement exceeds its budget.
+
+Usage: python benchmarks/bench_import.py [rounds]
+"""
+import os
+import subprocess
+import sys
+
+# statement -> import time budget in milliseconds, None for no budget
+STATEMENTS = [
+    ('import catdog', 5),
+    ('from catdog import Dog, Breed', 10),
+    ('from catdog.sink import iter_models', 30),
+    ('from catdog import DogApi', None),
+    ('from catdog import AsyncDogApi', None)
+]
+
+
+def import_time(statement):
+    """Measure import time of the statement in a fresh interpreter.
+
+    :param statement: Python statement.
+    :type statement: str
+
+    :return elapsed: Cumulative time of triggered imports in seconds.
+    :rtype: float
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement], env=env,
+        stderr=subprocess.PIPE, check=True, universal_newlines=True
+    ).stderr
+
+    # top level imports that come after interpreter startup
+    total = 0
+    started = False
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if name.startswith('  '):
+            continue
+        if started:
+            total += int(cumulative)
+        elif name.strip() == 'site':
+            started = True
+    return total / 1e6
+
+
+def main(rounds=5):
+    """Run the benchmark and print results."""
+    failed = False
+    for statement, budget in STATEMENTS:
+        elapsed = min(import_time(statement) for _ in range(rounds))
+        over = budget is not None and elapsed * 1000 > budget
+        failed = failed or over
+        print('%-40s %7.1f ms  budget %s%s' % (
+            statement, elapsed * 1000,
+            '%d ms' % budget if budget is not None else '-',
+            '  OVER' if over else ''))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(arg) for arg in sys.argv[1:]]))
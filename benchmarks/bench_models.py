@@ -0,0 +1,88 @@
+"""Memory benchmark of slotted models against dict-backed ones.
+
+Usage: python benchmarks/bench_models.py [count]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+# the checkout is imported, not an installed copy of catdog
+sys.path.insert(0, os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))))
+from catdog import Breed, Dog  # noqa: E402
+
+
+class LegacyDog(object):
+    """Dict-backed Dog model, as it was before slotted models."""
+
+    def __init__(self, **kwargs):
+        """."""
+        self.__dict__.update(kwargs)
+
+    def __getattr__(self, key):
+        """."""
+        return None
+
+
+class LegacyBreed(LegacyDog):
+    """Dict-backed Breed model."""
+
+    pass
+
+
+BREED = {
+    'id': 1, 'name': 'Affenpinscher', 'bred_for': 'Small rodent hunting',
+    'breed_group': 'Toy', 'life_span': '10 - 12 years',
+    'temperament': 'Stubborn, Curious, Playful, Adventurous, Active',
+    'weight': {'imperial': '6 - 13', 'metric': '3 - 6'},
+    'height': {'imperial': '9 - 11.5', 'metric': '23 - 29'}
+}
+
+
+def build(dog_cls, breed_cls, count):
+    """Build count dogs with one nested breed each.
+
+    :return: Built dogs, allocated bytes and elapsed seconds.
+    :rtype: tuple
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    dogs = [
+        dog_cls(id='img%d' % i, url='https://cdn2.thedogapi.com/%d.jpg' % i,
+                image_width=640, image_height=480,
+                breeds=[breed_cls(**BREED)], animals=[], categories=[])
+        for i in range(count)
+    ]
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dogs, size, elapsed
+
+
+def access(dogs):
+    """Time attribute access over all dogs.
+
+    :return elapsed: Elapsed seconds.
+    :rtype: float
+    """
+    start = time.perf_counter()
+    for dog in dogs:
+        dog.image_width
+        dog.breeds[0].temperament
+    return time.perf_counter() - start
+
+
+def main(count=100000):
+    """Run the benchmark and print results."""
+    for name, dog_cls, breed_cls in (('legacy', LegacyDog, LegacyBreed),
+                                     ('slots', Dog, Breed)):
+        dogs, size, build_time = build(dog_cls, breed_cls, count)
+        access_time = access(dogs)
+        print('%-7s %8.1f bytes/dog  build %.3fs  access %.3fs' % (
+            name, size / count, build_time, access_time))
+        del dogs
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,228 @@
+"""Local stub of the Dog API for benchmarks.
+
+Serves realistic payloads for search, images, breeds, favourites and
+votes endpoints plus image files, with configurable response latency.
+
+Usage: python benchmarks/stub_server.py [--port 8080] [--latency 0.02]
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TEMPERAMENTS = ['Stubborn', 'Curious', 'Playful', 'Adventurous', 'Active',
+                'Loyal', 'Friendly', 'Alert', 'Dignified', 'Independent']
+GROUPS = ['Toy', 'Hound', 'Working', 'Terrier', 'Herding', 'Sporting']
+
+
+def make_breed(breed_id):
+    """Compose breed payload.
+
+    :param breed_id: Breed identificator.
+    :type breed_id: int
+
+    :return breed: Breed data.
+    :rtype: dict
+    """
+    rnd = random.Random(breed_id)
+    low = rnd.randint(2, 40)
+    return {
+        'id': breed_id,
+        'name': 'Breed %d' % breed_id,
+        'bred_for': 'Companionship',
+        'breed_group': rnd.choice(GROUPS),
+        'life_span': '%d - %d years' % (low // 4 + 8, low // 4 + 12),
+        'temperament': ', '.join(rnd.sample(TEMPERAMENTS, 4)),
+        'reference_image_id': 'ref%d' % breed_id,
+        'weight': {'imperial': '%d - %d' % (low * 2, low * 3),
+                   'metric': '%d - %d' % (low, low * 3 // 2)},
+        'height': {'imperial': '%d - %d' % (low // 2 + 8, low // 2 + 12),
+                   'metric': '%d - %d' % (low + 20, low + 30)}
+    }
+
+
+class StubState(object):
+    """Catalog served by the stub server."""
+
+    def __init__(self, base_url, images=1000, breeds=172, image_size=50000):
+        """StubState object init.
+
+        :param base_url: Url of the server, used in image urls.
+        :type base_url: str
+
+        :param images: Number of images in the catalog.
+        :type images: int
+
+        :param breeds: Number of breeds.
+        :type breeds: int
+
+        :param image_size: Size of served image files in bytes.
+        :type image_size: int
+        """
+        self.breeds = [make_breed(i) for i in range(1, breeds + 1)]
+        self.images = [{
+            'id': 'img%05d' % i,
+            'url': '%s/images/img%05d.jpg' % (base_url, i),
+            'width': 400 + i % 800,
+            'height': 300 + i % 600,
+            'breeds': [self.breeds[i % breeds]],
+            'categories': []
+        } for i in range(images)]
+        self.image_index = {image['id']: image for image in self.images}
+        self.image_body = b'\xff\xd8\xff' + b'\0' * (image_size - 3)
+        self.votes = []
+        self.favourites = []
+        self.lock = threading.Lock()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Dog API stub handler."""
+
+    protocol_version = 'HTTP/1.1'
+    # headers and body are separate writes, avoid delayed ACK stalls
+    disable_nagle_algorithm = True
+
+    # set by run_server
+    state = None
+    latency = 0.0
+
+    def send_json(self, data, status=200):
+        """Send JSON response."""
+        body = json.dumps(data).encode('utf-8')
+        self.send_body(body, 'application/json', status)
+
+    def send_body(self, body, content_type, status=200):
+        """Send response with the body."""
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def page(self, items, query, default_limit=1):
+        """Get page of items according to limit and page query params."""
+        limit = int(query.get('limit', [default_limit])[0])
+        page = int(query.get('page', [0])[0])
+        return items[page * limit:(page + 1) * limit]
+
+    def do_GET(self):
+        """."""
+        if self.latency:
+            time.sleep(self.latency)
+        state = self.state
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        route = url.path.rstrip('/')
+
+        if route.startswith('/images/'):
+            self.send_body(state.image_body, 'image/jpeg')
+        elif route == '/v1/images/search':
+            if query.get('order', ['RANDOM'])[0] == 'RANDOM':
+                limit = int(query.get('limit', [1])[0])
+                self.send_json(random.sample(state.images, limit))
+            else:
+                self.send_json(self.page(state.images, query))
+        elif route == '/v1/images':
+            self.send_json(self.page(state.images, query))
+        elif re.match(r'^/v1/images/[^/]+/breeds$', route):
+            image = state.image_index.get(route.split('/')[3])
+            self.send_json(image['breeds'] if image else [])
+        elif route.startswith('/v1/images/'):
+            image = state.image_index.get(route.split('/')[-1])
+            if image is None:
+                self.send_json({'message': 'not found'}, 404)
+            else:
+                self.send_json(image)
+        elif route == '/v1/breeds':
+            self.send_json(self.page(state.breeds, query,
+                                     len(state.breeds)))
+        elif route.startswith('/v1/breeds/'):
+            breed_id = int(route.split('/')[-1])
+            self.send_json(state.breeds[(breed_id - 1) % len(state.breeds)])
+        elif route == '/v1/favourites':
+            self.send_json(state.favourites)
+        elif route == '/v1/votes':
+            self.send_json(state.votes)
+        else:
+            self.send_json({'message': 'not found'}, 404)
+
+    def do_POST(self):
+        """."""
+        if self.latency:
+            time.sleep(self.latency)
+        state = self.state
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        route = urlparse(self.path).path.rstrip('/')
+        fields = {key: values[0] for key, values in
+                  parse_qs(body.decode('utf-8', 'replace')).items()}
+
+        if route in ('/v1/favourites', '/v1/votes'):
+            target = state.favourites if route == '/v1/favourites' \
+                else state.votes
+            with state.lock:
+                fields['id'] = len(target) + 1
+                target.append(fields)
+            self.send_json({'message': 'SUCCESS', 'id': fields['id']})
+        elif route == '/v1/images/upload':
+            self.send_json({'id': 'upl%d' % len(body), 'approved': 1})
+        else:
+            self.send_json({'message': 'not found'}, 404)
+
+    def do_DELETE(self):
+        """."""
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_json({'message': 'SUCCESS'})
+
+    def log_message(self, *args):
+        """."""
+        pass
+
+
+def run_server(port=0, latency=0.0, **state_kwargs):
+    """Start stub server in a background thread.
+
+    :param port: Port to listen on, random free one by default.
+    :type port: int
+
+    :param latency: Delay added to every response in seconds.
+    :type latency: float
+
+    :return: Running server and its url.
+    :rtype: tuple
+    """
+    handler = type('Handler', (StubHandler,), {'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    url = 'http://127.0.0.1:%d' % server.server_port
+    handler.state = StubState(url, **state_kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, url
+
+
+def main():
+    """Run stub server until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--images', type=int, default=1000)
+    parser.add_argument('--image-size', type=int, default=50000)
+    args = parser.parse_args()
+
+    server, url = run_server(args.port, args.latency, images=args.images,
+                             image_size=args.image_size)
+    print('Serving Dog API stub on %s' % url)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,41 @@
-"""."""
-from .cat import CatApi
-from .dog import DogApi
-from .models import Animal, Breed, Category, Dog
+"""Unofficial Python3 wrapper for the Cat and Dog APIs.
+
+Names are imported from their modules on first access, so importing
+models doesn't pull in the HTTP stack.
+"""
+from importlib import import_module
+
+# public name -> module that defines it
+EXPORTS = {
+    'AsyncCatApi': '.aio',
+    'CatApi': '.cat',
+    'BreedCatalog': '.catalog',
+    'AsyncDogApi': '.aio',
+    'DogApi': '.dog',
+    'Animal': '.models',
+    'Breed': '.models',
+    'Cat': '.models',
+    'Category': '.models',
+    'Dog': '.models'
+}
+
+__all__ = sorted(EXPORTS)
+
+
+def __getattr__(name):
+    """Import public name from its module on first access."""
+    try:
+        module = EXPORTS[name]
+    except KeyError:
+        raise AttributeError(
+            "module %r has no attribute %r" % (__name__, name))
+    value = getattr(import_module(module, __name__), name)
+
+    # later lookups don't go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """."""
+    return sorted(set(globals()) | set(EXPORTS))
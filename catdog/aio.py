@@ -0,0 +1,582 @@
+"""Asyncio clients module.
+
+aiohttp and asyncio take long to import, so this module is imported only
+when an async client is used.
+"""
+import asyncio
+import time
+from functools import partial
+from os import path
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .api import API, CHUNK_SIZE, BulkReport, make_save_result
+from .cat import CatApi
+from .dog import DogApi
+from .exceptions import (NotAValidDirectory, ProbeError,
+                         UnsupportedRequestType)
+from .probe import (MAX_PROBE_BYTES, PROBE_BYTES, make_probe_result,
+                    next_probe_size)
+from .storage import AtomicWriter, content_length
+from .transport import RawResponse
+
+
+class AsyncSingleFlight(object):
+    """Coalesces identical concurrent calls made from coroutines."""
+
+    def __init__(self):
+        """AsyncSingleFlight object init."""
+        self.calls = {}
+        self.coalesced = 0
+
+    async def do(self, key, func):
+        """Await func unless a call with the same key is in flight.
+
+        :param key: Call key.
+        :type key: hashable
+
+        :param func: Coroutine function to call.
+        :type func: callable
+
+        :return result: Result of the shared call.
+        :rtype: any
+        """
+        task = self.calls.get(key)
+        if task is None:
+            task = self.calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self.calls.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        # cancellation of one waiter must not cancel the shared call
+        return await asyncio.shield(task)
+
+
+class AsyncAPI(API):
+    """Asyncio API class.
+
+    Every endpoint method of a child class returns an awaitable.
+    """
+
+    single_flight_class = AsyncSingleFlight
+
+    def __init__(self, *args, max_concurrency=100, limit_per_host=None,
+                 **kwargs):
+        """AsyncAPI object init.
+
+        :param max_concurrency: Max number of in-flight requests.
+        :type max_concurrency: int
+
+        :param limit_per_host: Max number of connections per host,
+                               max_concurrency by default since all
+                               requests go to the API host.
+        :type limit_per_host: int
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for async clients!")
+
+        self.max_concurrency = max_concurrency
+        self.limit_per_host = limit_per_host or max_concurrency
+
+        # session and semaphore have to be created inside the event loop
+        self.semaphore = None
+        self.headers = None
+        super().__init__(*args, **kwargs)
+
+    def create_session(self, headers=None):
+        """Postpone session creation until the first request.
+
+        :param headers: Default headers sent with every request.
+        :type headers: dict
+        """
+        self.headers = self.default_headers(headers)
+        return None
+
+    def create_transport(self, transport=None):
+        """Async clients always send requests over aiohttp session.
+
+        :param transport: Has to be None.
+        :type transport: transport.Transport
+        """
+        if transport is not None:
+            raise NotImplementedError(
+                "Transports are only supported by sync clients.")
+        return None
+
+    def get_session(self):
+        """Get aiohttp session, creating it on first use and after close.
+
+        :returns session: Session bound to the running event loop.
+        :rtype: aiohttp.ClientSession
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.limit_per_host,
+                force_close=not self.keep_alive
+            )
+            self.session = aiohttp.ClientSession(connector=connector,
+                                                 headers=self.headers)
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self.session
+
+    def connection_stats(self):
+        """Connection stats are not tracked by aiohttp."""
+        raise NotImplementedError
+
+    async def close(self):
+        """Close all pooled connections and opened files."""
+        self.close_files()
+        if self.session is not None:
+            await self.session.close()
+
+    async def __aenter__(self):
+        """."""
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """."""
+        await self.close()
+
+    async def make_request(self, req_type, url, headers=None, params=None,
+                           data=None, files=None, endpoint=None):
+        """Make request to remote API server.
+
+        :param req_type: Request type.
+        :type req_type: str
+
+        :param url: Link to remote resource.
+        :type url: str
+
+        :param headers: Request headers.
+        :type headers: dict
+
+        :param params: Query params to a request.
+        :type params: dict
+
+        :param data: Request payload.
+        :type data: dict
+
+        :param files: Files to upload.
+        :type files: dict
+
+        :param endpoint: Endpoint name used in metrics.
+        :type endpoint: str
+
+        :returns Response from the remote server.
+        :rtype RawResponse object
+        """
+        if self.single_flight is not None and req_type == 'get':
+            # identical concurrent GETs share a single network call
+            return await self.single_flight.do(
+                self.request_key(url, headers, params),
+                lambda: self.send_request(req_type, url, headers, params,
+                                          endpoint=endpoint)
+            )
+        return await self.send_request(req_type, url, headers, params, data,
+                                       files, endpoint)
+
+    async def send_request(self, req_type, url, headers=None, params=None,
+                           data=None, files=None, endpoint=None):
+        """Send request, retrying it according to the retry policy.
+
+        Takes the same arguments as make_request.
+
+        :returns Response from the remote server.
+        :rtype RawResponse object
+        """
+        if req_type not in ('get', 'post', 'delete'):
+            raise UnsupportedRequestType(
+                "API only supports get, post, delete request types.")
+
+        # aiohttp only accepts string query values
+        query = self.default_params()
+        query.update({key: str(value) for key, value in
+                      (params or {}).items()})
+
+        if isinstance(data, dict):
+            data = {key: str(value) for key, value in data.items()}
+
+        # send stored response validators with the request
+        cache_key = cached = None
+        if self.disk_cache is not None and req_type == 'get':
+            cache_key, cached, headers = self.lookup_disk_cache(
+                url, params, headers)
+
+        if files:
+            # compose multipart body from payload and files
+            form = aiohttp.FormData()
+            for key, value in (data or {}).items():
+                form.add_field(key, str(value))
+            for key, value in files.items():
+                form.add_field(key, value)
+            data = form
+
+        session = self.get_session()
+        start = time.monotonic()
+        attempt = 0
+        waited = 0
+        while True:
+            if self.rate_limiter is not None:
+                await asyncio.sleep(self.rate_limiter.reserve())
+
+            try:
+                async with self.semaphore:
+                    async with session.request(
+                            req_type, url, headers=headers, params=query,
+                            data=data) as resp:
+                        content = await resp.read()
+                        raw = RawResponse(resp.status, dict(resp.headers),
+                                          content, str(resp.url))
+            except (aiohttp.ClientConnectionError,
+                    asyncio.TimeoutError) as exc:
+                delay = self.retry.next_delay(req_type, attempt, waited)
+                if delay is None:
+                    self.observe(endpoint, None, start, retries=attempt)
+                    raise
+                self.logger.debug("Retrying %s in %.2fs: %s",
+                                  url, delay, exc)
+            else:
+                delay = self.retry.next_delay(
+                    req_type, attempt, waited, raw.status_code,
+                    raw.headers.get('Retry-After'))
+                if delay is None:
+                    break
+                self.logger.debug("Retrying %s in %.2fs: %d status code",
+                                  url, delay, raw.status_code)
+            await asyncio.sleep(delay)
+            waited += delay
+            attempt += 1
+
+        self.observe(endpoint, raw.status_code, start, len(raw.content),
+                     attempt)
+        if cache_key is not None:
+            raw = self.update_disk_cache(cache_key, cached, raw)
+        self.parse_status_code(raw.status_code)
+        return raw
+
+    async def dispatch(self, req_type, url, callback=None, endpoint=None,
+                       invalidates=None, **kwargs):
+        """Make request and pass the response to callback.
+
+        :param req_type: Request type.
+        :type req_type: str
+
+        :param url: Link to remote resource.
+        :type url: str
+
+        :param callback: Function that converts the response.
+        :type callback: callable
+
+        :param endpoint: Name of the called endpoint.
+        :type endpoint: str
+
+        :param invalidates: (endpoint, url) pairs which cached responses
+                            become stale after the request.
+        :type invalidates: list
+
+        :returns result: Callback result or the response itself.
+        :rtype: any
+        """
+        key = self.cache_key(req_type, url, endpoint, kwargs.get('params'))
+        resp = self.cache.get(key) if key else None
+        if resp is None:
+            resp = await self.make_request(req_type, url, endpoint=endpoint,
+                                           **kwargs)
+            if key:
+                self.cache.set(key, resp, len(resp.content))
+        self.invalidate(invalidates)
+
+        if callback is None:
+            return resp
+        return callback(resp)
+
+    async def save(self, obj, out_dir='./', max_bytes=None,
+                   chunk_size=CHUNK_SIZE, buffered=False):
+        """Save the model to the filesystem.
+
+        :param out_dir: Output directory.
+        :type out_dir: str
+
+        :param max_bytes: Max allowed image size.
+        :type max_bytes: int
+
+        :param chunk_size: Size of chunks read from the network.
+        :type chunk_size: int
+
+        :param buffered: Keep model without url in the sink buffer until
+                         flush is called.
+        :type buffered: bool
+
+        :raises NotADirectoryError if provided out_dir is not directory
+        :raises DownloadError if image is bigger than max_bytes or
+                              it is truncated
+
+        :return: Output file location and number of written bytes.
+        :rtype: tuple
+        """
+        if not path.isdir(out_dir):
+            raise NotAValidDirectory(
+                "Either %s is not a directory or you don't access to it."
+                % out_dir
+            )
+        if not obj.url:
+            return super().save(obj, out_dir=out_dir, buffered=buffered)
+
+        # compose out_file location string
+        out_file_loc = self.layout.path(out_dir, obj.url.split('/')[-1])
+
+        # skip images saved by earlier runs
+        entry = self.lookup_manifest(obj, out_file_loc)
+        if entry is not None:
+            return out_file_loc, entry.size
+
+        if self.rate_limiter is not None:
+            await asyncio.sleep(self.rate_limiter.reserve())
+
+        # stream file from remote server to disk, the manifest records it
+        # once the file is at its destination
+        on_commit = partial(self.update_manifest, obj)
+        session = self.get_session()
+        start = time.monotonic()
+        async with self.semaphore:
+            async with session.get(obj.url) as resp:
+                self.observe('save', resp.status, start,
+                             content_length(resp.headers))
+                self.parse_status_code(resp.status)
+                with AtomicWriter(out_file_loc, max_bytes,
+                                  content_length(resp.headers),
+                                  self.manifest is not None,
+                                  self.sync_batch, on_commit) as writer:
+                    async for chunk in resp.content.iter_chunked(chunk_size):
+                        writer.write(chunk)
+        return out_file_loc, writer.size
+
+    async def save_all(self, obj_list, out_dir="./", workers=10, **kwargs):
+        """Save all dogs images concurrently.
+
+        :param obj_list: List that contain objects.
+        :type obj_list: iterable
+
+        :param out_dir: Directory where to save images.
+        :type our_dir: str
+
+        :param workers: Number of parallel downloads.
+        :type workers: int
+
+        :param kwargs: Extra arguments passed to save.
+        :type kwargs: dict
+
+        :return report: Save result per object, in input order.
+        :rtype: BulkReport
+        """
+        report = await self.bulk_report(
+            lambda obj: self.save(obj, out_dir=out_dir, buffered=True,
+                                  **kwargs),
+            obj_list, make_save_result, workers=workers
+        )
+        self.flush()
+        return report
+
+    async def probe(self, obj, probe_bytes=PROBE_BYTES,
+                    max_bytes=MAX_PROBE_BYTES):
+        """Detect image format and dimensions without full download.
+
+        :param obj: Model with image url.
+        :type obj: models.Model
+
+        :param probe_bytes: Number of bytes fetched by the first request.
+        :type probe_bytes: int
+
+        :param max_bytes: Max number of bytes to fetch.
+        :type max_bytes: int
+
+        :raises ProbeError if the format is unknown or the header is not
+                           found within max_bytes
+
+        :return: Image info and number of fetched bytes.
+        :rtype: tuple
+        """
+        if not obj.url:
+            raise ProbeError("%s has no image url" % obj)
+
+        session = self.get_session()
+        data = b''
+        fetched = 0
+        size = probe_bytes
+        while True:
+            if self.rate_limiter is not None:
+                await asyncio.sleep(self.rate_limiter.reserve())
+
+            start = time.monotonic()
+            chunk = b''
+            async with self.semaphore:
+                async with session.get(obj.url, headers={
+                        'Range': 'bytes=%d-%d' % (len(data), size - 1)
+                }) as resp:
+                    self.observe('probe', resp.status, start,
+                                 content_length(resp.headers))
+                    self.parse_status_code(resp.status)
+                    async for part in resp.content.iter_chunked(size):
+                        chunk += part
+                        if len(chunk) >= size:
+                            break
+            fetched += len(chunk)
+
+            # servers that ignore Range send the image from the start
+            data = data + chunk if resp.status == 206 else chunk[:size]
+            info, size = next_probe_size(obj.url, data, size, max_bytes,
+                                         len(data) < size)
+            if size is None:
+                return info, fetched
+
+    async def probe_all(self, obj_list, workers=10, **kwargs):
+        """Probe format and dimensions of all images concurrently.
+
+        :param obj_list: List that contain objects.
+        :type obj_list: iterable
+
+        :param workers: Number of parallel probes.
+        :type workers: int
+
+        :param kwargs: Extra arguments passed to probe.
+        :type kwargs: dict
+
+        :return report: Probe result per object, in input order.
+        :rtype: BulkReport
+        """
+        return await self.bulk_report(
+            lambda obj: self.probe(obj, **kwargs),
+            obj_list, make_probe_result, workers=workers
+        )
+
+    async def bulk_report(self, func, items, make_result, workers=10):
+        """Await func for every item and collect per-item results.
+
+        Errors are caught, so one failed item does not stop the batch.
+
+        :param func: Coroutine function to apply.
+        :type func: callable
+
+        :param items: Items to process.
+        :type items: iterable
+
+        :param make_result: Function that composes item result from
+                            item, func result, error and duration.
+        :type make_result: callable
+
+        :param workers: Number of workers.
+        :type workers: int
+
+        :return report: Results in input order.
+        :rtype: BulkReport
+        """
+        async def run(item):
+            start = time.monotonic()
+            try:
+                value, error = await func(item), None
+            except Exception as exc:
+                self.logger.debug("Failed to process %r: %s", item, exc)
+                value, error = None, exc
+            return make_result(item, value, error, time.monotonic() - start)
+
+        start = time.monotonic()
+        results = await self.bulk_map(run, items, workers=workers)
+        return BulkReport(results, time.monotonic() - start)
+
+    @staticmethod
+    async def iter_pages(fetch_page, start_page=0, max_pages=None):
+        """Iterate over items of paginated endpoint.
+
+        Next page is requested in a background task while items of
+        the current one are yielded. Iteration stops on an empty page.
+
+        :param fetch_page: Coroutine function that fetches page
+                           by its number.
+        :type fetch_page: callable
+
+        :param start_page: First page to fetch.
+        :type start_page: int
+
+        :param max_pages: Max number of pages to fetch.
+        :type max_pages: int
+
+        :return items: Async generator of page items.
+        :rtype: async_generator
+        """
+        end_page = None if max_pages is None else start_page + max_pages
+        page = start_page
+        task = asyncio.ensure_future(fetch_page(page))
+        try:
+            while task is not None:
+                items = await task
+                if not items:
+                    return
+
+                # prefetch next page before handing out the current one
+                page += 1
+                task = None
+                if end_page is None or page < end_page:
+                    task = asyncio.ensure_future(fetch_page(page))
+
+                for item in items:
+                    yield item
+        finally:
+            if task is not None:
+                task.cancel()
+
+    @staticmethod
+    async def bulk_map(func, items, workers=10):
+        """Await func for every item using a fixed number of workers.
+
+        Workers pull items from a shared iterator, so items are consumed
+        lazily and no more than workers coroutines run at once.
+
+        :param func: Coroutine function to apply.
+        :type func: callable
+
+        :param items: Items to process.
+        :type items: iterable
+
+        :param workers: Number of workers.
+        :type workers: int
+
+        :return results: List of results, in input order.
+        :rtype: list
+        """
+        results = {}
+        items = enumerate(items)
+
+        async def worker():
+            for index, item in items:
+                results[index] = await func(item)
+
+        await asyncio.gather(*[worker() for _ in range(workers)])
+        return [results[index] for index in range(len(results))]
+
+
+class AsyncDogApi(AsyncAPI, DogApi):
+    """Asyncio DogApi class.
+
+    Provides the same methods as DogApi, but each of them
+    returns an awaitable.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """AsyncDogApi object init."""
+        super().__init__(*args, **kwargs)
+
+
+class AsyncCatApi(AsyncAPI, CatApi):
+    """Asyncio CatApi class.
+
+    Provides the same methods as CatApi, but each of them
+    returns an awaitable.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """AsyncCatApi object init."""
+        super().__init__(*args, **kwargs)
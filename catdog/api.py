@@ -1,29 +1,173 @@
 # -*- coding: utf-8 -*-
 """API module."""
-import json
 import logging
 from os import environ, path
-from functools import wraps
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 
-
+from .decoders import get_loads
+from .endpoints import install_endpoints
 from .exceptions import (APIKeyNotSpecified, APIConnectionError,
                          UnsupportedRequestType, UnsupportedAPIType,
-                         IlligalArgumentType, NotAValidDirectory)
+                         IlligalArgumentType, NotAValidDirectory,
+                         ProbeError)
+from .metrics import Metrics
+from .probe import (MAX_PROBE_BYTES, PROBE_BYTES, make_probe_result,
+                    next_probe_size)
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+from .sink import JsonLinesSink
+from .storage import AtomicWriter, FlatLayout, content_length
+# RawResponse used to be defined here, it is still importable from api
+from .transport import RawResponse, RequestsTransport
+
+
+# size of chunks used to stream images to disk
+CHUNK_SIZE = 64 * 1024
+
+SaveResult = namedtuple('SaveResult',
+                        ['obj', 'path', 'bytes', 'duration', 'error'])
+
+
+class BulkReport(list):
+    """List of per-item results of a bulk operation with totals."""
+
+    def __init__(self, results, elapsed):
+        """BulkReport object init.
+
+        :param results: Per-item results with bytes and error fields.
+        :type results: list
+
+        :param elapsed: Wall time of the whole operation in seconds.
+        :type elapsed: float
+        """
+        super().__init__(results)
+        self.elapsed = elapsed
+        self.bytes = sum(result.bytes for result in self)
+        self.failed = sum(1 for result in self if result.error is not None)
+
+    @property
+    def throughput(self):
+        """Transferred bytes per second."""
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def rate(self):
+        """Processed items per second."""
+        return len(self) / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        """Represents report in a human-readable way."""
+        return '<%s items=%d failed=%d bytes=%d elapsed=%.2fs>' % (
+            self.__class__.__name__, len(self), self.failed,
+            self.bytes, self.elapsed)
+
+
+def make_save_result(obj, saved, error, duration):
+    """Compose SaveResult from API.save outcome.
+
+    :param obj: Saved model.
+    :type obj: any
+
+    :param saved: Output file location and number of written bytes.
+    :type saved: tuple
+
+    :param error: Raised exception.
+    :type error: Exception
+
+    :param duration: Duration of save in seconds.
+    :type duration: float
+
+    :return result: Save result.
+    :rtype: SaveResult
+    """
+    out_file_loc, size = saved or (None, 0)
+    return SaveResult(obj, out_file_loc, size, duration, error)
 
 
 class API(object):
     """API class."""
 
-    def __init__(self, api_key=None, debug=False):
+    # names of read-only endpoints which responses may be cached
+    cached_endpoints = ()
+
+    single_flight_class = SingleFlight
+
+    def __init_subclass__(cls, **kwargs):
+        """Generate methods of endpoints declared by the child class."""
+        super().__init_subclass__(**kwargs)
+        if 'endpoints' in cls.__dict__:
+            install_endpoints(cls)
+
+    def __init__(self, api_key=None, debug=False, pool_connections=10,
+                 pool_maxsize=10, keep_alive=True, headers=None, cache=None,
+                 disk_cache=None, retry=None, rate_limiter=None,
+                 json_loads=None, coalesce=False, metrics=None,
+                 base_url=None, transport=None, manifest=None,
+                 layout=None, sync_batch=None, compress_metadata=False):
         """API object init.
 
         :param api_key: API key.
         :type api_key: str
         :param debug: Debug flag (used for logging).
         :type debug: bool
+        :param pool_connections: Number of per-host connection pools to cache.
+        :type pool_connections: int
+        :param pool_maxsize: Max number of connections kept open per host.
+        :type pool_maxsize: int
+        :param keep_alive: Reuse connections between requests.
+        :type keep_alive: bool
+        :param headers: Default headers sent with every request.
+        :type headers: dict
+        :param cache: Cache for responses of read-only endpoints.
+        :type cache: cache.ResponseCache
+        :param disk_cache: Persistent cache revalidated with conditional
+                           requests.
+        :type disk_cache: cache.DiskCache
+        :param retry: Retry policy, retries idempotent requests
+                      3 times by default.
+        :type retry: retry.RetryPolicy
+        :param rate_limiter: Client-side request rate limiter.
+        :type rate_limiter: retry.TokenBucket
+        :param json_loads: Function that decodes response body, the
+                           fastest installed JSON backend by default.
+        :type json_loads: callable
+        :param coalesce: Share one network call between identical
+                         concurrent GET requests.
+        :type coalesce: bool
+        :param metrics: Per-endpoint metrics collector.
+        :type metrics: metrics.Metrics
+        :param base_url: API server url, the public one by default.
+        :type base_url: str
+        :param transport: Transport that sends requests, pooled requests
+                          session by default.
+        :type transport: transport.Transport
+        :param manifest: Index of saved images, which are not fetched
+                         again.
+        :type manifest: manifest.Manifest
+        :param layout: Layout of saved images, all of them are stored
+                       in the output directory by default.
+        :type layout: storage.FlatLayout
+        :param sync_batch: Batch that makes saved images durable.
+        :type sync_batch: storage.SyncBatch
+        :param compress_metadata: Gzip JSON Lines files of saved models
+                                  without url. A file is complete once
+                                  the client is flushed or closed.
+        :type compress_metadata: bool
         """
-        class_name = self.__class__.__name__
+        # subclasses and async clients share the settings of the API
+        # they extend
+        class_name = next(
+            (klass.__name__ for klass in self.__class__.__mro__
+             if klass.__name__ in ('DogApi', 'CatApi')),
+            self.__class__.__name__
+        )
+        self.api_name = class_name
 
         # setting debug as class attribute
         self.debug = debug
@@ -44,18 +188,152 @@ class API(object):
         if class_name == "DogApi":
             self.base_url = "https://api.thedogapi.com"
         elif class_name == "CatApi":
-            self.base_url = "http://thecatapi.com/api"
+            self.base_url = "https://api.thecatapi.com"
         else:
             raise UnsupportedAPIType(
                 "%s is not supported." % class_name
             )
+        if base_url:
+            self.base_url = base_url.rstrip('/')
 
         self.api_version = '/v1/'
         if debug:
             self.logger.setLevel("DEBUG")
 
-    def make_request(self, req_type, url, headers=None,
-                     params=None, data=None, files=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.session = self.create_session(headers)
+        self.transport = self.create_transport(transport)
+        self.cache = cache
+        self.disk_cache = disk_cache
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.json_loads = json_loads or get_loads()
+        self.single_flight = self.single_flight_class() if coalesce else None
+        self.metrics = metrics or Metrics()
+        self.manifest = manifest
+        self.layout = layout or FlatLayout()
+        self.sync_batch = sync_batch
+        self.compress_metadata = compress_metadata
+        self.sinks = {}
+        self.sinks_lock = threading.Lock()
+
+    def create_session(self, headers=None):
+        """Create HTTP session with a pool of keep-alive connections.
+
+        Auth credentials and default headers are set on the session once,
+        so they are not rebuilt for every request.
+
+        :param headers: Default headers sent with every request.
+        :type headers: dict
+
+        :returns session: Configured session.
+        :rtype: requests.Session
+        """
+        session = requests.Session()
+
+        # mount adapter with the configured pool on both schemes
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        session.headers.update(self.default_headers(headers))
+        session.params.update(self.default_params())
+        return session
+
+    def create_transport(self, transport=None):
+        """Attach the session to the transport.
+
+        :param transport: Transport that sends requests.
+        :type transport: transport.Transport
+
+        :returns transport: Transport bound to the client session.
+        :rtype: transport.Transport
+        """
+        transport = transport or RequestsTransport()
+        transport.attach(self.session)
+        return transport
+
+    def default_headers(self, headers=None):
+        """Compose headers that are sent with every request.
+
+        :param headers: Extra default headers.
+        :type headers: dict
+
+        :returns headers: Default headers.
+        :rtype: dict
+        """
+        headers = dict(headers or {})
+        if not self.keep_alive:
+            headers['Connection'] = 'close'
+
+        # both APIs expect the key in header
+        headers['x-api-key'] = self.api_key
+        return headers
+
+    def default_params(self):
+        """Compose query params that are sent with every request.
+
+        :returns params: Default query params.
+        :rtype: dict
+        """
+        return {}
+
+    def connection_stats(self):
+        """Get connection reuse statistics of the session pool.
+
+        :returns stats: Number of sent requests, opened connections
+                        and requests that were sent over a reused connection.
+        :rtype: dict
+        """
+        requests_num = 0
+        connections_num = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                requests_num += pool.num_requests
+                connections_num += pool.num_connections
+        return {
+            'requests': requests_num,
+            'connections': connections_num,
+            'reused': requests_num - connections_num
+        }
+
+    def flush(self):
+        """Write buffered models and make saved images durable."""
+        with self.sinks_lock:
+            sinks = list(self.sinks.values())
+        for sink in sinks:
+            sink.flush()
+        if self.sync_batch is not None:
+            self.sync_batch.flush()
+
+    def close_files(self):
+        """Flush and close opened JSON Lines files."""
+        self.flush()
+        with self.sinks_lock:
+            sinks, self.sinks = self.sinks, {}
+        for sink in sinks.values():
+            sink.close()
+
+    def close(self):
+        """Close all pooled connections and opened files."""
+        self.close_files()
+        self.transport.close()
+
+    def __enter__(self):
+        """."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """."""
+        self.close()
+
+    def make_request(self, req_type, url, headers=None, params=None,
+                     data=None, files=None, stream=False, endpoint=None):
         """Make request to remote API server.
 
         :param req_type: Request type.
@@ -73,42 +351,297 @@ class API(object):
         :param data: Request payload.
         :type data: dict
 
+        :param stream: Do not read response body in advance.
+        :type stream: bool
+
+        :param endpoint: Endpoint name used in metrics.
+        :type endpoint: str
+
         :returns Response from the remote server.
         :rtype request.Response object
         """
-        if not headers:
-            headers = {}
-        if self.api_key:
-            if self.__class__.__name__ == "DogApi":
-                headers['x-api-key'] = self.api_key
-            else:
-                params['api_key'] = self.api_key
-
-        # check the request type
-        if req_type == 'get':
-            resp = requests.get(url, headers=headers, params=params)
-        elif req_type == 'post':
-            print(data)
-            resp = requests.post(url, headers=headers, params=params,
-                                 data=data, files=files)
-        elif req_type == 'delete':
-            resp = requests.delete(url, headers=headers, params=params,
-                                   data=data)
-        else:
+        if self.single_flight is not None and req_type == 'get' \
+                and not stream:
+            # identical concurrent GETs share a single network call
+            return self.single_flight.do(
+                self.request_key(url, headers, params),
+                lambda: self.send_request(req_type, url, headers, params,
+                                          endpoint=endpoint)
+            )
+        return self.send_request(req_type, url, headers, params, data,
+                                 files, stream, endpoint)
+
+    def send_request(self, req_type, url, headers=None, params=None,
+                     data=None, files=None, stream=False, endpoint=None):
+        """Send request, retrying it according to the retry policy.
+
+        Takes the same arguments as make_request.
+
+        :returns Response from the remote server.
+        :rtype request.Response object
+        """
+        # send stored response validators with the request
+        cache_key = cached = None
+        if self.disk_cache is not None and req_type == 'get' and not stream:
+            cache_key, cached, headers = self.lookup_disk_cache(
+                url, params, headers)
+
+        if req_type not in ('get', 'post', 'delete'):
             raise UnsupportedRequestType(
                 "API only supports get, post, delete request types.")
-        self.parse_status_code(resp.status_code)
+
+        start = time.monotonic()
+        attempt = 0
+        waited = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            try:
+                resp = self.transport.send(req_type, url, headers, params,
+                                           data, files, stream)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                delay = self.retry.next_delay(req_type, attempt, waited)
+                if delay is None:
+                    self.observe(endpoint, None, start, retries=attempt)
+                    raise
+                self.logger.debug("Retrying %s in %.2fs: %s",
+                                  url, delay, exc)
+            else:
+                delay = self.retry.next_delay(
+                    req_type, attempt, waited, resp.status_code,
+                    resp.headers.get('Retry-After'))
+                if delay is None:
+                    break
+                resp.close()
+                self.logger.debug("Retrying %s in %.2fs: %d status code",
+                                  url, delay, resp.status_code)
+            time.sleep(delay)
+            waited += delay
+            attempt += 1
+
+        # body of streamed response is not read yet
+        size = content_length(resp.headers) if stream else len(resp.content)
+        self.observe(endpoint, resp.status_code, start, size, attempt)
+
+        if cache_key is not None:
+            resp = self.update_disk_cache(cache_key, cached, resp)
+        try:
+            self.parse_status_code(resp.status_code)
+        except APIConnectionError:
+            # release the connection of unread streamed response
+            resp.close()
+            raise
         return resp
 
+    def observe(self, endpoint, status, start, size=0, retries=0):
+        """Record finished request in metrics.
+
+        :param endpoint: Endpoint name.
+        :type endpoint: str
+
+        :param status: Response status code or None on connection error.
+        :type status: int
+
+        :param start: Request start time (time.monotonic).
+        :type start: float
+
+        :param size: Response body size in bytes.
+        :type size: int
+
+        :param retries: Number of retries made.
+        :type retries: int
+        """
+        if self.metrics is not None:
+            self.metrics.observe(endpoint or 'other', status,
+                                 time.monotonic() - start, size, retries)
+
+    def metrics_snapshot(self):
+        """Get per-endpoint metrics and connection reuse stats.
+
+        :returns snapshot: Metrics snapshot.
+        :rtype: dict
+        """
+        snapshot = {'endpoints': self.metrics.snapshot()}
+        try:
+            connections = self.connection_stats()
+        except NotImplementedError:
+            return snapshot
+        requests_num = connections['requests']
+        connections['reuse_ratio'] = \
+            connections['reused'] / requests_num if requests_num else 0.0
+        snapshot['connections'] = connections
+        return snapshot
+
+    def prometheus_metrics(self):
+        """Render metrics in Prometheus text exposition format.
+
+        :returns text: Metrics text.
+        :rtype: str
+        """
+        try:
+            connections = self.connection_stats()
+        except NotImplementedError:
+            connections = None
+        return self.metrics.to_prometheus(connections=connections)
+
+    def decode(self, resp):
+        """Decode JSON body of the response.
+
+        :param resp: Response from the remote server.
+        :type resp: requests.Response
+
+        :returns data: Decoded response data.
+        :rtype: any
+        """
+        return self.json_loads(resp.content)
+
+    @staticmethod
+    def request_key(url, headers=None, params=None):
+        """Compose key that identifies a GET request.
+
+        :param url: Link to remote resource.
+        :type url: str
+
+        :param headers: Request headers.
+        :type headers: dict
+
+        :param params: Query params to a request.
+        :type params: dict
+
+        :returns key: Request key.
+        :rtype: tuple
+        """
+        return (url, tuple(sorted((headers or {}).items())),
+                tuple(sorted((params or {}).items())))
+
+    def lookup_disk_cache(self, url, params=None, headers=None):
+        """Find stored response and add its validators to request headers.
+
+        :param url: Link to remote resource.
+        :type url: str
+
+        :param params: Query params to a request.
+        :type params: dict
+
+        :param headers: Request headers.
+        :type headers: dict
+
+        :returns: Cache key, stored response and request headers.
+        :rtype: tuple
+        """
+        cache_key = self.disk_cache.make_key(url, params)
+        cached = self.disk_cache.get(cache_key)
+        if cached is not None:
+            headers = dict(headers or {})
+            headers.update(self.disk_cache.validators(cached.headers))
+        return cache_key, cached, headers
+
+    def update_disk_cache(self, cache_key, cached, resp):
+        """Serve not modified response from disk or store the fresh one.
+
+        :param cache_key: Cache key.
+        :type cache_key: str
+
+        :param cached: Stored response.
+        :type cached: RawResponse
+
+        :param resp: Response from the remote server.
+        :type resp: requests.Response
+
+        :returns resp: Response to use.
+        :rtype: requests.Response or RawResponse
+        """
+        if resp.status_code == 304 and cached is not None:
+            self.logger.debug("%s was not modified", cached.url)
+            return cached
+        if resp.status_code == 200:
+            self.disk_cache.set(cache_key, resp)
+        return resp
+
+    def dispatch(self, req_type, url, callback=None, endpoint=None,
+                 invalidates=None, **kwargs):
+        """Make request and pass the response to callback.
+
+        Endpoint methods go through dispatch instead of make_request,
+        so the same method body serves both sync and async clients.
+
+        :param req_type: Request type.
+        :type req_type: str
+
+        :param url: Link to remote resource.
+        :type url: str
+
+        :param callback: Function that converts the response.
+        :type callback: callable
+
+        :param endpoint: Name of the called endpoint.
+        :type endpoint: str
+
+        :param invalidates: (endpoint, url) pairs which cached responses
+                            become stale after the request.
+        :type invalidates: list
+
+        :returns result: Callback result or the response itself.
+        :rtype: any
+        """
+        key = self.cache_key(req_type, url, endpoint, kwargs.get('params'))
+        resp = self.cache.get(key) if key else None
+        if resp is None:
+            resp = self.make_request(req_type, url, endpoint=endpoint,
+                                     **kwargs)
+            if key:
+                self.cache.set(key, resp, len(resp.content))
+        self.invalidate(invalidates)
+
+        if callback is None:
+            return resp
+        return callback(resp)
+
+    def cache_key(self, req_type, url, endpoint, params=None):
+        """Compose response cache key.
+
+        :param req_type: Request type.
+        :type req_type: str
+
+        :param url: Link to remote resource.
+        :type url: str
+
+        :param endpoint: Name of the called endpoint.
+        :type endpoint: str
+
+        :param params: Query params to a request.
+        :type params: dict
+
+        :returns key: Cache key or None if response is not cacheable.
+        :rtype: tuple
+        """
+        if self.cache is None or req_type != 'get' \
+                or endpoint not in self.cached_endpoints:
+            return None
+        return self.cache.make_key(endpoint, url, params)
+
+    def invalidate(self, invalidates=None):
+        """Remove stale responses from the cache.
+
+        :param invalidates: (endpoint, url) pairs to remove.
+        :type invalidates: list
+        """
+        if self.cache is None or not invalidates:
+            return
+        for endpoint, url in invalidates:
+            self.cache.invalidate(endpoint, url)
+
     @staticmethod
     def parse_status_code(status_code):
         """Parses response status code value.
 
         :param status_code: Response status code.
         :type status_code: int
-        :raises APIConnectionError: if status_code != 200
+        :raises APIConnectionError: if status_code is not 200 or 206
         """
-        if status_code == 200:
+        # 206 Partial Content answers Range requests of probe
+        if status_code in (200, 206):
             return
         elif status_code == 400:
             raise APIConnectionError(
@@ -140,7 +673,7 @@ class API(object):
         :rtype: callable
         """
         @wraps(func)
-        def decorated(*args):
+        def decorated(*args, **kwargs):
             """Checks if the api_key value is not None.
 
             :param args: Function arguments.
@@ -151,7 +684,7 @@ class API(object):
             if not self.api_key:
                 raise APIKeyNotSpecified(
                     "You should provide API key for using this method!")
-            func(*args)
+            return func(*args, **kwargs)
         return decorated
 
     @staticmethod
@@ -175,54 +708,334 @@ class API(object):
                 )
             )
 
-    def save(self, obj, out_dir='./'):
+    def save(self, obj, out_dir='./', max_bytes=None, chunk_size=CHUNK_SIZE,
+             buffered=False):
         """Save the model to the filesystem.
 
+        Images are streamed to disk in chunks, so memory usage doesn't
+        depend on the image size. When sync_batch is set, the image
+        appears at the returned location once the batch is flushed.
+
         :param out_dir: Output directory.
         :type out_dir: str
 
+        :param max_bytes: Max allowed image size.
+        :type max_bytes: int
+
+        :param chunk_size: Size of chunks read from the network.
+        :type chunk_size: int
+
+        :param buffered: Keep model without url in the sink buffer until
+                         flush is called.
+        :type buffered: bool
+
         :raises NotADirectoryError if provided out_dir is not directory
+        :raises DownloadError if image is bigger than max_bytes or
+                              it is truncated
+
+        :return: Output file location and number of written bytes.
+        :rtype: tuple
         """
         if not path.isdir(out_dir):
             raise NotAValidDirectory(
                 "Either %s is not a directory or you don't access to it."
+                % out_dir
             )
         # check if obj has url attribute
         if obj.url:
 
+            # compose out_file location string
+            out_file_loc = self.layout.path(out_dir,
+                                            obj.url.split('/')[-1])
+
+            # skip images saved by earlier runs
+            entry = self.lookup_manifest(obj, out_file_loc)
+            if entry is not None:
+                return out_file_loc, entry.size
+
             # fetch file from remote server
-            raw_data = self.make_request('get', obj.url)
+            raw_data = self.make_request('get', obj.url, stream=True,
+                                         endpoint='save')
 
-            # compose out_file location string
-            out_file_loc = ''.join([
-                out_dir,
-                obj.url.split('/')[-1]
-            ])
-
-            # write data to a file
-            with open(out_file_loc, 'wb') as out_file:
-                out_file.write(raw_data.content)
+            # write data to a file, the manifest records it once the
+            # file is at its destination
+            on_commit = partial(self.update_manifest, obj)
+            try:
+                with AtomicWriter(out_file_loc, max_bytes,
+                                  content_length(raw_data.headers),
+                                  self.manifest is not None,
+                                  self.sync_batch, on_commit) as writer:
+                    for chunk in raw_data.iter_content(chunk_size):
+                        writer.write(chunk)
+            finally:
+                raw_data.close()
+            return out_file_loc, writer.size
         else:
             # compose out_file location string
-            out_file_loc = ''.join([
-                out_dir,
+            out_file_loc = path.join(out_dir, ''.join([
                 obj.__class__.__name__,
-                '.json'
-            ])
+                '.jsonl.gz' if self.compress_metadata else '.jsonl'
+            ]))
+
+            # records are batched only when the caller flushes them,
+            # like save_all does once it is done. Direct saves write
+            # the record right away, a compressed file keeps one gzip
+            # member that is finished by flush or close.
+            sink = self.get_sink(out_file_loc)
+            size = sink.write(obj)
+            if not buffered:
+                sink.sync()
+            return out_file_loc, size
+
+    def get_sink(self, out_file_loc):
+        """Get JSON Lines sink of the file, opening it on first use.
+
+        :param out_file_loc: Output file location.
+        :type out_file_loc: str
+
+        :return sink: Sink of the file.
+        :rtype: sink.JsonLinesSink
+        """
+        with self.sinks_lock:
+            sink = self.sinks.get(out_file_loc)
+            if sink is None:
+                sink = self.sinks[out_file_loc] = JsonLinesSink(out_file_loc)
+            return sink
+
+    def lookup_manifest(self, obj, out_file_loc):
+        """Find the image in the manifest of saved images.
+
+        :param obj: Model with url.
+        :type obj: any
+
+        :param out_file_loc: Output file location.
+        :type out_file_loc: str
+
+        :return entry: Manifest entry or None if image has to be fetched.
+        :rtype: manifest.ManifestEntry
+        """
+        if self.manifest is None:
+            return None
+        return self.manifest.lookup(obj.url, out_file_loc)
+
+    def update_manifest(self, obj, writer):
+        """Record saved image in the manifest.
 
-            # write data to a file
-            with open(out_file_loc, 'a') as out_file:
-                json.dump(obj.__dict__, out_file)
+        :param obj: Model with url.
+        :type obj: any
 
-    def save_all(self, obj_list, out_dir="./"):
+        :param writer: Writer that saved the image.
+        :type writer: storage.AtomicWriter
+        """
+        if self.manifest is not None:
+            self.manifest.add(obj.url, obj.id, writer.out_file_loc,
+                              writer.size, writer.sha256)
+
+    def save_all(self, obj_list, out_dir="./", workers=1, **kwargs):
         """Save all dogs images.
 
+        Failed objects do not stop the rest of the batch,
+        the error is reported in the object result.
+
         :param obj_list: List that contain objects.
-        :type obj_list: list
+        :type obj_list: iterable
 
         :param out_dir: Directory where to save images.
         :type our_dir: str
+
+        :param workers: Number of parallel downloads.
+        :type workers: int
+
+        :param kwargs: Extra arguments passed to save.
+        :type kwargs: dict
+
+        :return report: Save result per object, in input order.
+        :rtype: BulkReport
+        """
+        report = self.bulk_report(
+            lambda obj: self.save(obj, out_dir=out_dir, buffered=True,
+                                  **kwargs),
+            obj_list, make_save_result, workers=workers
+        )
+        self.flush()
+        return report
+
+    def probe(self, obj, probe_bytes=PROBE_BYTES, max_bytes=MAX_PROBE_BYTES):
+        """Detect image format and dimensions without full download.
+
+        Only the beginning of the image is fetched with Range requests,
+        more bytes are requested while the header is not complete.
+        Servers that ignore Range are read up to the same number of bytes.
+
+        :param obj: Model with image url.
+        :type obj: models.Model
+
+        :param probe_bytes: Number of bytes fetched by the first request.
+        :type probe_bytes: int
+
+        :param max_bytes: Max number of bytes to fetch.
+        :type max_bytes: int
+
+        :raises ProbeError if the format is unknown or the header is not
+                           found within max_bytes
+
+        :return: Image info and number of fetched bytes.
+        :rtype: tuple
+        """
+        if not obj.url:
+            raise ProbeError("%s has no image url" % obj)
+
+        data = b''
+        fetched = 0
+        size = probe_bytes
+        while True:
+            resp = self.make_request(
+                'get', obj.url, stream=True, endpoint='probe',
+                headers={'Range': 'bytes=%d-%d' % (len(data), size - 1)})
+            chunk = b''
+            try:
+                for part in resp.iter_content(size):
+                    chunk += part
+                    if len(chunk) >= size:
+                        break
+            finally:
+                resp.close()
+            fetched += len(chunk)
+
+            # servers that ignore Range send the image from the start
+            data = data + chunk if resp.status_code == 206 else chunk[:size]
+            info, size = next_probe_size(obj.url, data, size, max_bytes,
+                                         len(data) < size)
+            if size is None:
+                return info, fetched
+
+    def probe_all(self, obj_list, workers=1, **kwargs):
+        """Probe format and dimensions of all images.
+
+        Failed objects do not stop the rest of the batch,
+        the error is reported in the object result.
+
+        :param obj_list: List that contain objects.
+        :type obj_list: iterable
+
+        :param workers: Number of parallel probes.
+        :type workers: int
+
+        :param kwargs: Extra arguments passed to probe.
+        :type kwargs: dict
+
+        :return report: Probe result per object, in input order.
+        :rtype: BulkReport
+        """
+        return self.bulk_report(lambda obj: self.probe(obj, **kwargs),
+                                obj_list, make_probe_result, workers=workers)
+
+    def bulk_report(self, func, items, make_result, workers=1):
+        """Apply func to every item and collect per-item results.
+
+        Errors are caught, so one failed item does not stop the batch.
+
+        :param func: Function to apply.
+        :type func: callable
+
+        :param items: Items to process.
+        :type items: iterable
+
+        :param make_result: Function that composes item result from
+                            item, func result, error and duration.
+        :type make_result: callable
+
+        :param workers: Number of worker threads.
+        :type workers: int
+
+        :return report: Results in input order.
+        :rtype: BulkReport
+        """
+        def run(item):
+            start = time.monotonic()
+            try:
+                value, error = func(item), None
+            except Exception as exc:
+                self.logger.debug("Failed to process %r: %s", item, exc)
+                value, error = None, exc
+            return make_result(item, value, error, time.monotonic() - start)
+
+        start = time.monotonic()
+        results = list(self.bulk_map(run, items, workers=workers))
+        return BulkReport(results, time.monotonic() - start)
+
+    @staticmethod
+    def iter_pages(fetch_page, start_page=0, max_pages=None):
+        """Iterate over items of paginated endpoint.
+
+        Next page is requested in a background thread while items of
+        the current one are yielded. Iteration stops on an empty page.
+
+        :param fetch_page: Function that fetches page by its number.
+        :type fetch_page: callable
+
+        :param start_page: First page to fetch.
+        :type start_page: int
+
+        :param max_pages: Max number of pages to fetch.
+        :type max_pages: int
+
+        :return items: Generator of page items.
+        :rtype: generator
         """
-        # iterate over all objects
-        for obj in obj_list:
-            self.save(obj, out_dir=out_dir)
+        end_page = None if max_pages is None else start_page + max_pages
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            page = start_page
+            future = executor.submit(fetch_page, page)
+            while future is not None:
+                items = future.result()
+                if not items:
+                    return
+
+                # prefetch next page before handing out the current one
+                page += 1
+                future = None
+                if end_page is None or page < end_page:
+                    future = executor.submit(fetch_page, page)
+
+                for item in items:
+                    yield item
+        finally:
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def bulk_map(func, items, workers=1):
+        """Apply func to every item using a pool of worker threads.
+
+        Items are consumed lazily and at most 2 * workers of them are in
+        flight at once, so a slow consumer or a huge generator does not
+        pile up pending work.
+
+        :param func: Function to apply.
+        :type func: callable
+
+        :param items: Items to process.
+        :type items: iterable
+
+        :param workers: Number of worker threads.
+        :type workers: int
+
+        :return results: Generator of results, in input order.
+        :rtype: generator
+        """
+        if workers <= 1:
+            for item in items:
+                yield func(item)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for item in items:
+                pending.append(executor.submit(func, item))
+
+                # wait for the oldest task when the window is full
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
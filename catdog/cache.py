@@ -0,0 +1,274 @@
+"""Cache module."""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from .transport import RawResponse
+
+
+class ResponseCache(object):
+    """In-memory response cache with TTL and LRU eviction.
+
+    Entries are keyed on endpoint name, url and query params. The least
+    recently used entries are evicted when either max_entries or
+    max_bytes limit is exceeded.
+    """
+
+    def __init__(self, default_ttl=300, ttls=None, max_entries=1024,
+                 max_bytes=64 * 1024 * 1024):
+        """ResponseCache object init.
+
+        :param default_ttl: Entry lifetime in seconds.
+        :type default_ttl: float
+
+        :param ttls: Per-endpoint entry lifetime, overrides default_ttl.
+        :type ttls: dict
+
+        :param max_entries: Max number of cached entries.
+        :type max_entries: int
+
+        :param max_bytes: Max total size of cached response bodies.
+        :type max_bytes: int
+        """
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint, url, params=None):
+        """Compose cache key.
+
+        :param endpoint: Endpoint name.
+        :type endpoint: str
+
+        :param url: Link to remote resource.
+        :type url: str
+
+        :param params: Query params to a request.
+        :type params: dict
+
+        :return key: Cache key.
+        :rtype: tuple
+        """
+        return endpoint, url, tuple(sorted((params or {}).items()))
+
+    def get(self, key):
+        """Get cached response.
+
+        :param key: Cache key.
+        :type key: tuple
+
+        :return resp: Cached response or None if it is missing or expired.
+        :rtype: any
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires, size, resp = entry
+            if expires < time.monotonic():
+                self.remove(key)
+                self.misses += 1
+                return None
+
+            # mark entry as recently used
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return resp
+
+    def set(self, key, resp, size):
+        """Put response into cache.
+
+        :param key: Cache key.
+        :type key: tuple
+
+        :param resp: Response to cache.
+        :type resp: any
+
+        :param size: Size of the response body.
+        :type size: int
+        """
+        ttl = self.ttls.get(key[0], self.default_ttl)
+        if not ttl or size > self.max_bytes:
+            return
+
+        with self.lock:
+            if key in self.entries:
+                self.remove(key)
+            self.entries[key] = (time.monotonic() + ttl, size, resp)
+            self.size += size
+
+            # evict least recently used entries
+            while len(self.entries) > self.max_entries \
+                    or self.size > self.max_bytes:
+                self.remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def remove(self, key):
+        """Remove entry, caller has to hold the lock.
+
+        :param key: Cache key.
+        :type key: tuple
+        """
+        _, size, _ = self.entries.pop(key)
+        self.size -= size
+
+    def invalidate(self, endpoint=None, url=None):
+        """Remove matching entries, all of them if no filter is passed.
+
+        :param endpoint: Endpoint name.
+        :type endpoint: str
+
+        :param url: Link to remote resource.
+        :type url: str
+
+        :return count: Number of removed entries.
+        :rtype: int
+        """
+        with self.lock:
+            keys = [key for key in self.entries
+                    if (endpoint is None or key[0] == endpoint)
+                    and (url is None or key[1] == url)]
+            for key in keys:
+                self.remove(key)
+        return len(keys)
+
+    def stats(self):
+        """Get cache statistics.
+
+        :return stats: Hit/miss counters and cache size.
+        :rtype: dict
+        """
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.size
+            }
+
+
+class DiskCache(object):
+    """Persistent HTTP response cache stored in SQLite database.
+
+    Only responses with ETag or Last-Modified validators are stored,
+    so they can be revalidated with a conditional request.
+    """
+
+    def __init__(self, db_path):
+        """DiskCache object init.
+
+        :param db_path: Location of the database file.
+        :type db_path: str
+        """
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        with self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, url TEXT, headers TEXT, "
+                "content BLOB, stored REAL)"
+            )
+
+    @staticmethod
+    def make_key(url, params=None):
+        """Compose cache key.
+
+        :param url: Link to remote resource.
+        :type url: str
+
+        :param params: Query params to a request.
+        :type params: dict
+
+        :return key: Cache key.
+        :rtype: str
+        """
+        if not params:
+            return url
+        return '?'.join([url, urlencode(sorted(params.items()))])
+
+    @staticmethod
+    def validators(headers):
+        """Compose conditional request headers from response headers.
+
+        :param headers: Response headers.
+        :type headers: dict
+
+        :return headers: If-None-Match and If-Modified-Since headers.
+        :rtype: dict
+        """
+        conditional = {}
+        if headers.get('ETag'):
+            conditional['If-None-Match'] = headers['ETag']
+        if headers.get('Last-Modified'):
+            conditional['If-Modified-Since'] = headers['Last-Modified']
+        return conditional
+
+    def get(self, key):
+        """Get stored response.
+
+        :param key: Cache key.
+        :type key: str
+
+        :return resp: Stored response or None if it is missing.
+        :rtype: transport.RawResponse
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT url, headers, content FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        url, headers, content = row
+        return RawResponse(200, json.loads(headers), bytes(content), url)
+
+    def set(self, key, resp):
+        """Store response if it can be revalidated later.
+
+        :param key: Cache key.
+        :type key: str
+
+        :param resp: Response to store.
+        :type resp: requests.Response or transport.RawResponse
+        """
+        if not self.validators(resp.headers):
+            return
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, str(resp.url), json.dumps(dict(resp.headers)),
+                 sqlite3.Binary(resp.content), time.time())
+            )
+
+    def invalidate(self, key=None):
+        """Remove stored response, all of them if no key is passed.
+
+        :param key: Cache key.
+        :type key: str
+        """
+        with self.lock, self.db:
+            if key is None:
+                self.db.execute("DELETE FROM responses")
+            else:
+                self.db.execute("DELETE FROM responses WHERE key = ?",
+                                (key,))
+
+    def close(self):
+        """Close database connection."""
+        self.db.close()
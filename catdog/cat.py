@@ -1,14 +1,56 @@
-"""."""
-from .api import API
+"""CatApi module."""
+from .dog import DogApi
+from .endpoints import Arg, Endpoint, int_or
+from .models import Cat, Category
 
 
-class CatApi(API):
-    """CatApi class."""
+ENDPOINTS = (
+    Endpoint(
+        'get_categories', 'get', 'categories',
+        args=(
+            Arg('limit', 'query', None, encode=int_or(),
+                doc='Number of categories to return.'),
+            Arg('page', 'query', None, encode=int_or(),
+                doc='Pagination parameter.')
+        ),
+        callback='process_categories', doc='Get image categories.',
+        returns=('categories', 'List of Category objects.', 'list'),
+        cached=True
+    ),
+)
+
+
+class CatApi(DogApi):
+    """CatApi class.
+
+    The Cat API shares endpoints with the Dog API, images are
+    returned as Cat objects.
+    """
+
+    endpoints = ENDPOINTS
+
+    image_model = Cat
 
     def __init__(self, *args, **kwargs):
         """Cat object init."""
         super().__init__(*args, **kwargs)
 
-    def search(self, search_term):
-        """."""
-        pass
+    def process_categories(self, resp):
+        """Creates list of Category objects from response.
+
+        :param resp: Response from the remote server.
+        :type resp: requests.Response
+
+        :return categories: List of Category objects.
+        :rtype: list
+        """
+        return [Category.from_dict(category)
+                for category in self.decode(resp)]
+
+
+def __getattr__(name):
+    """Import async client from its module on first access."""
+    if name == 'AsyncCatApi':
+        from .aio import AsyncCatApi
+        return AsyncCatApi
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
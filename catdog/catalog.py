@@ -0,0 +1,227 @@
+"""Breed catalog module."""
+import re
+from bisect import bisect_left, bisect_right
+
+NUMBER_RE = re.compile(r'\d+(?:\.\d+)?')
+
+
+def parse_range(value):
+    """Parse range string like "3 - 6" or "10 - 12 years".
+
+    :param value: Range string.
+    :type value: str
+
+    :return range: (low, high) pair or None if value has no numbers.
+    :rtype: tuple
+    """
+    numbers = [float(number) for number in NUMBER_RE.findall(value or '')]
+    if not numbers:
+        return None
+    return min(numbers), max(numbers)
+
+
+def tokenize(value):
+    """Split comma separated string into lowercase tokens.
+
+    :param value: String like "Stubborn, Curious, Playful".
+    :type value: str
+
+    :return tokens: Set of tokens.
+    :rtype: set
+    """
+    return {token.strip().lower() for token in (value or '').split(',')
+            if token.strip()}
+
+
+class RangeIndex(object):
+    """Index of numeric ranges that answers overlap queries."""
+
+    def __init__(self, ranges):
+        """RangeIndex object init.
+
+        :param ranges: Mapping of key to (low, high) pair.
+        :type ranges: dict
+        """
+        by_low = sorted((low, key) for key, (low, _) in ranges.items())
+        by_high = sorted((high, key) for key, (_, high) in ranges.items())
+        self.lows = [low for low, _ in by_low]
+        self.low_keys = [key for _, key in by_low]
+        self.highs = [high for high, _ in by_high]
+        self.high_keys = [key for _, key in by_high]
+
+    def overlap(self, low=None, high=None):
+        """Find keys which ranges overlap [low, high].
+
+        :param low: Lower bound, unbounded if None.
+        :type low: float
+
+        :param high: Upper bound, unbounded if None.
+        :type high: float
+
+        :return keys: Matching keys.
+        :rtype: set
+        """
+        keys = None
+        if high is not None:
+            keys = set(self.low_keys[:bisect_right(self.lows, high)])
+        if low is not None:
+            matched = self.high_keys[bisect_left(self.highs, low):]
+            keys = keys.intersection(matched) if keys is not None \
+                else set(matched)
+        if keys is None:
+            keys = set(self.low_keys)
+        return keys
+
+
+class BreedCatalog(object):
+    """Local breed catalog with precomputed indexes.
+
+    Built once from the breed list, it answers multi-attribute queries
+    without network calls.
+    """
+
+    # range attributes of the breed measured in both unit systems
+    measures = ('weight', 'height')
+
+    def __init__(self, breeds):
+        """BreedCatalog object init.
+
+        :param breeds: Breed objects.
+        :type breeds: list
+        """
+        self.breeds = {breed.id: breed for breed in breeds}
+        self.names = {breed.name.lower(): breed for breed in breeds
+                      if breed.name}
+
+        # inverted indexes
+        self.temperaments = {}
+        self.groups = {}
+        for breed in breeds:
+            for token in tokenize(breed.temperament):
+                self.temperaments.setdefault(token, set()).add(breed.id)
+            if breed.breed_group:
+                self.groups.setdefault(
+                    breed.breed_group.lower(), set()).add(breed.id)
+
+        # range indexes keyed on (attribute, unit system)
+        self.ranges = {}
+        for measure in self.measures:
+            for system in ('metric', 'imperial'):
+                self.ranges[(measure, system)] = self.build_range_index(
+                    breeds, lambda breed: (getattr(breed, measure) or {})
+                    .get(system))
+        self.ranges[('life_span', None)] = self.build_range_index(
+            breeds, lambda breed: breed.life_span)
+
+    @staticmethod
+    def build_range_index(breeds, get_value):
+        """Build range index over parsed breed attribute.
+
+        :param breeds: Breed objects.
+        :type breeds: list
+
+        :param get_value: Function that returns range string of a breed.
+        :type get_value: callable
+
+        :return index: Range index.
+        :rtype: RangeIndex
+        """
+        ranges = {}
+        for breed in breeds:
+            parsed = parse_range(get_value(breed))
+            if parsed is not None:
+                ranges[breed.id] = parsed
+        return RangeIndex(ranges)
+
+    @classmethod
+    def from_api(cls, api):
+        """Build catalog from the breed list of the API.
+
+        :param api: DogApi object.
+        :type api: dog.DogApi
+
+        :return catalog: Breed catalog.
+        :rtype: BreedCatalog
+        """
+        return cls(api.get_breed_list())
+
+    def __len__(self):
+        """."""
+        return len(self.breeds)
+
+    def __iter__(self):
+        """."""
+        return iter(self.breeds.values())
+
+    def get(self, breed_id):
+        """Get breed by its identificator.
+
+        :param breed_id: Breed identificator.
+        :type breed_id: int
+
+        :return breed: Breed object or None.
+        :rtype: models.Breed
+        """
+        return self.breeds.get(breed_id)
+
+    def get_by_name(self, name):
+        """Get breed by its name, case insensitive.
+
+        :param name: Breed name.
+        :type name: str
+
+        :return breed: Breed object or None.
+        :rtype: models.Breed
+        """
+        return self.names.get(name.lower())
+
+    def query(self, temperament=None, breed_group=None, weight=None,
+              height=None, life_span=None, system='metric'):
+        """Find breeds that match all of the filters.
+
+        Range filters are (low, high) pairs, either bound may be None.
+        A breed matches if its range overlaps the filter range.
+
+        :param temperament: Temperament or list of them, all must match.
+        :type temperament: str or list
+
+        :param breed_group: Breed group.
+        :type breed_group: str
+
+        :param weight: Weight range.
+        :type weight: tuple
+
+        :param height: Height range.
+        :type height: tuple
+
+        :param life_span: Life span range in years.
+        :type life_span: tuple
+
+        :param system: Unit system of weight and height (metric, imperial).
+        :type system: str
+
+        :return breeds: Matching Breed objects ordered by id.
+        :rtype: list
+        """
+        # collect candidate sets, starting from the most selective ones
+        candidates = []
+        if temperament:
+            if isinstance(temperament, str):
+                temperament = [temperament]
+            for token in temperament:
+                candidates.append(
+                    self.temperaments.get(token.strip().lower(), set()))
+        if breed_group:
+            candidates.append(self.groups.get(breed_group.lower(), set()))
+        for key, bounds in ((('weight', system), weight),
+                            (('height', system), height),
+                            (('life_span', None), life_span)):
+            if bounds is not None:
+                candidates.append(self.ranges[key].overlap(*bounds))
+
+        if not candidates:
+            ids = self.breeds.keys()
+        else:
+            candidates.sort(key=len)
+            ids = candidates[0].intersection(*candidates[1:])
+        return [self.breeds[breed_id] for breed_id in sorted(ids)]
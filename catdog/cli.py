@@ -0,0 +1,421 @@
+"""Command-line interface module.
+
+Usage: python -m catdog [options] {search,mirror,crawl,breeds,favourites,votes}
+
+Results are streamed between stages: mirror saves images while search
+pages are still being fetched. A throughput summary is printed to
+stderr when a command is done.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+from itertools import islice
+
+CommandResult = namedtuple('CommandResult',
+                           ['item', 'result', 'bytes', 'duration', 'error'])
+
+
+class RecordWriter(object):
+    """Writer of models in JSON Lines, JSON or CSV format."""
+
+    def __init__(self, out_file, out_format='jsonl', fields=None,
+                 close_file=False):
+        """RecordWriter object init.
+
+        :param out_file: Text file to write to.
+        :type out_file: file
+
+        :param out_format: Output format: jsonl, json or csv.
+        :type out_format: str
+
+        :param fields: CSV columns, fields of the first model by default.
+        :type fields: tuple
+
+        :param close_file: Close out_file when the writer is closed.
+        :type close_file: bool
+        """
+        self.out_file = out_file
+        self.out_format = out_format
+        self.fields = fields
+        self.close_file = close_file
+        self.csv_writer = None
+        self.count = 0
+        self.bytes = 0
+
+    def write(self, obj):
+        """Write the model.
+
+        :param obj: Model.
+        :type obj: models.Model
+        """
+        data = obj.to_dict()
+        if self.out_format == 'csv':
+            if self.csv_writer is None:
+                self.fields = self.fields or obj.fields
+                self.csv_writer = csv.writer(self.out_file)
+                self.bytes += self.csv_writer.writerow(self.fields)
+
+            # nested values don't fit in a cell, they are kept as JSON
+            row = [value if not isinstance(value, (dict, list))
+                   else json.dumps(value)
+                   for value in (data.get(field) for field in self.fields)]
+            # writerow returns the number of written characters
+            self.bytes += self.csv_writer.writerow(row)
+        else:
+            line = json.dumps(data, separators=(',', ':'))
+            if self.out_format == 'json':
+                line = ('[' if not self.count else ',\n') + line
+            else:
+                line += '\n'
+            self.out_file.write(line)
+            self.bytes += len(line)
+        self.count += 1
+
+    def close(self):
+        """Finish the document and close the file unless it is stdout."""
+        if self.out_format == 'json':
+            self.bytes += self.out_file.write(']\n' if self.count else '[]\n')
+        if self.close_file:
+            self.out_file.close()
+        else:
+            self.out_file.flush()
+
+    def __enter__(self):
+        """."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """."""
+        self.close()
+
+
+def make_api(args):
+    """Create API client configured by command-line options.
+
+    :param args: Parsed options.
+    :type args: argparse.Namespace
+
+    :return api: API client.
+    :rtype: api.API
+    """
+    # HTTP stack is imported only when a command needs it
+    from .cat import CatApi
+    from .dog import DogApi
+    from .retry import TokenBucket
+
+    api_class = CatApi if args.api == 'cat' else DogApi
+    kwargs = {
+        'base_url': args.base_url,
+        'pool_maxsize': max(10, args.concurrency),
+        'rate_limiter': TokenBucket(args.rate) if args.rate else None
+    }
+    if getattr(args, 'manifest', None):
+        from .manifest import Manifest
+        kwargs['manifest'] = Manifest(args.manifest)
+    if getattr(args, 'sharded', False):
+        from .storage import ShardedLayout
+        kwargs['layout'] = ShardedLayout()
+    return api_class(api_key(args), **kwargs)
+
+
+def api_key(args):
+    """Get API key from options or environment.
+
+    :param args: Parsed options.
+    :type args: argparse.Namespace
+
+    :return key: API key.
+    :rtype: str
+    """
+    return args.api_key or os.environ.get('%s_API_KEY' % args.api.upper())
+
+
+def open_output(args):
+    """Open output file, stdout by default.
+
+    :param args: Parsed options.
+    :type args: argparse.Namespace
+
+    :return writer: Writer of models.
+    :rtype: RecordWriter
+    """
+    if args.output and args.output != '-':
+        return RecordWriter(open(args.output, 'w', newline=''), args.format,
+                            close_file=True)
+    return RecordWriter(sys.stdout, args.format)
+
+
+def read_ids(sources):
+    """Read ids from arguments, files with an id per line or '-' for stdin.
+
+    :param sources: Ids and @file references.
+    :type sources: list
+
+    :return ids: Generator of ids.
+    :rtype: generator
+    """
+    for source in sources:
+        if source == '-' or source.startswith('@'):
+            in_file = sys.stdin if source == '-' else open(source[1:])
+            with in_file:
+                for line in in_file:
+                    if line.strip():
+                        yield line.strip()
+        else:
+            yield source
+
+
+def iter_images(api, args):
+    """Iterate over search results limited by --count.
+
+    :param api: API client.
+    :type api: dog.DogApi
+
+    :param args: Parsed options.
+    :type args: argparse.Namespace
+
+    :return images: Generator of images.
+    :rtype: generator
+    """
+    images = api.iter_search(breed_id=args.breed_id,
+                             mine_types=args.mime_types, limit=args.limit,
+                             order=args.order, max_pages=args.max_pages)
+    return islice(images, args.count)
+
+
+def print_summary(name, items, failed, size, elapsed):
+    """Print throughput summary to stderr.
+
+    :param name: Command name.
+    :type name: str
+
+    :param items: Number of processed items.
+    :type items: int
+
+    :param failed: Number of failed items.
+    :type failed: int
+
+    :param size: Number of transferred or written bytes.
+    :type size: int
+
+    :param elapsed: Wall time in seconds.
+    :type elapsed: float
+    """
+    elapsed = max(elapsed, 1e-9)
+    sys.stderr.write(
+        '%s: %d items, %d failed, %d bytes in %.2fs '
+        '(%.1f items/s, %.2f MB/s)\n' % (
+            name, items, failed, size, elapsed, items / elapsed,
+            size / elapsed / 1e6))
+
+
+def cmd_search(args):
+    """Write search results."""
+    start = time.monotonic()
+    with make_api(args) as api:
+        with open_output(args) as writer:
+            for image in iter_images(api, args):
+                writer.write(image)
+    print_summary('search', writer.count, 0, writer.bytes,
+                  time.monotonic() - start)
+    return 0
+
+
+def cmd_mirror(args):
+    """Save search result images to a directory."""
+    with make_api(args) as api:
+        # images are saved as soon as their page is fetched
+        report = api.save_all(iter_images(api, args), out_dir=args.out_dir,
+                              workers=args.concurrency,
+                              max_bytes=args.max_bytes)
+    for result in report:
+        if result.error is not None:
+            sys.stderr.write('%s: %s\n' % (result.obj.url, result.error))
+    print_summary('mirror', len(report), report.failed, report.bytes,
+                  report.elapsed)
+    return 1 if report.failed else 0
+
+
+def cmd_crawl(args):
+    """Crawl image corpus with worker processes."""
+    from .cat import CatApi
+    from .crawler import crawl
+    from .dog import DogApi
+
+    report = crawl(api_key(args), args.out_file, processes=args.processes,
+                   breed_ids=args.breed_ids, limit=args.limit,
+                   max_pages=args.max_pages, rate=args.rate,
+                   api_class=CatApi if args.api == 'cat' else DogApi,
+                   base_url=args.base_url)
+    print_summary('crawl', report.records, 0,
+                  os.path.getsize(report.out_file), report.elapsed)
+    return 0
+
+
+def cmd_breeds_export(args):
+    """Write all breeds."""
+    start = time.monotonic()
+    with make_api(args) as api:
+        with open_output(args) as writer:
+            for breed in api.get_breed_list():
+                writer.write(breed)
+    print_summary('breeds export', writer.count, 0, writer.bytes,
+                  time.monotonic() - start)
+    return 0
+
+
+def bulk_command(name, method_name):
+    """Make command that calls API method for every image id.
+
+    :param name: Command name used in the summary.
+    :type name: str
+
+    :param method_name: Name of API method taking image_id and sub_id.
+    :type method_name: str
+
+    :return command: Command function.
+    :rtype: callable
+    """
+    def command(args):
+        with make_api(args) as api:
+            method = getattr(api, method_name)
+
+            def make_result(image_id, result, error, duration):
+                return CommandResult(image_id, result, 0, duration, error)
+
+            report = api.bulk_report(
+                lambda image_id: method(image_id, args.sub_id),
+                read_ids(args.image_ids), make_result,
+                workers=args.concurrency
+            )
+        for result in report:
+            if result.error is not None:
+                sys.stderr.write('%s: %s\n' % (result.item, result.error))
+        print_summary(name, len(report), report.failed, report.bytes,
+                      report.elapsed)
+        return 1 if report.failed else 0
+    return command
+
+
+def add_search_args(parser):
+    """Add search filter options to the parser."""
+    parser.add_argument('--breed-id')
+    parser.add_argument('--mime-types', nargs='+',
+                        choices=('gif', 'jpg', 'png'))
+    parser.add_argument('--order', default='ASC',
+                        choices=('RANDOM', 'ASC', 'DESC'))
+    parser.add_argument('--limit', type=int, default=25, help='page size')
+    parser.add_argument('--count', type=int,
+                        help='number of images, all of them by default')
+    parser.add_argument('--max-pages', type=int)
+
+
+def convert_breed_ids(args):
+    """Convert breed ids of the Dog API to int, Cat API ids are strings.
+
+    :param args: Parsed options.
+    :type args: argparse.Namespace
+
+    :raises ValueError if a Dog API breed id is not an integer
+    """
+    if args.api != 'dog':
+        return
+    if getattr(args, 'breed_id', None) is not None:
+        args.breed_id = int(args.breed_id)
+    if getattr(args, 'breed_ids', None) is not None:
+        args.breed_ids = [int(breed_id) for breed_id in args.breed_ids]
+
+
+def make_parser():
+    """Compose command-line parser.
+
+    :return parser: Parser.
+    :rtype: argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog='catdog', description='Bulk operations over the Cat and Dog '
+                                   'APIs.')
+    parser.add_argument('--api', choices=('dog', 'cat'), default='dog')
+    parser.add_argument('--api-key',
+                        help='API key, DOG_API_KEY or CAT_API_KEY env var '
+                             'by default')
+    parser.add_argument('--base-url', help='API server url')
+    parser.add_argument('-c', '--concurrency', type=int, default=8,
+                        help='number of parallel requests')
+    parser.add_argument('--rate', type=float,
+                        help='max number of requests per second')
+    parser.add_argument('-f', '--format', choices=('jsonl', 'json', 'csv'),
+                        default='jsonl', help='output format')
+    parser.add_argument('-o', '--output', help='output file, stdout by '
+                                               'default')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    search = commands.add_parser('search', help='write search results')
+    add_search_args(search)
+    search.set_defaults(func=cmd_search)
+
+    mirror = commands.add_parser('mirror', help='save search result images')
+    mirror.add_argument('out_dir')
+    add_search_args(mirror)
+    mirror.add_argument('--max-bytes', type=int, help='max image size')
+    mirror.add_argument('--manifest',
+                        help='manifest database, saved images are skipped')
+    mirror.add_argument('--sharded', action='store_true',
+                        help='spread images over nested directories')
+    mirror.set_defaults(func=cmd_mirror)
+
+    crawl = commands.add_parser(
+        'crawl', help='crawl search results with worker processes')
+    crawl.add_argument('out_file', help='JSON Lines file, .gz compressed')
+    crawl.add_argument('--processes', type=int)
+    crawl.add_argument('--breed-ids', nargs='+')
+    crawl.add_argument('--limit', type=int, default=100, help='page size')
+    crawl.add_argument('--max-pages', type=int)
+    crawl.set_defaults(func=cmd_crawl)
+
+    breeds = commands.add_parser('breeds', help='breed catalog commands')
+    breeds_commands = breeds.add_subparsers(dest='breeds_command')
+    breeds_commands.required = True
+    export = breeds_commands.add_parser('export', help='write all breeds')
+    export.set_defaults(func=cmd_breeds_export)
+
+    for name, method_name in (('favourites', 'post_favourite_dogs'),
+                              ('votes', 'post_vote')):
+        command = commands.add_parser(
+            name, help='add images to %s in bulk' % name)
+        command.add_argument('image_ids', nargs='+',
+                             help="image ids, @file with an id per line "
+                                  "or '-' for stdin")
+        command.add_argument('--sub-id', required=True,
+                             help='user identificator')
+        command.set_defaults(func=bulk_command(name, method_name))
+    return parser
+
+
+def main(argv=None):
+    """Run command-line tool.
+
+    :param argv: Command-line arguments, sys.argv by default.
+    :type argv: list
+
+    :return status: Exit status.
+    :rtype: int
+    """
+    from .exceptions import APIKeyNotSpecified
+
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    try:
+        convert_breed_ids(args)
+    except ValueError:
+        parser.error('Dog API breed ids are integers')
+    try:
+        return args.func(args)
+    except APIKeyNotSpecified as exc:
+        sys.stderr.write('catdog: %s\n' % exc)
+        return 2
@@ -0,0 +1,180 @@
+"""Multi-process crawler module.
+
+Pages of search results or breed ids are split between worker
+processes. Every worker has its own session and share of the rate
+limit and writes its own JSON Lines shard, the shards are merged into
+one dataset without duplicate images.
+"""
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+
+from .decoders import get_loads
+from .dog import DogApi
+from .retry import TokenBucket
+from .sink import JsonLinesSink, open_lines
+
+
+ShardTask = namedtuple('ShardTask', [
+    'shard', 'api_class', 'api_key', 'api_kwargs', 'rate', 'out_file',
+    'breed_ids', 'start_page', 'page_step', 'max_pages', 'limit'
+])
+
+ShardResult = namedtuple('ShardResult', ['out_file', 'pages', 'records',
+                                         'elapsed'])
+
+CrawlReport = namedtuple('CrawlReport', ['out_file', 'records',
+                                         'duplicates', 'shards', 'elapsed'])
+
+
+def crawl_shard(task):
+    """Crawl pages of the shard and write found images to its file.
+
+    Runs in a worker process, so it has to be a module level function.
+
+    :param task: Shard to crawl.
+    :type task: ShardTask
+
+    :return result: Shard file and crawl stats.
+    :rtype: ShardResult
+    """
+    start = time.monotonic()
+    rate_limiter = TokenBucket(task.rate) if task.rate else None
+    api = task.api_class(task.api_key, rate_limiter=rate_limiter,
+                         **task.api_kwargs)
+    pages = records = 0
+
+    # shard without images still leaves an empty file to merge,
+    # stale shard of an earlier run is truncated
+    open(task.out_file, 'wb').close()
+
+    with api, JsonLinesSink(task.out_file) as sink:
+        # pages of all breeds are crawled when breed ids are not split
+        breed_ids = (None,) if task.breed_ids is None else task.breed_ids
+        for breed_id in breed_ids:
+            page_numbers = count(task.start_page, task.page_step)
+            for page in page_numbers:
+                if task.max_pages is not None and page >= task.max_pages:
+                    break
+                images = api.search(breed_id=breed_id, limit=task.limit,
+                                    page=page, order='ASC')
+                pages += 1
+
+                # pages are contiguous, the rest of them are empty too
+                if not images:
+                    break
+                for image in images:
+                    sink.write(image)
+                records += len(images)
+    return ShardResult(task.out_file, pages, records,
+                       time.monotonic() - start)
+
+
+def merge_shards(shard_files, out_file, loads=None):
+    """Merge shard files into one dataset without duplicate images.
+
+    Records are copied without re-encoding, only their ids are decoded.
+
+    :param shard_files: Shard file locations.
+    :type shard_files: list
+
+    :param out_file: Output file location, gzip compressed if it ends
+                     with .gz.
+    :type out_file: str
+
+    :param loads: Function that decodes bytes to python object.
+    :type loads: callable
+
+    :return: Number of written records and skipped duplicates.
+    :rtype: tuple
+    """
+    loads = loads or get_loads()
+    seen = set()
+    duplicates = 0
+    with open_lines(out_file, 'wb') as out:
+        for shard_file in shard_files:
+            with open_lines(shard_file, 'rb') as shard:
+                for line in shard:
+                    if not line.strip():
+                        continue
+                    image_id = loads(line)['id']
+                    if image_id in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(image_id)
+                    out.write(line)
+    return len(seen), duplicates
+
+
+def crawl(api_key, out_file, processes=None, breed_ids=None, limit=100,
+          max_pages=None, rate=None, api_class=DogApi, keep_shards=False,
+          **api_kwargs):
+    """Crawl image corpus with a pool of worker processes.
+
+    Without breed_ids workers take every processes-th search page,
+    with them every worker crawls all pages of its share of breeds.
+
+    :param api_key: API key.
+    :type api_key: str
+
+    :param out_file: Output JSON Lines file location, shards are written
+                     next to it.
+    :type out_file: str
+
+    :param processes: Number of worker processes, CPU count by default.
+    :type processes: int
+
+    :param breed_ids: Breeds to crawl.
+    :type breed_ids: list
+
+    :param limit: Page size.
+    :type limit: int
+
+    :param max_pages: Number of pages to crawl, per breed with breed_ids.
+    :type max_pages: int
+
+    :param rate: Total number of requests per second of all workers.
+    :type rate: float
+
+    :param api_class: Client class used by workers.
+    :type api_class: type
+
+    :param keep_shards: Do not remove shard files after the merge.
+    :type keep_shards: bool
+
+    :param api_kwargs: Extra picklable arguments of the client.
+    :type api_kwargs: dict
+
+    :return report: Merged dataset stats.
+    :rtype: CrawlReport
+    """
+    start = time.monotonic()
+    processes = processes or os.cpu_count() or 1
+    if breed_ids is not None:
+        breed_ids = list(breed_ids)
+        processes = max(1, min(processes, len(breed_ids)))
+
+    tasks = []
+    for shard in range(processes):
+        tasks.append(ShardTask(
+            shard, api_class, api_key, api_kwargs,
+            rate / processes if rate else None,
+            '%s.shard%03d.jsonl' % (out_file, shard),
+            breed_ids[shard::processes] if breed_ids is not None else None,
+            0 if breed_ids is not None else shard,
+            1 if breed_ids is not None else processes,
+            max_pages, limit
+        ))
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        shards = list(executor.map(crawl_shard, tasks))
+
+    records, duplicates = merge_shards(
+        [result.out_file for result in shards], out_file)
+    if not keep_shards:
+        for result in shards:
+            os.remove(result.out_file)
+    return CrawlReport(out_file, records, duplicates, shards,
+                       time.monotonic() - start)
@@ -0,0 +1,89 @@
+"""JSON decoders module.
+
+Picks the fastest JSON backend that is installed: orjson, ujson
+or the standard library json module.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def json_loads(data):
+    """Decode JSON document with the standard library.
+
+    :param data: JSON document.
+    :type data: bytes
+
+    :return obj: Decoded python object.
+    :rtype: any
+    """
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """Encode python object with the standard library.
+
+    :param obj: Python object.
+    :type obj: any
+
+    :return data: JSON document.
+    :rtype: bytes
+    """
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+LOADS = {'json': json_loads}
+DUMPS = {'json': json_dumps}
+
+if ujson is not None:
+    LOADS['ujson'] = ujson.loads
+    DUMPS['ujson'] = lambda obj: ujson.dumps(obj).encode('utf-8')
+
+if orjson is not None:
+    LOADS['orjson'] = orjson.loads
+    DUMPS['orjson'] = orjson.dumps
+
+# the fastest available backend
+BACKEND = 'orjson' if orjson else 'ujson' if ujson else 'json'
+
+
+def get_loads(backend=None):
+    """Get JSON decode function.
+
+    :param backend: Backend name (orjson, ujson, json),
+                    the fastest installed one by default.
+    :type backend: str
+
+    :return loads: Function that decodes bytes to python object.
+    :rtype: callable
+    """
+    try:
+        return LOADS[backend or BACKEND]
+    except KeyError:
+        raise ValueError("%s JSON backend is not installed." % backend)
+
+
+def get_dumps(backend=None):
+    """Get JSON encode function.
+
+    :param backend: Backend name (orjson, ujson, json),
+                    the fastest installed one by default.
+    :type backend: str
+
+    :return dumps: Function that encodes python object to bytes.
+    :rtype: callable
+    """
+    try:
+        return DUMPS[backend or BACKEND]
+    except KeyError:
+        raise ValueError("%s JSON backend is not installed." % backend)
@@ -2,93 +2,161 @@
 from os import path
 
 from .api import API
+from .endpoints import Arg, Endpoint, choice, int_or, mime_types
 from .exceptions import InvalidImageFile
 from .models import Animal, Breed, Category, Dog
+from .upload import MultipartStream, UploadResult, list_images
+
+
+IMAGE_ID = Arg('image_id', arg_type=str, doc='Image identificator.')
+BREED_ID = Arg('breed_id', arg_type=int, doc='Breed identificator.')
+SUB_ID = Arg('sub_id', 'data', arg_type=str, doc='User identificator.')
+
+ENDPOINTS = (
+    Endpoint(
+        'search', 'get', 'images/search',
+        args=(
+            Arg('breed_id', 'query', None, int, doc='Breed id.'),
+            Arg('mine_types', 'query', None, encode=mime_types,
+                key='mime_types', doc='Image extensions to search.'),
+            Arg('limit', 'query', 1, encode=int_or(1),
+                doc='Number of images to search.'),
+            Arg('page', 'query', None, encode=int_or(),
+                doc='Pagination parameter, used with ASC/DESC order.'),
+            Arg('order', 'query', None,
+                encode=choice(('RANDOM', 'ASC', 'DESC')),
+                doc='Order of the images (RANDOM, ASC or DESC).')
+        ),
+        callback='process_dogs', doc='Search images using various filters.',
+        returns=('dogs', 'Fetched images.', 'list')
+    ),
+    Endpoint(
+        'get_image_by_id', 'get', 'images/{image_id}', args=(IMAGE_ID,),
+        callback='process_dog', doc='Get image by image_id.',
+        returns=('dog', 'Image object.', 'models.Dog'), cached=True
+    ),
+    Endpoint(
+        'delete_image_by_id', 'delete', 'images/{image_id}',
+        args=(IMAGE_ID,), doc='Delete uploaded image from the API.',
+        returns=('resp', 'Response from the remote server.',
+                 'requests.Response'),
+        requires_key=True, invalidates=('image_cache_keys', 'image_id')
+    ),
+    Endpoint(
+        'get_images', 'get', 'images/',
+        args=(
+            Arg('limit', 'query', 1, encode=int_or(1),
+                doc='Length of return images list.'),
+            Arg('page', 'query', 0, encode=int_or(0),
+                doc='Pagination parameter.'),
+            Arg('order', 'query', 'DESC',
+                encode=choice(('DESC', 'ASC'), 'DESC'),
+                doc='Order of the return images list.')
+        ),
+        callback='process_dogs', doc='Get uploaded images from the API.',
+        returns=('dogs', 'List of image objects.', 'list')
+    ),
+    Endpoint(
+        'get_breeds_by_image_id', 'get', 'images/{image_id}/breeds',
+        args=(IMAGE_ID,), callback='process_breeds',
+        doc='Get breeds from an image.',
+        returns=('breeds', 'List of Breed objects.', 'list'), cached=True
+    ),
+    Endpoint(
+        'add_breed_to_image', 'post', 'images/{image_id}/breeds',
+        args=(IMAGE_ID, Arg('breed_id', 'data', arg_type=int,
+                            doc='Breed identificator.')),
+        doc='Add breed to image.',
+        returns=('resp', 'Response from the remote server.',
+                 'requests.Response'),
+        requires_key=True, invalidates=('image_cache_keys', 'image_id')
+    ),
+    Endpoint(
+        'delete_breed_from_image', 'delete',
+        'images/{image_id}/breeds/{breed_id}', args=(IMAGE_ID, BREED_ID),
+        doc='Delete breed from image.',
+        returns=('resp', 'Response from the remote server.',
+                 'requests.Response'),
+        requires_key=True, invalidates=('image_cache_keys', 'image_id')
+    ),
+    Endpoint(
+        'get_breed_by_id', 'get', 'breeds/{breed_id}', args=(BREED_ID,),
+        callback='process_breed', doc='Get breed by its identificator.',
+        returns=('breed', 'Breed object.', 'models.Breed'), cached=True
+    ),
+    Endpoint(
+        'get_breed_list', 'get', 'breeds', callback='process_breeds',
+        doc='Get all breeds.',
+        returns=('breeds', 'List of Breed objects.', 'list'), cached=True
+    ),
+    Endpoint(
+        'get_favourite_dog_by_id', 'get', 'favourites/{favourite_id}',
+        args=(Arg('favourite_id', arg_type=str,
+                  doc='Favourite identificator.'),),
+        callback='process_favourite',
+        doc='Get favourite image by its identificator.',
+        returns=('dog', 'Image object.', 'models.Dog'), requires_key=True
+    ),
+    Endpoint(
+        'get_favourite_dogs', 'get', 'favourites',
+        callback='process_favourites', doc='Get list of favourite images.',
+        returns=('dogs', 'List of image objects.', 'list'),
+        requires_key=True
+    ),
+    Endpoint(
+        'post_favourite_dogs', 'post', 'favourites',
+        args=(Arg('image_id', 'data', arg_type=str,
+                  doc='Image identificator.'), SUB_ID),
+        callback='process_json', doc='Add image to favourites.',
+        returns=('result', 'Request result.', 'dict'), requires_key=True
+    ),
+    Endpoint(
+        'delete_from_favourites', 'delete', 'favourites/{favourite_id}',
+        args=(Arg('favourite_id', arg_type=str,
+                  doc='Favourite identificator.'),),
+        callback='process_json', doc='Delete image from favourites.',
+        returns=('result', 'Request result.', 'dict'), requires_key=True
+    ),
+    Endpoint(
+        'get_votes', 'get', 'votes', callback='process_json',
+        doc='Get user votes.', returns=('votes', 'User votes.', 'list')
+    ),
+    Endpoint(
+        'get_vote_by_id', 'get', 'votes/{vote_id}',
+        args=(Arg('vote_id', arg_type=str, doc='Vote identificator.'),),
+        callback='process_json', doc='Get user vote by vote id.',
+        returns=('vote', 'User vote.', 'dict')
+    ),
+    Endpoint(
+        'post_vote', 'post', 'votes',
+        args=(Arg('image_id', 'data', arg_type=str,
+                  doc='Image identificator.'), SUB_ID),
+        callback='process_json', doc='Submit your vote for image.',
+        returns=('result', 'Request result.', 'dict'), requires_key=True
+    ),
+    Endpoint(
+        'delete_vote', 'delete', 'votes/{vote_id}',
+        args=(Arg('vote_id', arg_type=str, doc='Vote identificator.'),),
+        callback='process_json', doc='Delete image vote.',
+        returns=('result', 'Request result.', 'dict'), requires_key=True
+    )
+)
 
 
 class DogApi(API):
-    """DogApi class."""
+    """DogApi class.
 
-    def __init__(self, *args, **kwargs):
-        """DogApi object init."""
-        super().__init__(*args, **kwargs)
-
-    def search(self, breed_id=None, mine_types=None, limit=1):
-        """Search dogs using various filters.
-
-        :param breed_id: Breed id.
-        :type breed_id: int
-
-        :param mine_types: Image extensions to search.
-        :type mine_types: list
-
-        :param limit: Number of images to search.
-        :type limit: int
-
-        :return dogs: Fetched dogs.
-        :type dogs: list
-        """
-        valid_mine_types = ['gif', 'jpg', 'png']
-        if isinstance(mine_types, list):
-            if all(elem in valid_mine_types for elem in mine_types):
-                mine_types = ', '.join(mine_types)
-        elif mine_types in valid_mine_types:
-            pass
-        else:
-            mine_types = None
-
-        # remove variable so it will not be in locals
-        del valid_mine_types
-
-        if not isinstance(limit, int):
-            limit = 1
+    Endpoint methods are generated from the ENDPOINTS table.
+    """
 
-        if self.debug and breed_id:
-            self.check_arg_type(breed_id, int)
+    endpoints = ENDPOINTS
 
-        # getting the args that were passed to function
-        args = locals()
+    # model of images returned by the API
+    image_model = Dog
 
-        # composing the params dict
-        params = {arg: str(args.get(arg)) for arg in args if args.get(arg)
-                  and arg != 'self'}
-
-        # compose endpoint url
-        search_url = ''.join([
-            self.base_url,
-            self.api_version,
-            'images/search'
-        ])
-
-        # fetching Dogs from API
-        resp = self.make_request('get', search_url, params=params)
-
-        # convert response data to python dict
-        resp_data = resp.json()
-
-        return [self.process_response(dog) for dog in resp_data]
-
-    def get_image_by_id(self, image_id):
-        """Get dog image by image_id.
-
-        :param image_id: Dog image id.
-        :type image_id: str
-        """
-        # compose endpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'images/',
-            image_id
-        ])
-
-        # make request to remote server
-        resp = self.make_request('get', url)
-
-        # convert response to python dict
-        resp_data = resp.json()
-
-        return self.process_response(resp_data)
+    def __init__(self, *args, **kwargs):
+        """DogApi object init."""
+        super().__init__(*args, **kwargs)
 
     @API.requires_api_key
     def upload_image(self, filepath, sub_id=None, breed_ids=None):
@@ -104,7 +172,7 @@ class DogApi(API):
         :type breed_ids: list
 
         :return result: Request result.
-        :rtype: bool
+        :rtype: requests.Response
         """
         # check that args have valid type
         if self.debug:
@@ -123,10 +191,6 @@ class DogApi(API):
                 "File do not exist or it is a link!"
             )
 
-        files = {'file': open(filepath, 'rb')}
-
-        headers = {'Content-Type': 'multipart/form-data'}
-
         data = {}
 
         if sub_id:
@@ -137,537 +201,245 @@ class DogApi(API):
         if breed_ids:
             # check that breed_ids has correct type
             self.check_arg_type(breed_ids, list)
-            data['breed_ids'] = breed_ids
-
-        resp = self.make_request('post', url, params=data, files=files,
-                                 headers=headers)
-        return resp
+            data['breed_ids'] = ','.join(str(breed) for breed in breed_ids)
 
-    @API.requires_api_key
-    def delete_image_by_id(self, image_id):
-        """Delete dog image from the API.
-
-        :param image_id: Image identificator.
-        :type image_id: str
+        # file is streamed from disk and closed once it is sent
+        body = MultipartStream(filepath, fields=data)
+        headers = {
+            'Content-Type': body.content_type,
+            'Content-Length': str(len(body))
+        }
+        return self.dispatch('post', url, data=body, headers=headers,
+                             endpoint='upload_image')
 
-        :return resp: ???
-        :rtype: ???
-        """
-        # checking the type of image_id var if debug mode is on
-        if self.debug:
-            self.check_arg_type(image_id, str)
+    def upload_images(self, filepaths, sub_id=None, breed_ids=None,
+                      workers=4):
+        """Upload many Dog images concurrently.
 
-        # compose endpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'image/',
-            image_id
-        ])
-
-        # delete an image from a API
-        resp = self.make_request('delete', url)
-        return resp
+        Failed uploads do not stop the rest of the batch,
+        the error is reported in the file result.
 
-    def get_images(self, limit=1, page=0, order='DESC'):
-        """Get dog images from the API.
+        :param filepaths: Directory with images or iterable of paths.
+        :type filepaths: str or iterable
 
-        :param limit: Length of return images list.
-        :type limit: int
+        :param sub_id: Image owner identificator.
+        :type sub_id: str
 
-        :param page: Pagination parameter.
-        :type page: int
+        :param breed_ids: Breeds of the dogs in the images.
+        :type breed_ids: list
 
-        :param order: Order of the return images list.
-        :type order: str
+        :param workers: Number of parallel uploads.
+        :type workers: int
 
-        :return dogs_list: List of Dog objects.
-        :rtype: list
+        :return report: Upload result per file and aggregate throughput.
+        :rtype: api.BulkReport
         """
-        # compose endpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'images/'
-        ])
-
-        # set default limit value if it is not int
-        if not isinstance(limit, int):
-            limit = 1
-
-        # set default page value if it is not int
-        if not isinstance(page, int):
-            page = 0
+        if isinstance(filepaths, str):
+            filepaths = list_images(filepaths)
 
-        # check that order value is valid
-        if order not in ['DESC', 'ASC']:
-            order = 'DESC'
+        def make_result(filepath, resp, error, duration):
+            size = 0 if error else path.getsize(filepath)
+            return UploadResult(filepath, size, duration, resp, error)
 
-        args = locals()
+        return self.bulk_report(
+            lambda filepath: self.upload_image(filepath, sub_id, breed_ids),
+            filepaths, make_result, workers=workers
+        )
 
-        # filling the params dict
-        params = {arg: str(args.get(arg)) for arg in args if args.get(arg)
-                  and arg != 'self'}
+    def iter_images(self, limit=25, order='DESC', start_page=0,
+                    max_pages=None):
+        """Iterate over uploaded dog images page by page.
 
-        # make request to API server
-        resp = self.make_request('get', url, params)
+        Next page is fetched in background while the current one
+        is consumed.
 
-        # convert return data to python dict
-        dogs_data = resp.json()
+        :param limit: Page size.
+        :type limit: int
 
-        return [self.process_response(dog) for dog in dogs_data]
+        :param order: Order of the images.
+        :type order: str
 
-    def get_breeds_by_image_id(self, image_id):
-        """Get dog breeds from an image.
+        :param start_page: First page to fetch.
+        :type start_page: int
 
-        :param image_id: Dog image identificator.
-        :type image_id: str
+        :param max_pages: Max number of pages to fetch.
+        :type max_pages: int
 
-        :return list_: List of Breed objects.
-        :rtype: list
+        :return dogs: Iterator over Dog objects.
+        :rtype: generator
         """
-        # check that args have correct type
-        if self.debug:
-            self.check_arg_type(image_id, str)
+        return self.iter_pages(
+            lambda page: self.get_images(limit=limit, page=page, order=order),
+            start_page=start_page, max_pages=max_pages
+        )
 
-        # compose endpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'images/',
-            image_id,
-            '/breeds'
-        ])
+    def iter_search(self, breed_id=None, mine_types=None, limit=25,
+                    order='ASC', start_page=0, max_pages=None):
+        """Iterate over search results page by page.
 
-        # make get request to the API
-        resp = self.make_request('get', url)
+        Next page is fetched in background while the current one
+        is consumed. RANDOM order never runs out of pages, so max_pages
+        has to be passed with it.
 
-        # convert response data to python dict
-        breeds_data = resp.json()
+        :param breed_id: Breed id.
+        :type breed_id: int
 
-        return [Breed(**breed) for breed in breeds_data]
+        :param mine_types: Image extensions to search.
+        :type mine_types: list
 
-    @API.requires_api_key
-    def add_breed_to_image(self, image_id, breed_id):
-        """Add dog breed to dog image.
+        :param limit: Page size.
+        :type limit: int
 
-        :param image_id: Dog image identificator.
-        :type image_id: str
+        :param order: Order of the images.
+        :type order: str
 
-        :param breed_id: Dog breed identificator.
-        :type breed_id: int
+        :param start_page: First page to fetch.
+        :type start_page: int
 
-        :return resp: ???
-        :rtype: ???
-        """
-        # check that args have correct type
-        if self.debug:
-            self.check_arg_type(image_id, str)
-            self.check_arg_type(breed_id, int)
+        :param max_pages: Max number of pages to fetch.
+        :type max_pages: int
 
-        # compose endpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'images/',
-            image_id,
-            '/breeds'
-        ])
-
-        # compose data payload dict
-        data = {'breed_id': breed_id}
-
-        # make request to API server
-        resp = self.make_request('post', url, data=data)
-        return resp
+        :return dogs: Iterator over Dog objects.
+        :rtype: generator
+        """
+        return self.iter_pages(
+            lambda page: self.search(breed_id=breed_id, mine_types=mine_types,
+                                     limit=limit, page=page, order=order),
+            start_page=start_page, max_pages=max_pages
+        )
 
-    @API.requires_api_key
-    def delete_breed_from_image(self, image_id, breed_id):
-        """Delete breed from image.
+    def image_cache_keys(self, image_id):
+        """Get cache keys of responses that depend on the image.
 
         :param image_id: Image identificator.
         :type image_id: str
 
-        :param breed_id: Breed identificator.
-        :type breed_id: int
-
-        :return resp: ???
-        :rtype: ???
+        :return keys: (endpoint, url) pairs.
+        :rtype: list
         """
-        # check that args have correct type
-        if self.debug:
-            self.check_arg_type(image_id, str)
-            self.check_arg_type(breed_id, int)
-
-        # compose endpoing url
-        url = ''.join([
+        image_url = ''.join([
             self.base_url,
             self.api_version,
             'images/',
-            image_id,
-            '/breeds/',
-            str(breed_id)
-        ])
-
-        # making request to the remote server
-        resp = self.make_request('delete', url)
-
-        return resp
-
-    def get_breed_by_id(self, breed_id):
-        """Get breed by its identificator.
-
-        :param breed_id: Breed identificator.
-        :type breed_id: int
-
-        :return breed: Breed object.
-        :rtype: models.Breed
-        """
-        # check that arg has correct type
-        if self.debug:
-            self.check_arg_type(breed_id, int)
-
-        # compose endpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'breeds/',
-            str(breed_id)
+            image_id
         ])
+        return [
+            ('get_image_by_id', image_url),
+            ('get_breeds_by_image_id', image_url + '/breeds')
+        ]
 
-        # make request to remote API server
-        resp = self.make_request('get', url)
+    def process_json(self, resp):
+        """Convert response data to python dict.
 
-        # convert resp data to python dict
-        breed_data = resp.json()
+        :param resp: Response from the remote server.
+        :type resp: requests.Response
 
-        return Breed(**breed_data)
-
-    def get_breed_list(self):
-        """Get all breeds.
-
-        :return breeds_list: List of Breed obj.
-        :rtype: list
+        :return data: Response data.
+        :rtype: dict
         """
-        # compose endpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'breeds'
-        ])
+        return self.decode(resp)
 
-        # make request to remote API server
-        resp = self.make_request('get', url)
+    def process_dog(self, resp):
+        """Creates Dog object from response.
 
-        # convert resp data to python dict
-        breeds_data = resp.json()
-
-        return [Breed(**breed) for breed in breeds_data]
-
-    @API.requires_api_key
-    def get_favourite_dog_by_id(self, favourite_id):
-        """Get favourite dog image by its identificator.
-
-        :param favourite_id: Identificator of the dog image.
-        :type favourite_id: str
+        :param resp: Response from the remote server.
+        :type resp: requests.Response
 
         :return dog: Dog object.
         :rtype: models.Dog
         """
-        # check that arg has correct type
-        if self.debug:
-            self.check_arg_type(favourite_id, str)
-
-        # compose endpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'favourites/',
-            favourite_id
-        ])
-
-        # make request to remote API server
-        resp = self.make_request('get', url)
+        return self.process_response(self.decode(resp))
 
-        # convert resp data to python dict
-        dog_data = resp.json()
+    def process_dogs(self, resp):
+        """Creates list of Dog objects from response.
 
-        return Dog(*dog_data)
+        :param resp: Response from the remote server.
+        :type resp: requests.Response
 
-    @API.requires_api_key
-    def get_favourite_dogs(self):
-        """Get list of favourite dogs.
-
-        :return dogs_list: List of Dog objects.
+        :return dogs: List of Dog objects.
         :rtype: list
         """
-        # compose endpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'favourites'
-        ])
-
-        # make request to remote API server
-        resp = self.make_request('get', url)
-
-        # convert response data to python dict
-        dogs_data = resp.json()
-
-        return [Dog(**dog) for dog in dogs_data]
-
-    @API.requires_api_key
-    def post_favourite_dogs(self, image_id, sub_id):
-        """Post favourite dog.
-
-        :param image_id: Image identificator.
-        :type image_id: str
-
-        :param sub_id: User identificator.
-        :type sub_id: str
-
-        :return resp: ???
-        :rtype: ???
-        """
-        # check if args have correct types
-        if self.debug:
-            self.check_arg_type(image_id, str)
-            self.check_arg_type(sub_id, str)
-
-        # compose endpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'favourites'
-        ])
-
-        # compose payload dict
-        payload = {
-            "image_id": image_id,
-            "sub_id": sub_id
-        }
-
-        # make request to remote server
-        resp = self.make_request('post', url, data=payload)
-
-        # convert resp data to python dict
-        result = resp.json()
-
-        return result
-
-    @API.requires_api_key
-    def delete_from_favourites(self, favourite_id):
-        """Delete dog image from favourites by image identificator.
-
-        :param image_id: Image identificator.
-        :type image_id: str
-
-        :return result: ???
-        :rtype: ??
-        """
-        # check if arg has correct type
-        if self.debug:
-            self.check_arg_type(favourite_id, str)
-
-        # compose endpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'favourites/',
-            favourite_id
-        ])
-
-        # make request to remote API server
-        resp = self.make_request('delete', url)
+        process_response = self.process_response
+        return [process_response(dog) for dog in self.decode(resp)]
 
-        # convert resp data to python dict
-        result = resp.json()
+    def process_breed(self, resp):
+        """Creates Breed object from response.
 
-        return result
+        :param resp: Response from the remote server.
+        :type resp: requests.Response
 
-    def get_votes(self):
-        """Get user votes.
-
-        :return votes: ???
-        :rtype: ???
+        :return breed: Breed object.
+        :rtype: models.Breed
         """
-        # compose endpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'votes'
-        ])
+        return Breed.from_dict(self.decode(resp))
 
-        # make request to remote API server
-        resp = self.make_request('get', url)
+    def process_breeds(self, resp):
+        """Creates list of Breed objects from response.
 
-        # convert resp data to dict
-        votes = resp.json()
+        :param resp: Response from the remote server.
+        :type resp: requests.Response
 
-        return votes
-
-    def get_vote_by_id(self, vote_id):
-        """Get user vote by vote id.
-
-        :param vote_id: Vote identificator.
-        :type vote_id: str ???
-
-        :return vote: User vote ???
-        :rtype: ???
+        :return breeds: List of Breed objects.
+        :rtype: list
         """
-        # check that arg has correct type
-        if self.debug:
-            self.check_arg_type(vote_id, str)
-
-        # compose endpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'votes/',
-            vote_id
-        ])
-
-        # make request to remote API server
-        resp = self.make_request('get', url)
+        return [Breed.from_dict(breed) for breed in self.decode(resp)]
 
-        vote = resp.json()
+    def process_favourite(self, resp):
+        """Creates Dog object from favourite response.
 
-        return vote
+        :param resp: Response from the remote server.
+        :type resp: requests.Response
 
-    @API.requires_api_key
-    def post_vote(self, image_id, sub_id):
-        """Submit your vote for dog image.
-
-        :param image_id: Image identificator.
-        :type image_id: str
-
-        :param sub_id: User identificator.
-        :type sub_id: str
-
-        :return result: ???
-        :rtype: ???
+        :return dog: Dog object.
+        :rtype: models.Dog
         """
-        # check that args have correct type
-        if self.debug:
-            self.check_arg_type(image_id, str)
-            self.check_arg_type(sub_id, str)
-
-        # compose endpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'votes'
-        ])
-
-        # prepare request payload data
-        payload = {
-            "image_id": image_id,
-            "sub_id": sub_id
-        }
-
-        # make request to remote API server
-        resp = self.make_request('post', url, data=payload)
+        return self.image_model.from_dict(self.decode(resp))
 
-        # convert response data to python dict
-        result = resp.json()
+    def process_favourites(self, resp):
+        """Creates list of Dog objects from favourites response.
 
-        return result
+        :param resp: Response from the remote server.
+        :type resp: requests.Response
 
-    @API.requires_api_key
-    def delete_vote(self, vote_id):
-        """Delete image vote.
-
-        :param vote_id: Image identificator.
-        :type vote_id: str
-
-        :return result: Request result.
-        :rtype: bool
+        :return dogs: List of Dog objects.
+        :rtype: list
         """
-        # check that arg has correct type
-        if self.debug:
-            self.check_arg_type(vote_id, str)
-
-        # compose enpoint url
-        url = ''.join([
-            self.base_url,
-            self.api_version,
-            'votes/',
-            vote_id
-        ])
-
-        # make request to remote API server
-        resp = self.make_request('delete', url)
+        from_dict = self.image_model.from_dict
+        return [from_dict(dog) for dog in self.decode(resp)]
 
-        # convert resp data to python dict
-        result = resp.json()
-
-        return result
-
-    @staticmethod
-    def process_response(resp_data):
-        """Creates Dog object from response data.
+    @classmethod
+    def process_response(cls, resp_data):
+        """Creates image object from response data.
 
         :param resp_data: Response data.
         :type resp_data: dict
 
-        :return dog: Dog object.
+        :return dog: Image object.
         :rtype: models.Dog
         """
-        animals = []
-        breeds = []
-        categories = []
-
-        # if images has info regarding dogs breeds
-        try:
-            if resp_data['breeds']:
-
-                # iterate over all breeds
-                for breed in resp_data['breeds']:
-
-                    # append Breed objects
-                    breeds.append(
-                        Breed(**breed)
-                    )
-        except KeyError:
-            pass
-
-        # if images has info regarding animals
-        try:
-            if resp_data['animals']:
-
-                # iterate ovel all animals
-                for animal in resp_data['animals']:
-
-                    # append Animal objects
-                    animals.append(
-                        Animal(**animal)
-                    )
-        except KeyError:
-            pass
-
-        # if images has info regarding dogs categories
-        try:
-            if resp_data['categories']:
-
-                # iterate over all categories
-                for category in resp_data['categories']:
-
-                    # append Category objects
-                    categories.append(
-                        Category(**category)
-                    )
-        except KeyError:
-            pass
-
-        dog_data = {
-            'id': resp_data['id'],
-            'url': resp_data['url'],
-            'image_width': resp_data['width'],
-            'image_height': resp_data['height'],
-            'breeds': breeds,
-            'animals': animals,
-            'categories': categories
-        }
-
-        dog = Dog(**dog_data)
+        # nested lists may be missing or null
+        breeds = resp_data.get('breeds')
+        animals = resp_data.get('animals')
+        categories = resp_data.get('categories')
+
+        dog = cls.image_model.__new__(cls.image_model)
+        dog.id = resp_data['id']
+        dog.url = resp_data['url']
+        dog.image_width = resp_data['width']
+        dog.image_height = resp_data['height']
+        dog.breeds = [Breed.from_dict(breed) for breed in breeds] \
+            if breeds else []
+        dog.animals = [Animal.from_dict(animal) for animal in animals] \
+            if animals else []
+        dog.categories = [Category.from_dict(category)
+                          for category in categories] if categories else []
+        dog.extras = None
         return dog
+
+
+def __getattr__(name):
+    """Import async client from its module on first access."""
+    if name == 'AsyncDogApi':
+        from .aio import AsyncDogApi
+        return AsyncDogApi
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,388 @@
+"""Endpoint registry module.
+
+Endpoints are declared as data and the client methods are built from
+them when the client class is created. Path templates, argument
+encoders and type checks are resolved once, so a call only formats the
+url, encodes its query params and dispatches the request.
+"""
+import re
+from operator import itemgetter
+from types import FunctionType
+
+from .exceptions import APIKeyNotSpecified, IlligalArgumentType
+
+# marks arguments without default value
+REQUIRED = object()
+
+PATH_ARG = re.compile(r'{(\w+)}')
+
+
+def to_str(value):
+    """Encode optional query param.
+
+    :param value: Argument value.
+    :type value: any
+
+    :return value: Encoded value or None to omit the param.
+    :rtype: str
+    """
+    if value is None:
+        return None
+    return str(value)
+
+
+def int_or(default=None):
+    """Make encoder of integer query params.
+
+    :param default: Value sent instead of non-integer ones.
+    :type default: int
+
+    :return encode: Encoder.
+    :rtype: callable
+    """
+    default = to_str(default)
+
+    def encode(value):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return str(value)
+        return default
+    return encode
+
+
+def choice(choices, default=None):
+    """Make encoder of query params with a fixed set of values.
+
+    :param choices: Allowed values.
+    :type choices: tuple
+
+    :param default: Value sent instead of unknown ones.
+    :type default: str
+
+    :return encode: Encoder.
+    :rtype: callable
+    """
+    choices = frozenset(choices)
+
+    def encode(value):
+        return value if value in choices else default
+    return encode
+
+
+def mime_types(value):
+    """Encode image extensions to search.
+
+    :param value: Extension or list of them.
+    :type value: str or list
+
+    :return value: Comma separated extensions or None to omit the param.
+    :rtype: str
+    """
+    valid = ('gif', 'jpg', 'png')
+    if isinstance(value, list):
+        if value and all(elem in valid for elem in value):
+            return ','.join(value)
+        return None
+    return value if value in valid else None
+
+
+def check_arg(name, value, arg_type):
+    """Checks that argument value is instance of arg_type.
+
+    :param name: Argument name.
+    :type name: str
+
+    :param value: Argument value to check.
+    :type value: any
+
+    :param arg_type: Argument class.
+    :type arg_type: class
+
+    :raises IlligalArgumentType if value is not an instance of arg_type.
+    """
+    if not isinstance(value, arg_type):
+        raise IlligalArgumentType(
+            "%s type is %s but it should be %s" % (
+                name, type(value), arg_type))
+
+
+class Arg(object):
+    """Endpoint argument."""
+
+    __slots__ = ('name', 'location', 'default', 'arg_type', 'encode', 'key',
+                 'doc')
+
+    def __init__(self, name, location='path', default=REQUIRED,
+                 arg_type=None, encode=to_str, key=None, doc=''):
+        """Arg object init.
+
+        :param name: Argument name.
+        :type name: str
+
+        :param location: Where the value is sent: path, query or data.
+        :type location: str
+
+        :param default: Default value, the argument is required if omitted.
+        :type default: any
+
+        :param arg_type: Type checked in debug mode.
+        :type arg_type: class
+
+        :param encode: Converts query param value to str, None omits it.
+        :type encode: callable
+
+        :param key: Name of the param sent to the API, name by default.
+        :type key: str
+
+        :param doc: Argument description.
+        :type doc: str
+        """
+        self.name = name
+        self.location = location
+        self.default = default
+        self.arg_type = arg_type
+        self.encode = encode
+        self.key = key or name
+        self.doc = doc
+
+
+class Endpoint(object):
+    """Declarative description of an API endpoint."""
+
+    def __init__(self, name, method, path, args=(), callback=None,
+                 doc='', returns=None, requires_key=False, cached=False,
+                 invalidates=None):
+        """Endpoint object init.
+
+        :param name: Name of the generated method.
+        :type name: str
+
+        :param method: Request type.
+        :type method: str
+
+        :param path: Path template relative to the API version root,
+                     e.g. 'images/{image_id}/breeds'.
+        :type path: str
+
+        :param args: Method arguments.
+        :type args: tuple
+
+        :param callback: Name of client method that converts the response
+                         to models.
+        :type callback: str
+
+        :param doc: Method description.
+        :type doc: str
+
+        :param returns: Name, description and type of the result.
+        :type returns: tuple
+
+        :param requires_key: Method requires API key.
+        :type requires_key: bool
+
+        :param cached: Responses may be stored in the response cache.
+        :type cached: bool
+
+        :param invalidates: Name of client method and its argument that
+                            give cache keys which become stale.
+        :type invalidates: tuple
+        """
+        self.name = name
+        self.method = method
+        self.path = path
+        self.args = tuple(args)
+        self.callback = callback
+        self.doc = doc
+        self.returns = returns
+        self.requires_key = requires_key
+        self.cached = cached
+        self.invalidates = invalidates
+
+        # '%' of literal parts must survive string formatting
+        self.path_args = tuple(PATH_ARG.findall(path))
+        self.template = PATH_ARG.sub('%s', path.replace('%', '%%'))
+
+        self.positions = {arg.name: index
+                          for index, arg in enumerate(self.args)}
+        self.defaults = tuple(arg.default for arg in self.args)
+        self.required = sum(1 for arg in self.args if arg.default is REQUIRED)
+        if any(arg.default is REQUIRED for arg in self.args[self.required:]):
+            raise ValueError("%s required args have to precede optional "
+                             "ones" % name)
+        missing = [name for name in self.path_args
+                   if name not in self.positions]
+        if missing:
+            raise ValueError("%s path has undeclared args %s" % (
+                name, ', '.join(missing)))
+
+    def docstring(self):
+        """Compose Sphinx docstring of the generated method.
+
+        :return doc: Docstring.
+        :rtype: str
+        """
+        lines = [self.doc]
+        for arg in self.args:
+            lines.append('')
+            lines.append(':param %s: %s' % (arg.name, arg.doc))
+            if arg.arg_type is not None:
+                lines.append(':type %s: %s' % (arg.name,
+                                               arg.arg_type.__name__))
+        if self.returns:
+            name, doc, rtype = self.returns
+            lines.extend(['', ':return %s: %s' % (name, doc),
+                          ':rtype: %s' % rtype])
+        return '\n'.join(lines)
+
+    def make_method(self):
+        """Generate client method.
+
+        Everything that doesn't depend on the call arguments is resolved
+        here, so a call only formats the url and encodes the params. The
+        method takes the endpoint args by name, Python binds them without
+        *args/**kwargs packing.
+
+        :return method: Function that calls the endpoint.
+        :rtype: callable
+        """
+        name = self.name
+        req_type = self.method
+        requires_key = self.requires_key
+        callback = self.callback
+        template = '%s%s' + self.template
+        path_index = tuple(self.positions[arg] for arg in self.path_args)
+        # getter of path arg values, a slice keeps a single value in
+        # a sequence, None when the path takes all args in order
+        if path_index == tuple(range(len(self.args))):
+            path_values = None
+        elif len(path_index) > 1:
+            path_values = itemgetter(*path_index)
+        elif path_index:
+            path_values = itemgetter(slice(path_index[0], path_index[0] + 1))
+        else:
+            path_values = itemgetter(slice(0, 0))
+        checked = tuple(
+            (arg.name, index, arg.arg_type, arg.default is REQUIRED)
+            for index, arg in enumerate(self.args)
+            if arg.arg_type is not None
+        )
+        query = tuple((index, arg.key, arg.encode)
+                      for index, arg in enumerate(self.args)
+                      if arg.location == 'query')
+        data = tuple((index, arg.key, arg.default is REQUIRED)
+                     for index, arg in enumerate(self.args)
+                     if arg.location == 'data')
+        invalidates, invalidated = None, None
+        if self.invalidates:
+            invalidates = self.invalidates[0]
+            invalidated = self.positions[self.invalidates[1]]
+
+        def call(api, values):
+            if requires_key and not api.api_key:
+                raise APIKeyNotSpecified(
+                    'You should provide API key for using this method!')
+            if api.debug:
+                for arg_name, index, arg_type, mandatory in checked:
+                    if mandatory or values[index] is not None:
+                        check_arg(arg_name, values[index], arg_type)
+
+            url = template % ((api.base_url, api.api_version) + (
+                values if path_values is None else path_values(values)))
+            handler = getattr(api, callback) if callback else None
+            stale = None
+            # stale keys only matter to a response cache, the method is
+            # looked up on the class to skip a bound method allocation
+            if invalidates and api.cache is not None:
+                stale = getattr(type(api), invalidates)(
+                    api, values[invalidated])
+
+            if query:
+                params = {}
+                for index, key, encode in query:
+                    value = encode(values[index])
+                    if value is not None:
+                        params[key] = value
+            if data:
+                payload = {}
+                for index, key, mandatory in data:
+                    if mandatory or values[index] is not None:
+                        payload[key] = values[index]
+            if query and data:
+                return api.dispatch(req_type, url, handler, name, stale,
+                                    params=params, data=payload)
+            if query:
+                return api.dispatch(req_type, url, handler, name, stale,
+                                    params=params)
+            if data:
+                return api.dispatch(req_type, url, handler, name, stale,
+                                    data=payload)
+            return api.dispatch(req_type, url, handler, name, stale)
+
+        method = fixed_signature(call, name, ('self',) + tuple(
+            arg.name for arg in self.args))
+        method.__defaults__ = self.defaults[self.required:] or None
+        method.__doc__ = self.docstring()
+        method.endpoint = self
+        return method
+
+
+def fixed_signature(call, name, names):
+    """Make function that passes its arguments to call as a tuple.
+
+    The function is one of the templates below with its parameters
+    renamed, so it keeps the signature of a hand-written method.
+
+    :param call: Function taking the first argument and a tuple of
+                 the others.
+    :type call: callable
+
+    :param name: Function name.
+    :type name: str
+
+    :param names: Parameter names.
+    :type names: tuple
+
+    :return func: Function.
+    :rtype: function
+    """
+    templates = (
+        lambda api: call(api, ()),
+        lambda api, a: call(api, (a,)),
+        lambda api, a, b: call(api, (a, b)),
+        lambda api, a, b, c: call(api, (a, b, c)),
+        lambda api, a, b, c, d: call(api, (a, b, c, d)),
+        lambda api, a, b, c, d, e: call(api, (a, b, c, d, e)),
+        lambda api, a, b, c, d, e, f: call(api, (a, b, c, d, e, f))
+    )
+    if len(names) > len(templates):
+        raise ValueError("methods take at most %d arguments" % (
+            len(templates) - 1))
+    func = templates[len(names) - 1]
+    if 'call' in names:
+        raise ValueError("'call' can't be a parameter name")
+    code = func.__code__.replace(co_name=name, co_varnames=names)
+    return FunctionType(code, func.__globals__, name, None,
+                        func.__closure__)
+
+
+def install_endpoints(cls):
+    """Generate methods of endpoints declared by the client class.
+
+    Methods defined in the class body take precedence over generated
+    ones. Cached endpoints of the class and its parents become
+    cached_endpoints of the class.
+
+    :param cls: Client class with endpoints attribute.
+    :type cls: type
+    """
+    for endpoint in cls.__dict__['endpoints']:
+        if endpoint.name not in cls.__dict__:
+            method = endpoint.make_method()
+            method.__qualname__ = '%s.%s' % (cls.__qualname__, endpoint.name)
+            method.__module__ = cls.__module__
+            setattr(cls, endpoint.name, method)
+
+    cls.cached_endpoints = tuple(
+        endpoint.name for klass in reversed(cls.__mro__)
+        for endpoint in klass.__dict__.get('endpoints', ())
+        if endpoint.cached
+    )
@@ -49,3 +49,26 @@ class NotAValidDirectory(Exception):
     """NotAValidDirectory.
     Raises when directory does not exist or user don't have access to it.
     """
+
+
+class DownloadError(Exception):
+    """DownloadError.
+    Raises when downloaded file is bigger than allowed or its size
+    doesn't match Content-Length header.
+    """
+    pass
+
+
+class CassetteMissError(Exception):
+    """CassetteMissError.
+    Raises when replayed request was not recorded to the cassette.
+    """
+    pass
+
+
+class ProbeError(Exception):
+    """ProbeError.
+    Raises when image format is unknown or its header can't be parsed
+    from the fetched bytes.
+    """
+    pass
@@ -0,0 +1,265 @@
+"""Columnar result sets module."""
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def ragged(lists):
+    """Flatten lists of ids into values and offsets arrays.
+
+    :param lists: Lists of ids.
+    :type lists: list
+
+    :return ragged: Values and offsets, items of row i are
+                    values[offsets[i]:offsets[i + 1]].
+    :rtype: tuple
+    """
+    values = array('q')
+    offsets = array('q', [0])
+    for items in lists:
+        values.extend(items)
+        offsets.append(len(values))
+    return (np.frombuffer(values, dtype=np.int64),
+            np.frombuffer(offsets, dtype=np.int64))
+
+
+class DogFrame(object):
+    """Columnar container of Dog image metadata.
+
+    Every column is a numpy array, breed and category ids of a row are
+    stored as ragged arrays of flat values with row offsets. Rows cost
+    a few dozen bytes instead of a Dog object with nested models, and
+    filters and aggregations run without a Python loop over rows.
+    """
+
+    def __init__(self, ids, urls, widths, heights, breed_ids,
+                 breed_offsets, category_ids, category_offsets,
+                 breed_names=None):
+        """DogFrame object init.
+
+        :param ids: Image ids.
+        :type ids: numpy.ndarray
+
+        :param urls: Image urls.
+        :type urls: numpy.ndarray
+
+        :param widths: Image widths.
+        :type widths: numpy.ndarray
+
+        :param heights: Image heights.
+        :type heights: numpy.ndarray
+
+        :param breed_ids: Flat breed ids of all rows.
+        :type breed_ids: numpy.ndarray
+
+        :param breed_offsets: Row offsets into breed_ids.
+        :type breed_offsets: numpy.ndarray
+
+        :param category_ids: Flat category ids of all rows.
+        :type category_ids: numpy.ndarray
+
+        :param category_offsets: Row offsets into category_ids.
+        :type category_offsets: numpy.ndarray
+
+        :param breed_names: Breed names by breed id.
+        :type breed_names: dict
+        """
+        if np is None:
+            raise ImportError("numpy is required for DogFrame!")
+
+        self.ids = ids
+        self.urls = urls
+        self.widths = widths
+        self.heights = heights
+        self.breed_ids = breed_ids
+        self.breed_offsets = breed_offsets
+        self.category_ids = category_ids
+        self.category_offsets = category_offsets
+        self.breed_names = breed_names or {}
+
+    @classmethod
+    def from_dogs(cls, dogs):
+        """Collect Dog objects into a frame.
+
+        Dogs are consumed one by one, so a generator such as
+        DogApi.iter_images is never held in memory as a list.
+
+        :param dogs: Dog objects.
+        :type dogs: iterable
+
+        :return frame: Frame with a row per dog.
+        :rtype: DogFrame
+        """
+        if np is None:
+            raise ImportError("numpy is required for DogFrame!")
+
+        ids = []
+        urls = []
+        sizes = array('q')
+        breeds = []
+        categories = []
+        breed_names = {}
+        for dog in dogs:
+            ids.append(dog.id or '')
+            urls.append(dog.url or '')
+            sizes.append(dog.image_width or 0)
+            sizes.append(dog.image_height or 0)
+
+            breed_ids = []
+            for breed in dog.breeds or ():
+                breed_ids.append(breed.id)
+                breed_names[breed.id] = breed.name
+            breeds.append(breed_ids)
+            categories.append([category.id for category in
+                               dog.categories or ()])
+
+        sizes = np.frombuffer(sizes, dtype=np.int64).reshape(-1, 2)
+        return cls(
+            np.array(ids, dtype=np.str_), np.array(urls, dtype=np.str_),
+            sizes[:, 0].copy(), sizes[:, 1].copy(),
+            *ragged(breeds) + ragged(categories), breed_names=breed_names
+        )
+
+    def __len__(self):
+        """."""
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        """Memory used by the columns in bytes."""
+        return sum(column.nbytes for column in (
+            self.ids, self.urls, self.widths, self.heights, self.breed_ids,
+            self.breed_offsets, self.category_ids, self.category_offsets))
+
+    @property
+    def aspect_ratios(self):
+        """Width to height ratios, NaN for images with unknown size."""
+        heights = self.heights.astype(np.float64)
+        heights[heights == 0] = np.nan
+        return self.widths / heights
+
+    @property
+    def breed_rows(self):
+        """Row index of every item of breed_ids."""
+        return np.repeat(np.arange(len(self)), np.diff(self.breed_offsets))
+
+    def breeds_of(self, row):
+        """Get breed ids of the row.
+
+        :param row: Row index.
+        :type row: int
+
+        :return breed_ids: Breed ids.
+        :rtype: numpy.ndarray
+        """
+        return self.breed_ids[
+            self.breed_offsets[row]:self.breed_offsets[row + 1]]
+
+    def has_breed(self, breed_id):
+        """Get mask of rows that contain the breed.
+
+        :param breed_id: Breed id.
+        :type breed_id: int
+
+        :return mask: Boolean mask of rows.
+        :rtype: numpy.ndarray
+        """
+        mask = np.zeros(len(self), dtype=bool)
+        mask[self.breed_rows[self.breed_ids == breed_id]] = True
+        return mask
+
+    def filter(self, mask):
+        """Select rows by boolean mask.
+
+        :param mask: Boolean mask of rows, e.g. frame.widths > 500.
+        :type mask: numpy.ndarray
+
+        :return frame: Frame with selected rows.
+        :rtype: DogFrame
+        """
+        mask = np.asarray(mask, dtype=bool)
+        breed_ids, breed_offsets = self.select_ragged(
+            self.breed_ids, self.breed_offsets, mask)
+        category_ids, category_offsets = self.select_ragged(
+            self.category_ids, self.category_offsets, mask)
+        return self.__class__(
+            self.ids[mask], self.urls[mask], self.widths[mask],
+            self.heights[mask], breed_ids, breed_offsets, category_ids,
+            category_offsets, breed_names=self.breed_names
+        )
+
+    @staticmethod
+    def select_ragged(values, offsets, mask):
+        """Select rows of a ragged array by boolean mask.
+
+        :param values: Flat values.
+        :type values: numpy.ndarray
+
+        :param offsets: Row offsets into values.
+        :type offsets: numpy.ndarray
+
+        :param mask: Boolean mask of rows.
+        :type mask: numpy.ndarray
+
+        :return ragged: Values and offsets of selected rows.
+        :rtype: tuple
+        """
+        lengths = np.diff(offsets)
+        selected = lengths[mask]
+        new_offsets = np.zeros(len(selected) + 1, dtype=np.int64)
+        np.cumsum(selected, out=new_offsets[1:])
+        return values[np.repeat(mask, lengths)], new_offsets
+
+    def breed_counts(self):
+        """Count rows per breed.
+
+        :return counts: Number of images by breed id.
+        :rtype: dict
+        """
+        breed_ids, counts = np.unique(self.breed_ids, return_counts=True)
+        return dict(zip(breed_ids.tolist(), counts.tolist()))
+
+    def group_by_breed(self, values):
+        """Aggregate row values per breed.
+
+        Rows with several breeds count towards each of them.
+
+        :param values: Value per row, e.g. frame.aspect_ratios.
+        :type values: numpy.ndarray
+
+        :return groups: (count, mean) of values by breed id,
+                        NaN values are skipped.
+        :rtype: dict
+        """
+        values = np.asarray(values, dtype=np.float64)[self.breed_rows]
+        valid = ~np.isnan(values)
+        breed_ids, inverse = np.unique(self.breed_ids[valid],
+                                       return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(breed_ids))
+        sums = np.bincount(inverse, weights=values[valid],
+                           minlength=len(breed_ids))
+        return {breed_id: (count, total / count) for breed_id, count, total
+                in zip(breed_ids.tolist(), counts.tolist(), sums.tolist())}
+
+    @staticmethod
+    def histogram(values, bins=10, value_range=None):
+        """Compute histogram of row values, NaN values are skipped.
+
+        :param values: Value per row, e.g. frame.aspect_ratios.
+        :type values: numpy.ndarray
+
+        :param bins: Number of bins or bin edges.
+        :type bins: int or list
+
+        :param value_range: Lower and upper range of the bins.
+        :type value_range: tuple
+
+        :return histogram: Counts and bin edges.
+        :rtype: tuple
+        """
+        values = np.asarray(values, dtype=np.float64)
+        return np.histogram(values[~np.isnan(values)], bins=bins,
+                            range=value_range)
@@ -0,0 +1,153 @@
+"""Download manifest module."""
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .storage import file_sha256
+
+
+ManifestEntry = namedtuple('ManifestEntry',
+                           ['url', 'id', 'path', 'size', 'sha256'])
+
+
+class Manifest(object):
+    """Persistent index of downloaded images stored in SQLite database.
+
+    Entries are keyed on image url and kept in memory as well, so
+    checking whether an image is already on disk takes a dict lookup
+    and a stat call.
+    """
+
+    def __init__(self, db_path):
+        """Manifest object init.
+
+        :param db_path: Location of the database file.
+        :type db_path: str
+        """
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        with self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "url TEXT PRIMARY KEY, id TEXT, path TEXT, size INTEGER, "
+                "sha256 TEXT, saved REAL)"
+            )
+        self.entries = {
+            row[0]: ManifestEntry(*row) for row in self.db.execute(
+                "SELECT url, id, path, size, sha256 FROM files")
+        }
+
+    def __len__(self):
+        """."""
+        return len(self.entries)
+
+    def get(self, url):
+        """Get manifest entry.
+
+        :param url: Image url.
+        :type url: str
+
+        :return entry: Manifest entry or None if it is missing.
+        :rtype: ManifestEntry
+        """
+        return self.entries.get(url)
+
+    def lookup(self, url, path):
+        """Get entry of the image that is already saved to path.
+
+        The file is trusted if its size matches the recorded one,
+        use verify to detect corrupted content.
+
+        :param url: Image url.
+        :type url: str
+
+        :param path: Expected file location.
+        :type path: str
+
+        :return entry: Manifest entry or None if image has to be fetched.
+        :rtype: ManifestEntry
+        """
+        entry = self.entries.get(url)
+        if entry is None or entry.path != path:
+            return None
+        try:
+            if os.stat(path).st_size != entry.size:
+                return None
+        except OSError:
+            return None
+        return entry
+
+    def add(self, url, obj_id, path, size, sha256):
+        """Record saved image.
+
+        :param url: Image url.
+        :type url: str
+
+        :param obj_id: Image identificator.
+        :type obj_id: str
+
+        :param path: File location.
+        :type path: str
+
+        :param size: File size in bytes.
+        :type size: int
+
+        :param sha256: Hex digest of file content.
+        :type sha256: str
+        """
+        entry = ManifestEntry(url, obj_id, path, size, sha256)
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                entry + (time.time(),)
+            )
+            self.entries[url] = entry
+
+    def remove(self, url):
+        """Remove manifest entry.
+
+        :param url: Image url.
+        :type url: str
+        """
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM files WHERE url = ?", (url,))
+            self.entries.pop(url, None)
+
+    def verify(self, workers=4, remove=False):
+        """Re-hash recorded files to detect missing and corrupted ones.
+
+        :param workers: Number of files hashed in parallel.
+        :type workers: int
+
+        :param remove: Remove entries of invalid files, so they are
+                       fetched again.
+        :type remove: bool
+
+        :return invalid: Entries of missing and corrupted files.
+        :rtype: list
+        """
+        def is_valid(entry):
+            try:
+                return file_sha256(entry.path) == entry.sha256
+            except OSError:
+                return False
+
+        entries = list(self.entries.values())
+
+        # hashlib releases the GIL, so threads hash files in parallel
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            invalid = [entry for entry, valid in
+                       zip(entries, executor.map(is_valid, entries))
+                       if not valid]
+        if remove:
+            for entry in invalid:
+                self.remove(entry.url)
+        return invalid
+
+    def close(self):
+        """Close database connection."""
+        self.db.close()
@@ -0,0 +1,243 @@
+"""Metrics module."""
+import threading
+from bisect import bisect_left
+from collections import deque
+
+# upper bounds of latency histogram buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+
+# number of recent latencies kept per endpoint for percentiles
+SAMPLES = 1024
+
+
+class EndpointMetrics(object):
+    """Counters of a single endpoint."""
+
+    def __init__(self):
+        """EndpointMetrics object init."""
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.samples = deque(maxlen=SAMPLES)
+        self.statuses = {}
+
+    def percentile(self, sorted_samples, fraction):
+        """Get percentile of sorted latency samples.
+
+        :param sorted_samples: Sorted latencies.
+        :type sorted_samples: list
+
+        :param fraction: Percentile as a fraction (0.95 for p95).
+        :type fraction: float
+
+        :return latency: Latency in seconds or None if there are no samples.
+        :rtype: float
+        """
+        if not sorted_samples:
+            return None
+        index = min(len(sorted_samples) - 1,
+                    int(fraction * len(sorted_samples)))
+        return sorted_samples[index]
+
+    def snapshot(self):
+        """Get copy of the counters.
+
+        :return snapshot: Endpoint counters and latency percentiles.
+        :rtype: dict
+        """
+        samples = sorted(self.samples)
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'retries': self.retries,
+            'bytes': self.bytes,
+            'statuses': dict(self.statuses),
+            'latency': {
+                'mean': self.latency_sum / self.count if self.count else None,
+                'p50': self.percentile(samples, 0.50),
+                'p95': self.percentile(samples, 0.95),
+                'p99': self.percentile(samples, 0.99)
+            }
+        }
+
+
+class Metrics(object):
+    """Per-endpoint request metrics."""
+
+    def __init__(self):
+        """Metrics object init."""
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def get(self, endpoint):
+        """Get counters of the endpoint, caller has to hold the lock.
+
+        :param endpoint: Endpoint name.
+        :type endpoint: str
+
+        :return metrics: Endpoint counters.
+        :rtype: EndpointMetrics
+        """
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = EndpointMetrics()
+        return metrics
+
+    def observe(self, endpoint, status, latency, size=0, retries=0):
+        """Record finished request.
+
+        :param endpoint: Endpoint name.
+        :type endpoint: str
+
+        :param status: Response status code or None on connection error.
+        :type status: int
+
+        :param latency: Request duration in seconds, including retries.
+        :type latency: float
+
+        :param size: Response body size in bytes.
+        :type size: int
+
+        :param retries: Number of retries made.
+        :type retries: int
+        """
+        failed = status is None or status >= 400
+        status = 'error' if status is None else str(status)
+        with self.lock:
+            metrics = self.get(endpoint)
+            metrics.count += 1
+            if failed:
+                metrics.errors += 1
+            metrics.retries += retries
+            metrics.bytes += size or 0
+            metrics.latency_sum += latency
+            metrics.buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+            metrics.samples.append(latency)
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def snapshot(self):
+        """Get copy of all counters.
+
+        :return snapshot: Counters keyed by endpoint name.
+        :rtype: dict
+        """
+        with self.lock:
+            return {endpoint: metrics.snapshot()
+                    for endpoint, metrics in self.endpoints.items()}
+
+    def reset(self):
+        """Drop all counters."""
+        with self.lock:
+            self.endpoints = {}
+
+    def to_prometheus(self, prefix='catdog', connections=None):
+        """Render metrics in Prometheus text exposition format.
+
+        :param prefix: Metric names prefix.
+        :type prefix: str
+
+        :param connections: Connection stats of the API session.
+        :type connections: dict
+
+        :return text: Metrics text.
+        :rtype: str
+        """
+        lines = []
+
+        def metric(name, kind, description):
+            lines.append('# HELP %s_%s %s' % (prefix, name, description))
+            lines.append('# TYPE %s_%s %s' % (prefix, name, kind))
+
+        with self.lock:
+            endpoints = sorted(self.endpoints.items())
+
+            metric('requests_total', 'counter', 'Requests by status code.')
+            for endpoint, metrics in endpoints:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(
+                        '%s_requests_total{endpoint="%s",status="%s"} %d'
+                        % (prefix, endpoint, status, count))
+
+            metric('retries_total', 'counter', 'Retried requests.')
+            for endpoint, metrics in endpoints:
+                lines.append('%s_retries_total{endpoint="%s"} %d' % (
+                    prefix, endpoint, metrics.retries))
+
+            metric('response_bytes_total', 'counter', 'Response body bytes.')
+            for endpoint, metrics in endpoints:
+                lines.append('%s_response_bytes_total{endpoint="%s"} %d' % (
+                    prefix, endpoint, metrics.bytes))
+
+            metric('request_duration_seconds', 'histogram',
+                   'Request latency including retries.')
+            for endpoint, metrics in endpoints:
+                cumulative = 0
+                bounds = [str(bound) for bound in LATENCY_BUCKETS] + ['+Inf']
+                for bound, count in zip(bounds, metrics.buckets):
+                    cumulative += count
+                    lines.append(
+                        '%s_request_duration_seconds_bucket'
+                        '{endpoint="%s",le="%s"} %d'
+                        % (prefix, endpoint, bound, cumulative))
+                lines.append(
+                    '%s_request_duration_seconds_sum{endpoint="%s"} %f'
+                    % (prefix, endpoint, metrics.latency_sum))
+                lines.append(
+                    '%s_request_duration_seconds_count{endpoint="%s"} %d'
+                    % (prefix, endpoint, metrics.count))
+
+        if connections is not None:
+            metric('connections_opened_total', 'counter',
+                   'Opened HTTP connections.')
+            lines.append('%s_connections_opened_total %d' % (
+                prefix, connections['connections']))
+            metric('connection_requests_total', 'counter',
+                   'Requests sent over pooled connections.')
+            lines.append('%s_connection_requests_total %d' % (
+                prefix, connections['requests']))
+        return '\n'.join(lines) + '\n'
+
+
+def start_metrics_server(api, port=9100, addr='127.0.0.1'):
+    """Serve metrics of the API in Prometheus format in background thread.
+
+    :param api: API object.
+    :type api: api.API
+
+    :param port: Port to listen on.
+    :type port: int
+
+    :param addr: Address to listen on.
+    :type addr: str
+
+    :return server: Running server, call shutdown() to stop it.
+    :rtype: http.server.ThreadingHTTPServer
+    """
+    # http.server is only needed by exporting processes
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """Handler that serves metrics on every path."""
+
+        def do_GET(self):
+            """."""
+            body = api.prometheus_metrics().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type',
+                             'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            """."""
+            pass
+
+    server = ThreadingHTTPServer((addr, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -1,89 +1,193 @@
 """Models module."""
 
 
-class Dog(object):
-    """Dog class."""
+class Model(object):
+    """Base model class.
+
+    Known fields are stored in __slots__, so instances don't carry
+    a per-instance __dict__. Keys that are not declared as fields
+    are kept in the extras mapping. Missing attributes are None.
+    """
+
+    __slots__ = ('extras',)
+
+    fields = ()
+    field_set = frozenset()
+
+    # model classes of fields that hold lists of nested models
+    nested = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """Precompute set of declared fields of the model class."""
+        super().__init_subclass__(**kwargs)
+        cls.fields = tuple(
+            name for klass in reversed(cls.__mro__)
+            for name in getattr(klass, '__slots__', ()) if name != 'extras'
+        )
+        cls.field_set = frozenset(cls.fields)
 
     def __init__(self, **kwargs):
-        """Dog object init.
+        """Model object init.
 
         :param **kwargs: Arbitraty keyword arguments.
         :type **kwargs: dict
         """
-        self.__dict__.update(kwargs)
+        self.load(kwargs)
 
-    def __getattr__(self, key):
-        """."""
-        return None
+    @classmethod
+    def from_dict(cls, data):
+        """Create model from decoded JSON object.
 
-    def __repr__(self):
-        """Represents dog in human-readable way."""
-        return '<%s id=%s keys=%s>' % (self.__class__.__name__,
-                                       self.id,
-                                       str(self.__dict__.keys()))
+        Unlike cls(**data) it doesn't copy data into keyword arguments.
 
+        :param data: Model data.
+        :type data: dict
 
-class Breed(object):
-    """Breed class."""
+        :return obj: Model object.
+        :rtype: Model
+        """
+        obj = cls.__new__(cls)
+        obj.load(data)
+        return obj
 
-    def __init__(self, **kwargs):
-        """Breed object init.
+    @classmethod
+    def from_plain(cls, data):
+        """Create model from the output of to_dict, rebuilding nested models.
 
-        :param **kwargs: Arbitraty keyword arguments.
-        :type **kwargs: dict
+        :param data: Model data.
+        :type data: dict
+
+        :return obj: Model object.
+        :rtype: Model
+        """
+        for name, model_class in cls.nested.items():
+            items = data.get(name)
+            if items:
+                data[name] = [model_class.from_plain(item) for item in items]
+        return cls.from_dict(data)
+
+    def load(self, data):
+        """Set fields and extras from data.
+
+        :param data: Model data.
+        :type data: dict
         """
-        self.__dict__.update(kwargs)
+        extras = None
+        field_set = self.field_set
+        for key, value in data.items():
+            if key in field_set:
+                setattr(self, key, value)
+            else:
+                if extras is None:
+                    extras = {}
+                extras[key] = value
+        self.extras = extras
 
     def __getattr__(self, key):
-        """."""
+        """Look up unset fields and unknown keys in extras."""
+        if key.startswith('__'):
+            raise AttributeError(key)
+        extras = object.__getattribute__(self, 'extras')
+        if extras:
+            return extras.get(key)
         return None
 
-    def __repr__(self):
-        """Represents breed obj in a human-readable way."""
-        return '<%s id=%i keys=%s>' % (self.__class__.__name__,
-                                       self.id,
-                                       str(self.__dict__.keys()))
-
+    def items(self):
+        """Get set fields and extra keys with their values.
 
-class Category(object):
-    """Category class."""
+        :return items: (name, value) pairs.
+        :rtype: list
+        """
+        items = []
+        for name in self.fields:
+            try:
+                items.append((name, object.__getattribute__(self, name)))
+            except AttributeError:
+                continue
+        if self.extras:
+            items.extend(self.extras.items())
+        return items
+
+    def keys(self):
+        """Get names of set fields and extra keys.
+
+        :return keys: Names.
+        :rtype: list
+        """
+        return [name for name, _ in self.items()]
 
-    def __init__(self, **kwargs):
-        """Category object init.
+    def to_dict(self):
+        """Convert model to a dict of plain python objects.
 
-        :param **kwargs: Arbitraty keyword arguments.
-        :type **kwargs: dict
+        :return data: Model data.
+        :rtype: dict
         """
-        self.__dict__.update(kwargs)
+        return {name: to_plain(value) for name, value in self.items()}
 
-    def __getattr__(self, key):
-        """."""
-        return None
+    def __getstate__(self):
+        """Get model state for pickling."""
+        return dict(self.items())
+
+    def __setstate__(self, state):
+        """Restore model state after unpickling."""
+        self.load(state)
 
     def __repr__(self):
-        """Represents category obj in a human-readable way."""
-        return '<%s id=%i keys=%s>' % (self.__class__.__name,
+        """Represents model in a human-readable way."""
+        return '<%s id=%s keys=%s>' % (self.__class__.__name__,
                                        self.id,
-                                       str(self.__dict__.keys()))
+                                       str(self.keys()))
+
+
+def to_plain(value):
+    """Convert models nested in value to dicts.
+
+    :param value: Field value.
+    :type value: any
+
+    :return value: Value without model objects.
+    :rtype: any
+    """
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [to_plain(item) for item in value]
+    return value
+
+
+class Breed(Model):
+    """Breed class."""
+
+    __slots__ = ('id', 'name', 'bred_for', 'breed_group', 'life_span',
+                 'temperament', 'origin', 'country_code', 'description',
+                 'history', 'weight', 'height', 'reference_image_id')
+
+
+class Category(Model):
+    """Category class."""
+
+    __slots__ = ('id', 'name')
 
 
-class Animal(object):
+class Animal(Model):
     """Animal class."""
 
-    def __init__(self, **kwargs):
-        """Animal object init.
+    __slots__ = ('id', 'name')
 
-        :param **kwargs: Arbitraty keyword arguments.
-        :type **kwargs: dict
-        """
-        self.__dict__.update(kwargs)
 
-    def __getattr__(self, key):
-        """."""
-        return None
+class Dog(Model):
+    """Dog class."""
 
-    def __repr__(self):
-        """Represents animal obj in a human-readable way."""
-        return '<%s id=%i keys=%s>' % (self.__class__.__name__,
-                                       self.id,
-                                       str(self.__dict__.keys()))
+    __slots__ = ('id', 'url', 'image_width', 'image_height',
+                 'breeds', 'animals', 'categories')
+
+    nested = {'breeds': Breed, 'animals': Animal, 'categories': Category}
+
+
+class Cat(Model):
+    """Cat class."""
+
+    __slots__ = ('id', 'url', 'image_width', 'image_height',
+                 'breeds', 'animals', 'categories')
+
+    nested = {'breeds': Breed, 'animals': Animal, 'categories': Category}
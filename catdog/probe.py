@@ -0,0 +1,168 @@
+"""Image probing module.
+
+Format and dimensions of an image are read from the first bytes of the
+file, so images can be triaged with a Range request instead of a full
+download.
+"""
+import struct
+from collections import namedtuple
+
+from .exceptions import ProbeError
+
+# number of bytes fetched by the first probe request
+PROBE_BYTES = 4096
+
+# JPEG frame header may follow big EXIF segments, but not forever
+MAX_PROBE_BYTES = 65536
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# JPEG start of frame markers, DHT, JPG and DAC share the range
+SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# JPEG markers without length field
+STANDALONE_MARKERS = frozenset(range(0xD0, 0xDA)) | {0x01}
+
+ImageInfo = namedtuple('ImageInfo', ['format', 'width', 'height'])
+
+
+class ProbeResult(namedtuple('ProbeResult', [
+        'obj', 'format', 'width', 'height', 'bytes', 'duration', 'error'])):
+    """Probed format and dimensions of the model image."""
+
+    __slots__ = ()
+
+    @property
+    def matches(self):
+        """Probed dimensions are equal to the ones reported by the API.
+
+        None if the image was not probed or the API did not report them.
+        """
+        expected = (getattr(self.obj, 'image_width', None),
+                    getattr(self.obj, 'image_height', None))
+        if self.error is not None or None in expected:
+            return None
+        return expected == (self.width, self.height)
+
+
+def parse_png(data):
+    """Parse dimensions from PNG IHDR chunk."""
+    if len(data) < 24:
+        return ImageInfo('png', None, None)
+    width, height = struct.unpack('>II', data[16:24])
+    return ImageInfo('png', width, height)
+
+
+def parse_gif(data):
+    """Parse dimensions from GIF logical screen descriptor."""
+    if len(data) < 10:
+        return ImageInfo('gif', None, None)
+    width, height = struct.unpack('<HH', data[6:10])
+    return ImageInfo('gif', width, height)
+
+
+def parse_jpeg(data):
+    """Parse dimensions from JPEG start of frame segment.
+
+    Segments before the frame header are skipped by their length.
+    """
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            raise ProbeError("Malformed JPEG segment at %d byte" % offset)
+        marker = data[offset + 1]
+        if marker == 0xFF:
+            # fill bytes may precede any marker
+            offset += 1
+            continue
+        if marker in STANDALONE_MARKERS:
+            offset += 2
+            continue
+        if marker in SOF_MARKERS:
+            if offset + 9 > len(data):
+                break
+            height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+            return ImageInfo('jpeg', width, height)
+        length, = struct.unpack('>H', data[offset + 2:offset + 4])
+        offset += 2 + length
+    return ImageInfo('jpeg', None, None)
+
+
+def parse_header(data):
+    """Detect image format and dimensions from the beginning of the file.
+
+    :param data: First bytes of the image.
+    :type data: bytes
+
+    :raises ProbeError if the format is unknown or the header is malformed
+
+    :return info: Format and dimensions, dimensions are None if the
+                  header is not complete yet.
+    :rtype: ImageInfo
+    """
+    if data.startswith(PNG_SIGNATURE):
+        return parse_png(data)
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return parse_gif(data)
+    if data.startswith(b'\xff\xd8'):
+        return parse_jpeg(data)
+    raise ProbeError("Unknown image format")
+
+
+def next_probe_size(url, data, size, max_bytes, complete):
+    """Decide how many bytes are needed to parse the image header.
+
+    :param url: Image url used in error messages.
+    :type url: str
+
+    :param data: Fetched bytes.
+    :type data: bytes
+
+    :param size: Number of requested bytes.
+    :type size: int
+
+    :param max_bytes: Max number of bytes to fetch.
+    :type max_bytes: int
+
+    :param complete: Whole file was fetched.
+    :type complete: bool
+
+    :raises ProbeError if the header is not found within max_bytes
+
+    :return: Image info and size of the next request, the latter is
+             None when the header is parsed.
+    :rtype: tuple
+    """
+    try:
+        info = parse_header(data)
+    except ProbeError as exc:
+        raise ProbeError("%s: %s" % (url, exc))
+    if info.width is not None:
+        return info, None
+    if complete or size >= max_bytes:
+        raise ProbeError("%s: %s header was not found in first %d bytes" % (
+            url, info.format, len(data)))
+    return info, min(size * 2, max_bytes)
+
+
+def make_probe_result(obj, probed, error, duration):
+    """Compose ProbeResult from API.probe outcome.
+
+    :param obj: Probed model.
+    :type obj: any
+
+    :param probed: Image info and number of fetched bytes.
+    :type probed: tuple
+
+    :param error: Raised exception.
+    :type error: Exception
+
+    :param duration: Duration of probe in seconds.
+    :type duration: float
+
+    :return result: Probe result.
+    :rtype: ProbeResult
+    """
+    info, size = probed or (ImageInfo(None, None, None), 0)
+    return ProbeResult(obj, info.format, info.width, info.height, size,
+                       duration, error)
@@ -0,0 +1,164 @@
+"""Retry module."""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+class RetryPolicy(object):
+    """Retry policy with jittered exponential backoff.
+
+    Only idempotent requests are retried. Retry-After header of
+    the response is honored when it is present.
+    """
+
+    def __init__(self, max_retries=3, backoff_factor=0.5, max_backoff=30,
+                 budget=60, statuses=(429, 500, 502, 503, 504),
+                 methods=('get', 'delete')):
+        """RetryPolicy object init.
+
+        :param max_retries: Max number of retries per request.
+        :type max_retries: int
+
+        :param backoff_factor: Base delay in seconds.
+        :type backoff_factor: float
+
+        :param max_backoff: Max delay between two attempts in seconds.
+        :type max_backoff: float
+
+        :param budget: Max total delay per request in seconds.
+        :type budget: float
+
+        :param statuses: Response status codes to retry.
+        :type statuses: tuple
+
+        :param methods: Request types that are safe to retry.
+        :type methods: tuple
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.statuses = statuses
+        self.methods = methods
+
+    def backoff(self, attempt):
+        """Get jittered delay before the next attempt.
+
+        :param attempt: Number of failed attempts.
+        :type attempt: int
+
+        :return delay: Delay in seconds.
+        :rtype: float
+        """
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+
+        # full jitter spreads retries of concurrent clients over time
+        return random.uniform(0, delay)
+
+    @staticmethod
+    def parse_retry_after(value):
+        """Parse Retry-After header value.
+
+        :param value: Delay in seconds or HTTP date.
+        :type value: str
+
+        :return delay: Delay in seconds or None if value is invalid.
+        :rtype: float
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+    def next_delay(self, req_type, attempt, waited, status_code=None,
+                   retry_after=None):
+        """Decide whether failed request should be retried.
+
+        :param req_type: Request type.
+        :type req_type: str
+
+        :param attempt: Number of failed attempts.
+        :type attempt: int
+
+        :param waited: Total delay spent on previous retries.
+        :type waited: float
+
+        :param status_code: Response status code, None on connection error.
+        :type status_code: int
+
+        :param retry_after: Retry-After header value.
+        :type retry_after: str
+
+        :return delay: Delay before the next attempt or None
+                       if request should not be retried.
+        :rtype: float
+        """
+        if req_type not in self.methods or attempt >= self.max_retries:
+            return None
+        if status_code is not None and status_code not in self.statuses:
+            return None
+
+        delay = self.parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.backoff(attempt)
+        if waited + delay > self.budget:
+            return None
+        return delay
+
+
+class TokenBucket(object):
+    """Token bucket rate limiter.
+
+    Paces requests to the given rate, while allowing short bursts
+    up to the bucket capacity.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """TokenBucket object init.
+
+        :param rate: Number of requests per second.
+        :type rate: float
+
+        :param capacity: Max burst size.
+        :type capacity: float
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token from the bucket.
+
+        If the bucket is empty the token is borrowed from the future,
+        and caller has to wait before using it.
+
+        :return delay: Time to wait in seconds.
+        :rtype: float
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """Block until a token is available."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
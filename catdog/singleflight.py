@@ -0,0 +1,63 @@
+"""Request coalescing module.
+
+Concurrent calls with the same key share a single execution:
+the first caller runs the function and the rest wait for its result.
+"""
+import threading
+
+
+class Call(object):
+    """In-flight call shared by the waiters."""
+
+    def __init__(self):
+        """Call object init."""
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Coalesces identical concurrent calls made from threads."""
+
+    def __init__(self):
+        """SingleFlight object init."""
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.coalesced = 0
+
+    def do(self, key, func):
+        """Run func unless a call with the same key is in flight.
+
+        :param key: Call key.
+        :type key: hashable
+
+        :param func: Function to call.
+        :type func: callable
+
+        :return result: Result of the shared call.
+        :rtype: any
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except Exception as exc:
+            call.error = exc
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.event.set()
+        return call.result
@@ -0,0 +1,145 @@
+"""JSON Lines sink module."""
+import gzip
+import threading
+
+from .decoders import get_dumps, get_loads
+
+
+def open_lines(file_loc, mode):
+    """Open JSON Lines file, gzip compressed if its name ends with .gz.
+
+    :param file_loc: File location.
+    :type file_loc: str
+
+    :param mode: Binary file mode.
+    :type mode: str
+
+    :return file: File object.
+    :rtype: file
+    """
+    if file_loc.endswith('.gz'):
+        return gzip.open(file_loc, mode)
+    return open(file_loc, mode)
+
+
+class JsonLinesSink(object):
+    """Buffered writer of models to a JSON Lines file.
+
+    The file is kept open and encoded records are written in batches,
+    so dumping many models costs a few large writes instead of a
+    syscall per record. Files which names end with .gz are compressed.
+    """
+
+    def __init__(self, file_loc, batch_size=1000, dumps=None):
+        """JsonLinesSink object init.
+
+        :param file_loc: File location, records are appended to it.
+        :type file_loc: str
+
+        :param batch_size: Number of buffered records that triggers
+                           a write.
+        :type batch_size: int
+
+        :param dumps: Function that encodes python object to bytes.
+        :type dumps: callable
+        """
+        self.file_loc = file_loc
+        self.batch_size = batch_size
+        self.dumps = dumps or get_dumps()
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.compressed = file_loc.endswith('.gz')
+
+        # opened on the first write
+        self.file = None
+
+    def write(self, obj):
+        """Buffer the model record.
+
+        :param obj: Model.
+        :type obj: models.Model
+
+        :return size: Size of encoded record in bytes.
+        :rtype: int
+        """
+        line = self.dumps(obj.to_dict()) + b'\n'
+        with self.lock:
+            self.buffer.append(line)
+            if len(self.buffer) >= self.batch_size:
+                self.write_buffer()
+        return len(line)
+
+    def write_buffer(self):
+        """Write buffered records, the lock has to be held."""
+        if self.file is None:
+            self.file = open_lines(self.file_loc, 'ab')
+        self.file.write(b''.join(self.buffer))
+        self.buffer = []
+
+    def sync(self):
+        """Write buffered records and push them to the file.
+
+        Unlike flush, a gzip stream is not finished, so records written
+        later go to the same gzip member. The stream becomes readable to
+        its end once the sink is flushed or closed.
+        """
+        with self.lock:
+            if self.buffer:
+                self.write_buffer()
+            if self.file is not None:
+                # gzip files are flushed with Z_SYNC_FLUSH
+                self.file.flush()
+
+    def flush(self):
+        """Write buffered records, so the file can be read back."""
+        with self.lock:
+            if self.buffer:
+                self.write_buffer()
+            if self.file is None:
+                return
+            if self.compressed:
+                # gzip stream is readable only when it is finished,
+                # records written later go to the next gzip member
+                self.file.close()
+                self.file = None
+            else:
+                self.file.flush()
+
+    def close(self):
+        """Write buffered records and close the file."""
+        with self.lock:
+            if self.buffer:
+                self.write_buffer()
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def __enter__(self):
+        """."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """."""
+        self.close()
+
+
+def iter_models(file_loc, model_class, loads=None):
+    """Lazily read models from JSON Lines file.
+
+    :param file_loc: File location.
+    :type file_loc: str
+
+    :param model_class: Class of stored models.
+    :type model_class: type
+
+    :param loads: Function that decodes bytes to python object.
+    :type loads: callable
+
+    :return models: Generator of models.
+    :rtype: generator
+    """
+    loads = loads or get_loads()
+    with open_lines(file_loc, 'rb') as in_file:
+        for line in in_file:
+            if line.strip():
+                yield model_class.from_plain(loads(line))
@@ -0,0 +1,330 @@
+"""Storage module."""
+import hashlib
+import os
+import tempfile
+import threading
+from functools import partial
+
+from .exceptions import DownloadError
+
+
+def content_length(headers):
+    """Get expected body size from response headers.
+
+    :param headers: Response headers.
+    :type headers: dict
+
+    :return size: Body size or None if it can't be known in advance.
+    :rtype: int
+    """
+    # decoded body size differs from the size of encoded one
+    if headers.get('Content-Encoding', 'identity') != 'identity':
+        return None
+    try:
+        return int(headers['Content-Length'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def file_sha256(file_loc, chunk_size=1024 * 1024):
+    """Compute SHA-256 checksum of the file.
+
+    :param file_loc: File location.
+    :type file_loc: str
+
+    :param chunk_size: Size of chunks read from the file.
+    :type chunk_size: int
+
+    :return checksum: Hex digest.
+    :rtype: str
+    """
+    hasher = hashlib.sha256()
+    with open(file_loc, 'rb') as in_file:
+        for chunk in iter(lambda: in_file.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def name_digest(data):
+    """Hash file name into hex digits of its shard directories.
+
+    md5 is only used for an even spread, not for security, so it is
+    flagged as such for Pythons built in FIPS mode.
+
+    :param data: Encoded file name.
+    :type data: bytes
+
+    :return digest: Hex digest.
+    :rtype: str
+    """
+    try:
+        return hashlib.md5(data, usedforsecurity=False).hexdigest()
+    except TypeError:
+        # usedforsecurity was added in Python 3.9
+        return hashlib.md5(data).hexdigest()
+
+
+class FlatLayout(object):
+    """Layout that stores all files right in the output directory."""
+
+    def path(self, out_dir, name):
+        """Compose file location.
+
+        :param out_dir: Output directory.
+        :type out_dir: str
+
+        :param name: File name.
+        :type name: str
+
+        :return out_file_loc: File location.
+        :rtype: str
+        """
+        return os.path.join(out_dir, name)
+
+
+class ShardedLayout(FlatLayout):
+    """Layout that spreads files over nested subdirectories.
+
+    Subdirectories are named after the leading hex digits of the file
+    name hash, e.g. out_dir/3f/a2/name with default settings, so no
+    directory holds more than a small share of the files.
+    """
+
+    def __init__(self, depth=2, width=2):
+        """ShardedLayout object init.
+
+        :param depth: Number of nested subdirectories.
+        :type depth: int
+
+        :param width: Number of hex digits in subdirectory name.
+        :type width: int
+        """
+        self.depth = depth
+        self.width = width
+
+        # directories known to exist, saves a syscall per file
+        self.created = set()
+        self.lock = threading.Lock()
+
+    def path(self, out_dir, name):
+        """Compose file location, creating its subdirectories.
+
+        :param out_dir: Output directory.
+        :type out_dir: str
+
+        :param name: File name.
+        :type name: str
+
+        :return out_file_loc: File location.
+        :rtype: str
+        """
+        digest = name_digest(name.encode('utf-8'))
+        shards = [digest[i * self.width:(i + 1) * self.width]
+                  for i in range(self.depth)]
+        shard_dir = os.path.join(out_dir, *shards)
+        if shard_dir not in self.created:
+            os.makedirs(shard_dir, exist_ok=True)
+            with self.lock:
+                self.created.add(shard_dir)
+        return os.path.join(shard_dir, name)
+
+
+class SyncBatch(object):
+    """Batch of complete files waiting to be made durable.
+
+    Files are flushed to disk with fsync and only then renamed to their
+    destinations, so a crash never exposes a truncated file. Doing it
+    for a batch of files at once lets the disk coalesce the writes and
+    syncs every touched directory only once.
+    """
+
+    def __init__(self, batch_size=64):
+        """SyncBatch object init.
+
+        :param batch_size: Number of files that triggers a flush.
+        :type batch_size: int
+        """
+        self.batch_size = batch_size
+        self.pending = []
+        self.lock = threading.Lock()
+
+    def add(self, tmp_file_loc, out_file_loc, on_commit=None):
+        """Schedule rename of the complete temporary file.
+
+        :param tmp_file_loc: Temporary file location.
+        :type tmp_file_loc: str
+
+        :param out_file_loc: Destination file location.
+        :type out_file_loc: str
+
+        :param on_commit: Called once the file is durable at its
+                          destination.
+        :type on_commit: callable
+        """
+        with self.lock:
+            self.pending.append((tmp_file_loc, out_file_loc, on_commit))
+            if len(self.pending) < self.batch_size:
+                return
+            pending, self.pending = self.pending, []
+        self.sync(pending)
+
+    def flush(self):
+        """Make all pending files durable."""
+        with self.lock:
+            pending, self.pending = self.pending, []
+        self.sync(pending)
+
+    @staticmethod
+    def sync(pending):
+        """Fsync and rename files, then fsync their directories.
+
+        :param pending: Temporary and destination file locations with
+                        their commit callbacks.
+        :type pending: list
+        """
+        for tmp_file_loc, _, _ in pending:
+            fd = os.open(tmp_file_loc, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        dirs = set()
+        for tmp_file_loc, out_file_loc, _ in pending:
+            os.replace(tmp_file_loc, out_file_loc)
+            dirs.add(os.path.dirname(out_file_loc) or '.')
+
+        # persist the renames themselves
+        for dir_loc in dirs:
+            fd = os.open(dir_loc, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        for _, _, on_commit in pending:
+            if on_commit is not None:
+                on_commit()
+
+
+class AtomicWriter(object):
+    """File writer that exposes the file only when it is complete.
+
+    Data is written to a temporary file in the destination directory,
+    which is renamed to the destination on success and removed on failure.
+    """
+
+    def __init__(self, out_file_loc, max_bytes=None, expected_size=None,
+                 checksum=False, sync_batch=None, on_commit=None):
+        """AtomicWriter object init.
+
+        :param out_file_loc: Destination file location.
+        :type out_file_loc: str
+
+        :param max_bytes: Max allowed file size.
+        :type max_bytes: int
+
+        :param expected_size: Expected file size.
+        :type expected_size: int
+
+        :param checksum: Compute SHA-256 checksum of written data.
+        :type checksum: bool
+
+        :param sync_batch: Batch that makes the file durable, the file
+                           is renamed right away without fsync if omitted.
+        :type sync_batch: SyncBatch
+
+        :param on_commit: Called with the writer once the file is at its
+                          destination, which is after the batch flush
+                          with sync_batch.
+        :type on_commit: callable
+
+        :raises DownloadError: if expected_size exceeds max_bytes.
+        """
+        if max_bytes is not None and expected_size is not None \
+                and expected_size > max_bytes:
+            raise DownloadError(
+                "%s is %d bytes, limit is %d bytes." % (
+                    out_file_loc, expected_size, max_bytes))
+
+        self.out_file_loc = out_file_loc
+        self.max_bytes = max_bytes
+        self.expected_size = expected_size
+        self.size = 0
+        self.hasher = hashlib.sha256() if checksum else None
+        self.sync_batch = sync_batch
+        self.on_commit = on_commit
+
+        out_dir, name = os.path.split(out_file_loc)
+        fd, self.tmp_file_loc = tempfile.mkstemp(
+            dir=out_dir or '.', prefix='.%s.' % name, suffix='.part')
+        self.file = os.fdopen(fd, 'wb')
+
+    def write(self, chunk):
+        """Write chunk of data.
+
+        :param chunk: Data to write.
+        :type chunk: bytes
+
+        :raises DownloadError: if file size exceeds max_bytes.
+        """
+        self.size += len(chunk)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise DownloadError(
+                "%s exceeds %d bytes limit." % (
+                    self.out_file_loc, self.max_bytes))
+        self.file.write(chunk)
+        if self.hasher is not None:
+            self.hasher.update(chunk)
+
+    @property
+    def sha256(self):
+        """Hex digest of written data or None if it is not computed."""
+        if self.hasher is None:
+            return None
+        return self.hasher.hexdigest()
+
+    def commit(self):
+        """Move complete file to its destination.
+
+        :raises DownloadError: if file size doesn't match expected_size.
+        """
+        self.file.close()
+        if self.expected_size is not None \
+                and self.size != self.expected_size:
+            raise DownloadError(
+                "%s is %d bytes, but %d bytes were expected." % (
+                    self.out_file_loc, self.size, self.expected_size))
+        on_commit = None
+        if self.on_commit is not None:
+            on_commit = partial(self.on_commit, self)
+        if self.sync_batch is not None:
+            self.sync_batch.add(self.tmp_file_loc, self.out_file_loc,
+                                on_commit)
+            return
+        os.replace(self.tmp_file_loc, self.out_file_loc)
+        if on_commit is not None:
+            on_commit()
+
+    def abort(self):
+        """Remove incomplete file."""
+        self.file.close()
+        try:
+            os.remove(self.tmp_file_loc)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        """."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Commit file on success, remove it on failure."""
+        if exc_type is None:
+            try:
+                self.commit()
+            except Exception:
+                self.abort()
+                raise
+        else:
+            self.abort()
@@ -0,0 +1,243 @@
+"""Transport module.
+
+Transports send composed requests and return responses, which lets
+the clients run over a pooled session, record the exchanges to a
+cassette file or replay them in-process without sockets.
+"""
+import base64
+import json
+import threading
+import time
+
+from requests.structures import CaseInsensitiveDict
+
+from .exceptions import CassetteMissError
+
+
+class RawResponse(object):
+    """Response which body is already read into memory."""
+
+    def __init__(self, status_code, headers, content, url=None):
+        """RawResponse object init.
+
+        :param status_code: Response status code.
+        :type status_code: int
+
+        :param headers: Response headers.
+        :type headers: dict
+
+        :param content: Response body.
+        :type content: bytes
+
+        :param url: Link to remote resource.
+        :type url: str
+        """
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.url = url
+
+    def json(self):
+        """Convert response body to python object."""
+        return json.loads(self.content.decode('utf-8'))
+
+    def iter_content(self, chunk_size=1):
+        """Iterate over response body in chunks.
+
+        :param chunk_size: Chunk size in bytes.
+        :type chunk_size: int
+        """
+        for offset in range(0, len(self.content), chunk_size):
+            yield self.content[offset:offset + chunk_size]
+
+    def close(self):
+        """."""
+        pass
+
+
+def interaction_key(req_type, url, params=None):
+    """Compose key that matches recorded request to the replayed one.
+
+    :param req_type: Request type.
+    :type req_type: str
+
+    :param url: Link to remote resource.
+    :type url: str
+
+    :param params: Query params to a request.
+    :type params: dict
+
+    :return key: Interaction key.
+    :rtype: str
+    """
+    query = '&'.join('%s=%s' % (key, value) for key, value in
+                     sorted((params or {}).items()) if value is not None)
+    return '%s %s?%s' % (req_type.upper(), url, query)
+
+
+class Transport(object):
+    """Transport interface."""
+
+    def attach(self, session):
+        """Give the transport session configured by the client.
+
+        :param session: Session with auth and default headers.
+        :type session: requests.Session
+        """
+        pass
+
+    def send(self, req_type, url, headers=None, params=None, data=None,
+             files=None, stream=False):
+        """Send request.
+
+        Takes the same arguments as API.make_request.
+
+        :returns Response from the remote server.
+        :rtype request.Response object
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release transport resources."""
+        pass
+
+
+class RequestsTransport(Transport):
+    """Transport that sends requests over a pooled requests session."""
+
+    def __init__(self, session=None):
+        """RequestsTransport object init.
+
+        :param session: Session to send requests with, the one
+                        configured by the client by default.
+        :type session: requests.Session
+        """
+        self.session = session
+
+    def attach(self, session):
+        """."""
+        if self.session is None:
+            self.session = session
+
+    def send(self, req_type, url, headers=None, params=None, data=None,
+             files=None, stream=False):
+        """."""
+        # auth and default headers are already set on the session
+        return self.session.request(
+            req_type, url, headers=headers, params=params,
+            data=data, files=files, stream=stream)
+
+    def close(self):
+        """."""
+        if self.session is not None:
+            self.session.close()
+
+
+class RecordingTransport(Transport):
+    """Transport that records real exchanges to a cassette file.
+
+    Response bodies are read into memory, so streamed responses are
+    recorded whole. The cassette is written when the transport is closed.
+    """
+
+    def __init__(self, cassette, transport=None):
+        """RecordingTransport object init.
+
+        :param cassette: Cassette file location.
+        :type cassette: str
+
+        :param transport: Transport which exchanges are recorded.
+        :type transport: Transport
+        """
+        self.cassette = cassette
+        self.transport = transport or RequestsTransport()
+        self.interactions = []
+        self.lock = threading.Lock()
+
+    def attach(self, session):
+        """."""
+        self.transport.attach(session)
+
+    def send(self, req_type, url, headers=None, params=None, data=None,
+             files=None, stream=False):
+        """."""
+        start = time.monotonic()
+        resp = self.transport.send(req_type, url, headers, params, data,
+                                   files, stream)
+        try:
+            content = resp.content
+        finally:
+            resp.close()
+        elapsed = time.monotonic() - start
+
+        with self.lock:
+            self.interactions.append({
+                'key': interaction_key(req_type, url, params),
+                'status': resp.status_code,
+                'headers': dict(resp.headers),
+                'body': base64.b64encode(content).decode('ascii'),
+                'elapsed': elapsed
+            })
+        return RawResponse(resp.status_code, resp.headers, content, url)
+
+    def save(self):
+        """Write recorded interactions to the cassette file."""
+        with self.lock:
+            with open(self.cassette, 'w') as cassette:
+                json.dump({'interactions': self.interactions}, cassette)
+
+    def close(self):
+        """."""
+        self.save()
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """Transport that serves recorded exchanges in-process.
+
+    Interactions recorded for the same request are served in the
+    recorded order and start over when they are exhausted.
+    """
+
+    def __init__(self, cassette, replay_latency=False):
+        """ReplayTransport object init.
+
+        :param cassette: Cassette file location.
+        :type cassette: str
+
+        :param replay_latency: Delay every response by its recorded
+                               duration.
+        :type replay_latency: bool
+        """
+        self.replay_latency = replay_latency
+        self.interactions = {}
+        self.served = {}
+        self.lock = threading.Lock()
+
+        with open(cassette) as cassette_file:
+            recorded = json.load(cassette_file)['interactions']
+        for interaction in recorded:
+            # bodies are decoded once, not for every replayed response
+            self.interactions.setdefault(interaction['key'], []).append((
+                interaction['status'], interaction['headers'],
+                base64.b64decode(interaction['body']),
+                interaction['elapsed']
+            ))
+
+    def send(self, req_type, url, headers=None, params=None, data=None,
+             files=None, stream=False):
+        """."""
+        key = interaction_key(req_type, url, params)
+        try:
+            recorded = self.interactions[key]
+        except KeyError:
+            raise CassetteMissError("%s was not recorded." % key)
+
+        with self.lock:
+            index = self.served.get(key, 0)
+            self.served[key] = index + 1
+        status, headers, content, elapsed = recorded[index % len(recorded)]
+
+        if self.replay_latency:
+            time.sleep(elapsed)
+        return RawResponse(status, headers, content, url)
@@ -0,0 +1,98 @@
+"""Upload module."""
+import os
+import uuid
+from collections import namedtuple
+
+# size of chunks read from uploaded files
+CHUNK_SIZE = 64 * 1024
+
+# extensions of files picked from a directory for upload
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif')
+
+UploadResult = namedtuple('UploadResult',
+                          ['path', 'bytes', 'duration', 'response', 'error'])
+
+
+def list_images(directory):
+    """List image files of the directory.
+
+    :param directory: Directory to scan.
+    :type directory: str
+
+    :return filepaths: Sorted image file paths.
+    :rtype: list
+    """
+    return sorted(
+        entry.path for entry in os.scandir(directory)
+        if entry.is_file(follow_symlinks=False)
+        and entry.name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+class MultipartStream(object):
+    """multipart/form-data request body that streams the file.
+
+    The file is opened only while the body is being sent and it is
+    read in chunks, so the whole file is never held in memory.
+    Body length is known in advance, so the request is sent with
+    Content-Length instead of chunked encoding.
+    """
+
+    def __init__(self, filepath, fields=None, file_field='file',
+                 chunk_size=CHUNK_SIZE):
+        """MultipartStream object init.
+
+        :param filepath: Path to the file.
+        :type filepath: str
+
+        :param fields: Extra form fields.
+        :type fields: dict
+
+        :param file_field: Name of the file form field.
+        :type file_field: str
+
+        :param chunk_size: Size of chunks read from the file.
+        :type chunk_size: int
+        """
+        self.filepath = filepath
+        self.chunk_size = chunk_size
+        self.boundary = uuid.uuid4().hex
+
+        parts = []
+        for name, value in (fields or {}).items():
+            parts.append(
+                '--%s\r\nContent-Disposition: form-data; name="%s"\r\n\r\n'
+                '%s\r\n' % (self.boundary, name, value)
+            )
+        parts.append(
+            '--%s\r\nContent-Disposition: form-data; name="%s"; '
+            'filename="%s"\r\nContent-Type: application/octet-stream\r\n\r\n'
+            % (self.boundary, file_field, os.path.basename(filepath))
+        )
+        self.head = ''.join(parts).encode('utf-8')
+        self.tail = ('\r\n--%s--\r\n' % self.boundary).encode('utf-8')
+        self.file_size = os.path.getsize(filepath)
+
+    @property
+    def content_type(self):
+        """Content-Type header value with the boundary."""
+        return 'multipart/form-data; boundary=%s' % self.boundary
+
+    def __len__(self):
+        """Get body length in bytes."""
+        return len(self.head) + self.file_size + len(self.tail)
+
+    def __iter__(self):
+        """Iterate over body chunks."""
+        yield self.head
+        with open(self.filepath, 'rb') as in_file:
+            chunk = in_file.read(self.chunk_size)
+            while chunk:
+                yield chunk
+                chunk = in_file.read(self.chunk_size)
+        yield self.tail
+
+    async def __aiter__(self):
+        """Iterate over body chunks in async client."""
+        for chunk in self:
+            yield chunk
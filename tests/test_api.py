@@ -0,0 +1,718 @@
+"""
+API base class tests (run against a local HTTP server).
+"""
+import asyncio
+import json
+import re
+import struct
+import threading
+import time
+from os import path
+from urllib.parse import parse_qs, urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from catdog import AsyncDogApi, Dog, DogApi
+from catdog.cache import DiskCache, ResponseCache
+from catdog.cli import convert_breed_ids, main, make_parser
+from catdog.crawler import crawl
+from catdog.exceptions import (APIConnectionError, CassetteMissError,
+                               DownloadError, InvalidImageFile,
+                               ProbeError)
+from catdog.manifest import Manifest
+from catdog.retry import RetryPolicy
+from catdog.sink import iter_models
+from catdog.storage import ShardedLayout, SyncBatch
+from catdog.transport import RecordingTransport, ReplayTransport
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Minimal handler that echoes request info as JSON."""
+
+    protocol_version = 'HTTP/1.1'
+
+    # number of sent 304 Not Modified responses
+    not_modified = 0
+
+    # number of requests to fail with 429 status code
+    throttled = 0
+
+    # (method, path) of received API requests
+    requests = []
+
+    def do_GET(self):
+        """."""
+        if not self.path.startswith('/img/'):
+            StubHandler.requests.append((self.command, self.path))
+        if self.path.startswith('/img/'):
+            self.send_image()
+            return
+        if StubHandler.throttled:
+            StubHandler.throttled -= 1
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path.startswith('/etag'):
+            self.send_etag()
+            return
+        if self.path.startswith(('/v1/images/?', '/v1/images/search')):
+            data = self.image_page()
+        elif self.path.endswith('/breeds'):
+            data = [{'id': 1, 'name': 'Breed 1'}]
+        elif self.path.startswith('/v1/images/'):
+            # slow images keep concurrent requests in flight together
+            if 'slow' in self.path:
+                time.sleep(0.2)
+            data = {'id': self.path.split('/')[-1], 'url': None,
+                    'width': 10, 'height': 20}
+        else:
+            data = {'path': self.path,
+                    'api_key': self.headers.get('x-api-key')}
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def image_page(self):
+        """Compose page of 3 images, pages after the third one are empty."""
+        query = parse_qs(urlparse(self.path).query)
+        page = int(query.get('page', ['0'])[0])
+        if page > 2:
+            return []
+        return [{'id': 'p%di%d' % (page, i), 'url': None,
+                 'width': 1, 'height': 1} for i in range(3)]
+
+    def do_POST(self):
+        """."""
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if not self.path.endswith('/images/upload'):
+            self.do_GET()
+            return
+        data = json.dumps({
+            'size': len(body),
+            'sub_id': b'name="sub_id"\r\n\r\nuser\r\n' in body,
+            'content_type': self.headers.get('Content-Type')
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_DELETE(self):
+        """."""
+        self.do_GET()
+
+    def send_image(self):
+        """Send fake image body or 404 for missing images."""
+        if 'missing' in self.path:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if 'probe' in self.path:
+            self.send_probe_image()
+            return
+        body = b'\x89PNG' + b'0' * 1000
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_probe_image(self):
+        """Send 640x480 JPEG with 6000 bytes of EXIF, Range is honored
+        unless the path contains 'norange'."""
+        body = (b'\xff\xd8\xff\xe1' + struct.pack('>H', 6002) +
+                b'\0' * 6000 + b'\xff\xc0' +
+                struct.pack('>HBHHB', 11, 8, 480, 640, 3) + b'\0' * 50000)
+        match = re.match(r'bytes=(\d+)-(\d+)', self.headers.get('Range', ''))
+        if match and 'norange' not in self.path:
+            first, last = int(match.group(1)), int(match.group(2))
+            body = body[first:last + 1]
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_etag(self):
+        """Send body with ETag validator or 304 if it matches."""
+        if self.headers.get('If-None-Match') == '"v1"':
+            StubHandler.not_modified += 1
+            self.send_response(304)
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+            return
+        body = b'{"version": 1}'
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """."""
+        pass
+
+
+@pytest.fixture
+def server():
+    """Local HTTP server that serves StubHandler."""
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:%d' % httpd.server_port
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_connection_reuse(server):
+    """Testing that requests are sent over pooled keep-alive connections.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    api = DogApi('test-key', pool_maxsize=2)
+    for _ in range(5):
+        resp = api.make_request('get', server + '/ping')
+        assert resp.json()['api_key'] == 'test-key'
+
+    stats = api.connection_stats()
+    assert stats['requests'] == 5
+    assert stats['connections'] == 1
+    assert stats['reused'] == 4
+    api.close()
+
+
+def test_async_get_image_by_id(server):
+    """Testing concurrent requests of the async client.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    pytest.importorskip('aiohttp')
+
+    async def fetch_all():
+        async with AsyncDogApi('test-key', max_concurrency=4,
+                               base_url=server) as api:
+            return await asyncio.gather(*[
+                api.get_image_by_id('img%d' % i) for i in range(20)
+            ])
+
+    dogs = asyncio.run(fetch_all())
+    assert [dog.id for dog in dogs] == ['img%d' % i for i in range(20)]
+    assert dogs[0].image_height == 20
+
+
+def test_async_reopen(server):
+    """Testing that the async client opens a new session after close.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    pytest.importorskip('aiohttp')
+
+    async def fetch_twice():
+        api = AsyncDogApi('test-key', base_url=server)
+        first = await api.get_image_by_id('img1')
+        await api.close()
+        second = await api.get_image_by_id('img2')
+        await api.close()
+        return first, second
+
+    assert [dog.id for dog in asyncio.run(fetch_twice())] == ['img1', 'img2']
+
+
+def test_async_connection_limits():
+    """Testing that max_concurrency is not capped by the per host limit."""
+    pytest.importorskip('aiohttp')
+
+    async def limit_per_host(**kwargs):
+        async with AsyncDogApi('test-key', **kwargs) as api:
+            return api.get_session().connector.limit_per_host
+
+    assert asyncio.run(limit_per_host(max_concurrency=100)) == 100
+    assert asyncio.run(limit_per_host(max_concurrency=100,
+                                      limit_per_host=5)) == 5
+
+
+def test_save_all_parallel(server, tmpdir):
+    """Testing that parallel save_all reports per-object results.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    api = DogApi('test-key')
+    names = ['dog%d.png' % i for i in range(10)] + ['missing.png']
+    dogs = [Dog(id=name, url='%s/img/%s' % (server, name)) for name in names]
+
+    results = api.save_all(dogs, out_dir=str(tmpdir) + '/', workers=4)
+    assert [result.obj for result in results] == dogs
+    assert results.bytes == 10 * 1004
+    assert results.failed == 1
+    assert all(result.bytes == 1004 for result in results[:-1])
+    assert tmpdir.join('dog3.png').size() == 1004
+    assert results[-1].path is None
+    assert results[-1].error is not None
+
+
+def test_save_manifest(server, tmpdir):
+    """Testing that saved images are skipped and corrupted ones detected.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    out_dir = str(tmpdir.mkdir('out')) + '/'
+    manifest = Manifest(str(tmpdir.join('manifest.db')))
+    api = DogApi('test-key', manifest=manifest)
+    dogs = [Dog(id='dog%d' % i, url='%s/img/dog%d.png' % (server, i))
+            for i in range(4)]
+
+    api.save_all(dogs, out_dir=out_dir)
+    report = api.save_all(dogs, out_dir=out_dir)
+    assert report.bytes == 4 * 1004
+    assert api.metrics_snapshot()['endpoints']['save']['count'] == 4
+
+    # manifest is persistent
+    manifest.close()
+    manifest = Manifest(str(tmpdir.join('manifest.db')))
+    assert manifest.get(dogs[1].url).path == out_dir + 'dog1.png'
+    assert manifest.verify() == []
+
+    with open(out_dir + 'dog1.png', 'r+b') as out_file:
+        out_file.write(b'corrupted')
+    invalid = manifest.verify(workers=2, remove=True)
+    assert [entry.id for entry in invalid] == ['dog1']
+
+    api = DogApi('test-key', manifest=manifest)
+    api.save_all(dogs, out_dir=out_dir)
+    assert api.metrics_snapshot()['endpoints']['save']['count'] == 1
+    assert manifest.verify() == []
+
+
+def test_save_sharded(server, tmpdir):
+    """Testing sharded layout with batched durable writes.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    sync_batch = SyncBatch(batch_size=4)
+    api = DogApi('test-key', layout=ShardedLayout(depth=2, width=1),
+                 sync_batch=sync_batch)
+    dogs = [Dog(id='dog%d' % i, url='%s/img/dog%d.png' % (server, i))
+            for i in range(6)]
+
+    # files become visible in complete batches
+    saved = [api.save(dog, out_dir=str(tmpdir)) for dog in dogs]
+    assert [path.exists(out_file_loc) for out_file_loc, _ in saved] == \
+        [True] * 4 + [False] * 2
+    api.close()
+
+    for out_file_loc, size in saved:
+        assert path.getsize(out_file_loc) == size == 1004
+        assert len(path.relpath(out_file_loc, str(tmpdir)).split('/')) == 3
+    assert not list(tmpdir.visit('*.part'))
+
+    report = api.save_all(dogs, out_dir=str(tmpdir), workers=3)
+    assert report.failed == 0
+    assert sync_batch.pending == []
+
+
+def test_save_manifest_sync_batch(server, tmpdir):
+    """Testing that images are recorded once their batch is committed.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    manifest = Manifest(str(tmpdir.join('manifest.db')))
+    api = DogApi('test-key', manifest=manifest,
+                 sync_batch=SyncBatch(batch_size=10))
+    dog = Dog(id='dog0', url='%s/img/dog0.png' % server)
+
+    out_file_loc, _ = api.save(dog, out_dir=str(tmpdir))
+    assert manifest.get(dog.url) is None
+
+    api.flush()
+    entry = manifest.lookup(dog.url, out_file_loc)
+    assert entry.size == path.getsize(out_file_loc) == 1004
+    assert api.save(dog, out_dir=str(tmpdir)) == (out_file_loc, 1004)
+    api.close()
+
+
+def test_save_max_bytes(server, tmpdir):
+    """Testing that oversized images are rejected without leftovers.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    api = DogApi('test-key')
+    dog = Dog(id='big', url='%s/img/big.png' % server)
+
+    result, = api.save_all([dog], out_dir=str(tmpdir) + '/', max_bytes=100)
+    assert isinstance(result.error, DownloadError)
+    assert tmpdir.listdir() == []
+
+    path, size = api.save(dog, out_dir=str(tmpdir) + '/', chunk_size=128)
+    assert size == 1004
+    assert [item.basename for item in tmpdir.listdir()] == ['big.png']
+
+
+def test_disk_cache_revalidation(server, tmpdir):
+    """Testing that not modified responses are served from disk.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    db_path = str(tmpdir.join('cache.db'))
+    api = DogApi('test-key', disk_cache=DiskCache(db_path))
+    resp = api.make_request('get', server + '/etag')
+    assert resp.json() == {'version': 1}
+    api.disk_cache.close()
+
+    # fresh client revalidates response stored by the previous one
+    not_modified = StubHandler.not_modified
+    api = DogApi('test-key', disk_cache=DiskCache(db_path))
+    resp = api.make_request('get', server + '/etag')
+    assert StubHandler.not_modified == not_modified + 1
+    assert resp.status_code == 200
+    assert resp.json() == {'version': 1}
+    assert resp.headers['etag'] == '"v1"'
+
+
+def test_retry_after(server):
+    """Testing that throttled idempotent requests are retried.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    api = DogApi('test-key', retry=RetryPolicy(max_retries=2))
+
+    StubHandler.throttled = 2
+    resp = api.make_request('get', server + '/ping')
+    assert resp.status_code == 200
+
+    StubHandler.throttled = 3
+    with pytest.raises(APIConnectionError):
+        api.make_request('get', server + '/ping')
+
+    # post requests are not idempotent
+    StubHandler.throttled = 1
+    with pytest.raises(APIConnectionError):
+        api.make_request('post', server + '/ping', data={'a': 1})
+    StubHandler.throttled = 0
+
+
+def test_iter_images(server):
+    """Testing that pages are iterated until an empty one.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    api = DogApi('test-key', base_url=server)
+
+    ids = [dog.id for dog in api.iter_images(limit=3)]
+    assert ids == ['p%di%d' % (page, i)
+                   for page in range(3) for i in range(3)]
+
+    ids = [dog.id for dog in api.iter_search(start_page=1, max_pages=1)]
+    assert ids == ['p1i0', 'p1i1', 'p1i2']
+
+
+def test_upload_images(server, tmpdir):
+    """Testing bulk upload of directory images.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    for i in range(3):
+        tmpdir.join('dog%d.jpg' % i).write_binary(b'0' * 1000 * (i + 1))
+    tmpdir.join('notes.txt').write('not an image')
+
+    api = DogApi('test-key', base_url=server)
+    report = api.upload_images(str(tmpdir), sub_id='user', workers=2)
+    assert [result.path for result in report] == [
+        str(tmpdir.join('dog%d.jpg' % i)) for i in range(3)]
+    assert report.bytes == 6000
+    assert report.failed == 0
+
+    data = report[0].response.json()
+    assert data['sub_id']
+    assert data['content_type'].startswith('multipart/form-data; boundary=')
+    assert 1000 < data['size'] < 1500
+
+    report = api.upload_images([str(tmpdir.join('missing.jpg'))])
+    assert isinstance(report[0].error, InvalidImageFile)
+
+
+def test_metrics(server):
+    """Testing per-endpoint metrics and connection reuse ratio.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    api = DogApi('test-key', retry=RetryPolicy(backoff_factor=0),
+                 base_url=server)
+
+    StubHandler.throttled = 1
+    for i in range(3):
+        api.get_image_by_id('img%d' % i)
+
+    snapshot = api.metrics_snapshot()
+    metrics = snapshot['endpoints']['get_image_by_id']
+    assert metrics['count'] == 3
+    assert metrics['retries'] == 1
+    assert metrics['statuses'] == {'200': 3}
+    assert metrics['latency']['p50'] <= metrics['latency']['p99']
+    assert snapshot['connections']['reuse_ratio'] == 0.75
+
+    text = api.prometheus_metrics()
+    assert 'catdog_requests_total{endpoint="get_image_by_id",status="200"} 3' \
+        in text
+    assert 'catdog_request_duration_seconds_count' \
+        '{endpoint="get_image_by_id"} 3' in text
+
+
+def test_record_replay(server, tmpdir):
+    """Testing that recorded exchanges are replayed without the server.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    cassette = str(tmpdir.join('cassette.json'))
+    with DogApi('test-key', base_url=server,
+                transport=RecordingTransport(cassette)) as api:
+        recorded = [api.get_image_by_id('img%d' % i) for i in range(3)]
+        recorded_size = api.save(recorded[0],
+                                 out_dir=str(tmpdir.mkdir('recorded')))[1]
+
+    api = DogApi('test-key', base_url=server,
+                 transport=ReplayTransport(cassette))
+    replayed = [api.get_image_by_id('img%d' % i) for i in range(3)]
+    assert [dog.to_dict() for dog in replayed] == \
+        [dog.to_dict() for dog in recorded]
+
+    out_file_loc, size = api.save(replayed[0],
+                                  out_dir=str(tmpdir.mkdir('replayed')))
+    assert size == recorded_size
+    with pytest.raises(CassetteMissError):
+        api.get_image_by_id('img3')
+
+
+def test_raw_response_import():
+    """Testing that RawResponse is still importable from catdog.api."""
+    from catdog import api, transport
+    assert api.RawResponse is transport.RawResponse
+
+
+def test_crawl(server, tmpdir):
+    """Testing that crawled shards are merged without duplicates.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    out_file = str(tmpdir.join('images.jsonl'))
+    report = crawl('test-key', out_file, processes=2, limit=3,
+                   base_url=server)
+    assert report.records == 9
+    assert report.duplicates == 0
+    assert sorted(result.records for result in report.shards) == [3, 6]
+    assert tmpdir.listdir() == [tmpdir.join('images.jsonl')]
+
+    # there are more workers than pages, so the last shard is empty
+    report = crawl('test-key', out_file, processes=4, limit=3,
+                   base_url=server)
+    assert report.records == 9
+    assert [result.records for result in report.shards] == [3, 3, 3, 0]
+    assert tmpdir.listdir() == [tmpdir.join('images.jsonl')]
+
+    # stub server ignores breed_id, so every breed finds the same images
+    report = crawl('test-key', out_file + '.gz', processes=4,
+                   breed_ids=[1, 2, 3], limit=3, max_pages=2, rate=100,
+                   keep_shards=True, base_url=server)
+    assert len(report.shards) == 3
+    assert report.records == 6
+    assert report.duplicates == 12
+    assert [dog.id for dog in iter_models(out_file + '.gz', Dog)] == \
+        ['p0i0', 'p0i1', 'p0i2', 'p1i0', 'p1i1', 'p1i2']
+
+
+def test_cli(server, tmpdir, capsys, monkeypatch):
+    """Testing search, mirror and bulk vote commands.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    argv = ['--api-key', 'test-key', '--base-url', server]
+    assert main(argv + ['-f', 'csv', 'search', '--limit', '3',
+                        '--count', '5']) == 0
+    out, err = capsys.readouterr()
+    assert out.splitlines()[0] == \
+        'id,url,image_width,image_height,breeds,animals,categories'
+    assert len(out.splitlines()) == 6
+    assert err.startswith('search: 5 items, 0 failed, %d bytes' % len(out))
+
+    csv_file = tmpdir.join('images.csv')
+    assert main(argv + ['-f', 'csv', '-o', str(csv_file), 'search',
+                        '--limit', '3', '--count', '5']) == 0
+    assert capsys.readouterr()[1].startswith(
+        'search: 5 items, 0 failed, %d bytes' % csv_file.size())
+    assert csv_file.read_binary() == out.encode()
+
+    out_dir = str(tmpdir.mkdir('mirror'))
+    assert main(argv + ['-c', '4', 'mirror', out_dir, '--limit', '3']) == 0
+    assert capsys.readouterr()[1].startswith('mirror: 9 items, 0 failed')
+    assert len(list(iter_models(path.join(out_dir, 'Dog.jsonl'), Dog))) == 9
+
+    ids_file = tmpdir.join('ids.txt')
+    ids_file.write('a\nb\n\nc\n')
+    out_file = str(tmpdir.join('votes.json'))
+    assert main(argv + ['-o', out_file, 'votes', 'x', '@%s' % ids_file,
+                        '--sub-id', 'user']) == 0
+    assert capsys.readouterr()[1].startswith('votes: 4 items, 0 failed')
+
+    monkeypatch.delenv('DOG_API_KEY', raising=False)
+    assert main(['breeds', 'export']) == 2
+
+
+def test_cli_breed_ids():
+    """Testing that breed ids are str for the Cat API and int for Dog."""
+    parser = make_parser()
+    args = parser.parse_args(['--api', 'cat', 'search', '--breed-id',
+                              'abys'])
+    convert_breed_ids(args)
+    assert args.breed_id == 'abys'
+
+    args = parser.parse_args(['crawl', 'out.jsonl', '--breed-ids', '1', '2'])
+    convert_breed_ids(args)
+    assert args.breed_ids == [1, 2]
+
+    with pytest.raises(SystemExit):
+        main(['search', '--breed-id', 'abys'])
+
+
+def test_probe_all(server):
+    """Testing that images are probed with a few Range requests.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    api = DogApi('test-key')
+    dogs = [Dog(id=name, url='%s/img/%s' % (server, name),
+                image_width=640, image_height=480)
+            for name in ('probe.jpg', 'probe-norange.jpg', 'dog.png')]
+
+    report = api.probe_all(dogs, workers=3)
+    assert [(result.format, result.width, result.height)
+            for result in report[:2]] == [('jpeg', 640, 480)] * 2
+    assert [result.matches for result in report] == [True, True, None]
+    assert isinstance(report[2].error, ProbeError)
+
+    # EXIF pushes the frame header out of the first 4096 bytes
+    assert report[0].bytes == 8192
+    assert report[1].bytes == 4096 + 8192
+    assert report.failed == 1
+
+    with pytest.raises(ProbeError):
+        api.probe(dogs[0], max_bytes=4096)
+    api.close()
+
+
+def test_async_probe_all(server):
+    """Testing that the async client probes images with Range requests.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    pytest.importorskip('aiohttp')
+    dogs = [Dog(id=name, url='%s/img/%s' % (server, name))
+            for name in ('probe.jpg', 'probe-norange.jpg')]
+
+    async def probe_all():
+        async with AsyncDogApi('test-key', base_url=server) as api:
+            return await api.probe_all(dogs)
+
+    report = asyncio.run(probe_all())
+    assert [(result.width, result.height) for result in report] == \
+        [(640, 480)] * 2
+    assert [result.bytes for result in report] == [8192, 4096 + 8192]
+
+
+def test_breed_methods_return_response(server):
+    """Testing that breed assignment methods return the raw response.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    with DogApi('test-key', base_url=server) as api:
+        resp = api.add_breed_to_image('abc', 1)
+        assert resp.status_code == 200
+        resp = api.delete_breed_from_image('abc', 1)
+        assert resp.status_code == 200
+
+
+def test_response_cache(server):
+    """Testing that cached endpoints are served from the response cache
+    and breed changes invalidate the image responses.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    StubHandler.requests = []
+    api = DogApi('test-key', base_url=server, cache=ResponseCache())
+
+    def fetch_all():
+        assert api.get_image_by_id('abc').id == 'abc'
+        assert api.get_breeds_by_image_id('abc')[0].name == 'Breed 1'
+        assert api.get_breed_list()[0].id == 1
+
+    def sent(method='GET'):
+        return sum(1 for command, _ in StubHandler.requests
+                   if command == method)
+
+    fetch_all()
+    fetch_all()
+    assert sent() == 3
+
+    api.add_breed_to_image('abc', 1)
+    fetch_all()
+    assert (sent(), sent('POST')) == (5, 1)
+
+    api.delete_breed_from_image('abc', 1)
+    fetch_all()
+    assert (sent(), sent('DELETE')) == (7, 1)
+
+    # search is not a cached endpoint
+    api.search()
+    api.search()
+    assert sent() == 9
+    api.close()
+
+
+def test_coalesce(server):
+    """Testing that concurrent identical requests share one call.
+
+    :param server: Local server url.
+    :type server: str
+    """
+    StubHandler.requests = []
+    api = DogApi('test-key', base_url=server, coalesce=True)
+    dogs = []
+    threads = [threading.Thread(
+        target=lambda: dogs.append(api.get_image_by_id('slow')))
+        for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [dog.id for dog in dogs] == ['slow'] * 10
+    assert StubHandler.requests == [('GET', '/v1/images/slow')]
+    assert api.single_flight.coalesced == 9
+    api.close()
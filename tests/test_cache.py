@@ -0,0 +1,53 @@
+"""
+Response cache tests.
+"""
+import time
+
+from catdog.cache import ResponseCache
+
+
+def test_ttl_expiration():
+    """Testing that entries expire after their endpoint TTL."""
+    cache = ResponseCache(default_ttl=60, ttls={'get_breed_list': 0.01})
+    breeds_key = cache.make_key('get_breed_list', '/breeds')
+    image_key = cache.make_key('get_image_by_id', '/images/1')
+    cache.set(breeds_key, 'breeds', 10)
+    cache.set(image_key, 'image', 10)
+
+    time.sleep(0.02)
+    assert cache.get(breeds_key) is None
+    assert cache.get(image_key) == 'image'
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_lru_eviction():
+    """Testing eviction by entries count and by size."""
+    cache = ResponseCache(max_entries=2, max_bytes=100)
+    keys = [cache.make_key('get_breed_by_id', '/breeds/%d' % i)
+            for i in range(3)]
+    cache.set(keys[0], 0, 10)
+    cache.set(keys[1], 1, 10)
+
+    # touch first entry so the second one becomes least recently used
+    cache.get(keys[0])
+    cache.set(keys[2], 2, 10)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == 0
+
+    cache.set(keys[1], 1, 90)
+    assert cache.stats()['bytes'] <= 100
+    assert cache.stats()['evictions'] == 2
+
+
+def test_invalidate():
+    """Testing invalidation by endpoint and url."""
+    cache = ResponseCache()
+    cache.set(cache.make_key('get_image_by_id', '/images/1'), 1, 1)
+    cache.set(cache.make_key('get_image_by_id', '/images/2'), 2, 1)
+    cache.set(cache.make_key('get_breed_list', '/breeds'), 3, 1)
+
+    assert cache.invalidate('get_image_by_id', '/images/1') == 1
+    assert cache.invalidate('get_image_by_id') == 1
+    assert cache.invalidate() == 1
+    assert cache.stats()['entries'] == 0
@@ -0,0 +1,64 @@
+"""
+Breed catalog tests.
+"""
+from catdog import Breed
+from catdog.catalog import BreedCatalog, parse_range
+
+BREEDS = [
+    Breed(id=1, name='Affenpinscher', breed_group='Toy',
+          life_span='10 - 12 years',
+          temperament='Stubborn, Curious, Playful, Adventurous',
+          weight={'imperial': '6 - 13', 'metric': '3 - 6'},
+          height={'imperial': '9 - 11.5', 'metric': '23 - 29'}),
+    Breed(id=2, name='Afghan Hound', breed_group='Hound',
+          life_span='10 - 13 years',
+          temperament='Aloof, Clownish, Dignified, Independent, Happy',
+          weight={'imperial': '50 - 60', 'metric': '23 - 27'},
+          height={'imperial': '25 - 27', 'metric': '64 - 69'}),
+    Breed(id=3, name='Akita', breed_group='Working',
+          life_span='10 - 14 years',
+          temperament='Docile, Alert, Responsive, Dignified, Courageous',
+          weight={'imperial': '65 - 115', 'metric': '29 - 52'},
+          height={'imperial': '24 - 28', 'metric': '61 - 71'}),
+    Breed(id=4, name='Unknown', life_span='Not available',
+          weight={'imperial': 'NaN', 'metric': 'NaN'})
+]
+
+
+def test_parse_range():
+    """Testing range strings parsing."""
+    assert parse_range('10 - 12 years') == (10, 12)
+    assert parse_range('9 - 11.5') == (9, 11.5)
+    assert parse_range('50') == (50, 50)
+    assert parse_range('NaN') is None
+    assert parse_range(None) is None
+
+
+def test_lookup():
+    """Testing lookups by id and name."""
+    catalog = BreedCatalog(BREEDS)
+    assert len(catalog) == 4
+    assert catalog.get(2).name == 'Afghan Hound'
+    assert catalog.get_by_name('akita').id == 3
+    assert catalog.get_by_name('poodle') is None
+
+
+def test_query():
+    """Testing multi-attribute queries."""
+    catalog = BreedCatalog(BREEDS)
+    ids = [breed.id for breed in catalog.query(temperament='dignified')]
+    assert ids == [2, 3]
+
+    ids = [breed.id for breed in catalog.query(
+        temperament=['Dignified', 'alert'])]
+    assert ids == [3]
+
+    ids = [breed.id for breed in catalog.query(weight=(20, 30))]
+    assert ids == [2, 3]
+
+    ids = [breed.id for breed in catalog.query(
+        weight=(None, 60), system='imperial', life_span=(13, None))]
+    assert ids == [2]
+
+    assert catalog.query(breed_group='toy', height=(30, None)) == []
+    assert len(catalog.query()) == 4
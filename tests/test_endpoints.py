@@ -0,0 +1,110 @@
+"""
+Endpoint registry tests.
+"""
+import inspect
+
+import pytest
+
+from catdog import AsyncCatApi, CatApi, DogApi
+from catdog.cache import ResponseCache
+from catdog.endpoints import Arg, Endpoint
+from catdog.exceptions import IlligalArgumentType
+
+
+class RecordingDogApi(DogApi):
+    """DogApi that returns dispatch arguments instead of sending them."""
+
+    def dispatch(self, req_type, url, callback=None, endpoint=None,
+                 invalidates=None, **kwargs):
+        """."""
+        return req_type, url, endpoint, kwargs, invalidates
+
+
+def test_generated_methods():
+    """Testing urls, params and payloads of generated methods."""
+    api = RecordingDogApi('test-key', base_url='http://local/')
+
+    assert api.search(mine_types=['jpg', 'png'], limit='x', order='ASC') \
+        == ('get', 'http://local/v1/images/search', 'search',
+            {'params': {'mime_types': 'jpg,png', 'limit': '1',
+                        'order': 'ASC'}}, None)
+
+    req_type, url, _, kwargs, invalidates = \
+        api.delete_breed_from_image('abc', 5)
+    assert (req_type, url) == ('delete',
+                               'http://local/v1/images/abc/breeds/5')
+    # without a response cache there is nothing to invalidate
+    assert invalidates is None
+    api.cache = ResponseCache()
+    assert api.delete_breed_from_image('abc', 5)[4] == \
+        api.image_cache_keys('abc')
+
+    assert api.post_vote('abc', 'user')[3] == \
+        {'data': {'image_id': 'abc', 'sub_id': 'user'}}
+
+    assert list(inspect.signature(DogApi.get_images).parameters) == \
+        ['self', 'limit', 'page', 'order']
+    assert ':param image_id: Image identificator.' in \
+        DogApi.get_image_by_id.__doc__
+    assert DogApi.cached_endpoints == (
+        'get_image_by_id', 'get_breeds_by_image_id', 'get_breed_by_id',
+        'get_breed_list')
+
+
+def test_debug_type_checks():
+    """Testing that argument types are checked in debug mode only."""
+    api = RecordingDogApi('test-key', debug=True)
+    with pytest.raises(IlligalArgumentType):
+        api.get_breed_by_id('1')
+    with pytest.raises(IlligalArgumentType):
+        api.search(breed_id='1')
+    assert api.search()[1] == 'https://api.thedogapi.com/v1/images/search'
+
+
+def test_cat_api():
+    """Testing that CatApi shares Dog API endpoints."""
+    api = CatApi('test-key')
+    assert api.base_url == 'https://api.thecatapi.com'
+    assert api.session.headers['x-api-key'] == 'test-key'
+    assert 'get_categories' in CatApi.cached_endpoints
+    assert CatApi.search is DogApi.search
+    assert AsyncCatApi.get_categories is CatApi.get_categories
+
+
+def test_undeclared_path_arg():
+    """Testing that path args have to be declared."""
+    with pytest.raises(ValueError):
+        Endpoint('get_vote', 'get', 'votes/{vote_id}',
+                 args=(Arg('image_id'),))
+
+
+def test_argument_binding():
+    """Testing that generated methods bind arguments like functions."""
+    api = RecordingDogApi('test-key', base_url='http://local/')
+    assert api.delete_breed_from_image(breed_id=5, image_id='abc')[1] == \
+        api.delete_breed_from_image('abc', 5)[1]
+    assert api.get_images(5, order='ASC')[3] == \
+        {'params': {'limit': '5', 'page': '0', 'order': 'ASC'}}
+
+    with pytest.raises(TypeError, match='missing 1 required'):
+        api.delete_breed_from_image('abc')
+    with pytest.raises(TypeError, match='unexpected keyword'):
+        api.get_images(size=1)
+    with pytest.raises(TypeError, match='multiple values'):
+        api.get_images(5, limit=5)
+    with pytest.raises(TypeError, match='positional arguments'):
+        api.get_breed_by_id(1, 2)
+
+
+def test_query_and_data_args():
+    """Testing that endpoints send both query params and payload."""
+    endpoint = Endpoint('post_note', 'post', 'images/{image_id}/notes',
+                        args=(Arg('image_id'),
+                              Arg('note', 'data'),
+                              Arg('lang', 'query', 'en')))
+    api = RecordingDogApi('test-key', base_url='http://local/')
+    assert endpoint.make_method()(api, 'abc', 'good') == (
+        'post', 'http://local/v1/images/abc/notes', 'post_note',
+        {'params': {'lang': 'en'}, 'data': {'note': 'good'}}, None)
+    assert list(inspect.signature(endpoint.make_method()).parameters) == \
+        ['self', 'image_id', 'note', 'lang']
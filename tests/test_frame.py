@@ -0,0 +1,69 @@
+"""
+DogFrame tests.
+"""
+import pytest
+
+from catdog import Breed, Category, Dog
+
+np = pytest.importorskip('numpy')
+
+from catdog.frame import DogFrame  # noqa: E402
+
+
+@pytest.fixture
+def frame():
+    """Frame of four dogs with different breeds and sizes."""
+    akita = Breed(id=1, name='Akita')
+    beagle = Breed(id=2, name='Beagle')
+    return DogFrame.from_dogs(iter([
+        Dog(id='a', url='http://a.jpg', image_width=800, image_height=400,
+            breeds=[akita, beagle], categories=[Category(id=5)]),
+        Dog(id='b', url='http://b.jpg', image_width=300, image_height=300,
+            breeds=[beagle]),
+        Dog(id='c', url='http://c.jpg', image_width=100),
+        Dog(id='d', url='http://d.jpg', image_width=600, image_height=200,
+            breeds=[beagle], categories=[])
+    ]))
+
+
+def test_columns(frame):
+    """Testing columns and ragged breed ids."""
+    assert len(frame) == 4
+    assert frame.ids.tolist() == ['a', 'b', 'c', 'd']
+    assert frame.breeds_of(0).tolist() == [1, 2]
+    assert frame.breeds_of(2).tolist() == []
+    assert frame.breed_offsets.tolist() == [0, 2, 3, 3, 4]
+    assert frame.category_ids.tolist() == [5]
+    assert frame.breed_names == {1: 'Akita', 2: 'Beagle'}
+    assert np.isnan(frame.aspect_ratios[2])
+
+
+def test_filter(frame):
+    """Testing that filter keeps ragged columns aligned."""
+    wide = frame.filter(frame.aspect_ratios > 1.5)
+    assert wide.ids.tolist() == ['a', 'd']
+    assert wide.breeds_of(0).tolist() == [1, 2]
+    assert wide.breeds_of(1).tolist() == [2]
+    assert wide.category_offsets.tolist() == [0, 1, 1]
+
+    akitas = frame.filter(frame.has_breed(1))
+    assert akitas.ids.tolist() == ['a']
+
+
+def test_aggregations(frame):
+    """Testing breed counts, group by and histogram."""
+    assert frame.breed_counts() == {1: 1, 2: 3}
+    assert frame.group_by_breed(frame.aspect_ratios) == \
+        {1: (1, 2.0), 2: (3, 2.0)}
+
+    counts, edges = DogFrame.histogram(frame.aspect_ratios, bins=2,
+                                       value_range=(1, 3))
+    assert counts.tolist() == [1, 2]
+    assert edges.tolist() == [1, 2, 3]
+
+
+def test_non_ascii_columns():
+    """Testing that ids and urls keep non-ASCII text as str."""
+    frame = DogFrame.from_dogs([Dog(id='ü1', url='http://é.jpg')])
+    assert frame.ids.tolist() == ['ü1']
+    assert frame.urls[0] == 'http://é.jpg'
@@ -0,0 +1,57 @@
+"""
+Lazy import tests.
+"""
+import json
+import subprocess
+import sys
+from os import path
+
+import pytest
+
+ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+
+
+def loaded_modules(statement, modules):
+    """Get modules loaded by the statement in a fresh interpreter.
+
+    :param statement: Python statement.
+    :type statement: str
+
+    :param modules: Names of modules to look for.
+    :type modules: list
+
+    :return loaded: Names of loaded modules.
+    :rtype: list
+    """
+    code = '%s; import sys, json; print(json.dumps([name for name in %r ' \
+           'if name in sys.modules]))' % (statement, modules)
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT)
+    return json.loads(output.decode('utf-8'))
+
+
+@pytest.mark.parametrize('statement', [
+    'import catdog',
+    'from catdog import Dog, Breed, Category',
+    'from catdog.sink import iter_models',
+    'from catdog import BreedCatalog'
+])
+def test_models_do_not_load_http_stack(statement):
+    """Testing that models are usable without HTTP libraries."""
+    assert loaded_modules(statement, [
+        'requests', 'urllib3', 'aiohttp', 'asyncio', 'numpy', 'catdog.api'
+    ]) == []
+
+
+def test_sync_client_does_not_load_async_stack():
+    """Testing that sync client doesn't import asyncio and aiohttp."""
+    assert loaded_modules('from catdog import DogApi, CatApi', [
+        'requests', 'aiohttp', 'asyncio', 'http.server', 'catdog.aio'
+    ]) == ['requests']
+
+
+def test_unknown_name():
+    """Testing that unknown names raise AttributeError."""
+    import catdog
+    with pytest.raises(AttributeError):
+        catdog.Unknown
+    assert 'DogApi' in dir(catdog)
@@ -0,0 +1,33 @@
+"""
+Models tests.
+"""
+import pickle
+
+from catdog import Breed, Dog
+
+
+def test_fields_and_extras():
+    """Testing that unknown keys go to extras and missing ones are None."""
+    dog = Dog(id='abc', url='http://a/b.jpg', sub_id='user')
+    assert dog.id == 'abc'
+    assert dog.sub_id == 'user'
+    assert dog.extras == {'sub_id': 'user'}
+    assert dog.breeds is None
+    assert dog.unknown is None
+    assert not hasattr(dog, '__dict__')
+    assert dog.keys() == ['id', 'url', 'sub_id']
+
+
+def test_to_dict_and_pickle():
+    """Testing conversion of nested models."""
+    breed = Breed(id=1, name='Akita', weight={'metric': '29 - 52'})
+    dog = Dog(id='abc', breeds=[breed])
+    assert dog.to_dict() == {
+        'id': 'abc',
+        'breeds': [{'id': 1, 'name': 'Akita',
+                    'weight': {'metric': '29 - 52'}}]
+    }
+
+    restored = pickle.loads(pickle.dumps(dog))
+    assert isinstance(restored.breeds[0], Breed)
+    assert restored.to_dict() == dog.to_dict()
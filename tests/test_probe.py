@@ -0,0 +1,70 @@
+"""
+Image probing tests.
+"""
+import struct
+
+import pytest
+
+from catdog import Dog
+from catdog.exceptions import ProbeError
+from catdog.probe import (ProbeResult, make_probe_result, next_probe_size,
+                          parse_header)
+
+
+def make_jpeg(width, height, app_size=100):
+    """Compose JPEG header with APP1 segment before the frame header."""
+    return (b'\xff\xd8' + b'\xff\xe1' + struct.pack('>H', app_size + 2) +
+            b'\0' * app_size + b'\xff\xff\xc0' +
+            struct.pack('>HBHHB', 11, 8, height, width, 3) + b'\0' * 9)
+
+
+def make_png(width, height):
+    """Compose PNG signature and IHDR chunk."""
+    return (b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' +
+            struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+
+
+@pytest.mark.parametrize('data, info', [
+    (make_png(640, 480), ('png', 640, 480)),
+    (b'GIF89a' + struct.pack('<HH', 320, 200) + b'\0' * 3,
+     ('gif', 320, 200)),
+    (make_jpeg(1024, 768), ('jpeg', 1024, 768)),
+    (make_jpeg(1024, 768)[:50], ('jpeg', None, None)),
+    (make_png(640, 480)[:20], ('png', None, None)),
+])
+def test_parse_header(data, info):
+    """Testing that format and dimensions are read from the header."""
+    assert parse_header(data) == info
+
+
+def test_parse_header_errors():
+    """Testing that unknown and malformed images are rejected."""
+    with pytest.raises(ProbeError):
+        parse_header(b'<html>')
+    with pytest.raises(ProbeError):
+        parse_header(b'\xff\xd8\x00\x00\x00\x00')
+
+
+def test_next_probe_size():
+    """Testing that truncated JPEG header is fetched in growing steps."""
+    data = make_jpeg(10, 20, app_size=5000)
+    assert next_probe_size('a.jpg', data[:4096], 4096, 65536, False)[1] \
+        == 8192
+    assert next_probe_size('a.jpg', data, 8192, 65536, True)[1] is None
+    with pytest.raises(ProbeError):
+        next_probe_size('a.jpg', data[:4096], 4096, 4096, False)
+    with pytest.raises(ProbeError):
+        next_probe_size('a.jpg', data[:4096], 8192, 65536, True)
+
+
+def test_probe_result_matches():
+    """Testing comparison of probed and reported dimensions."""
+    dog = Dog(id='a', image_width=10, image_height=20)
+    info = parse_header(make_png(10, 20))
+    assert make_probe_result(dog, (info, 24), None, 0.1).matches is True
+    dog.image_height = 30
+    assert make_probe_result(dog, (info, 24), None, 0.1).matches is False
+    result = make_probe_result(dog, None, ProbeError(), 0.1)
+    assert isinstance(result, ProbeResult)
+    assert result.bytes == 0
+    assert result.matches is None
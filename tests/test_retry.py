@@ -0,0 +1,35 @@
+"""
+Retry policy and rate limiter tests.
+"""
+from catdog.retry import RetryPolicy, TokenBucket
+
+
+def test_next_delay():
+    """Testing retry decisions of the policy."""
+    policy = RetryPolicy(max_retries=2, backoff_factor=1, budget=5)
+
+    assert policy.next_delay('get', 0, 0, 503) <= 1
+    assert policy.next_delay('get', 0, 0, 429, '3') == 3
+    assert policy.next_delay('get', 2, 0, 503) is None
+    assert policy.next_delay('get', 0, 0, 404) is None
+    assert policy.next_delay('post', 0, 0, 503) is None
+
+    # retry is not worth waiting beyond the budget
+    assert policy.next_delay('get', 1, 4, 429, '3') is None
+
+
+def test_parse_retry_after():
+    """Testing Retry-After parsing."""
+    assert RetryPolicy.parse_retry_after('120') == 120
+    assert RetryPolicy.parse_retry_after(
+        'Wed, 21 Oct 2015 07:28:00 GMT') == 0
+    assert RetryPolicy.parse_retry_after('soon') is None
+
+
+def test_token_bucket():
+    """Testing that token bucket paces requests after the burst."""
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.05 < bucket.reserve() <= 0.1
+    assert 0.15 < bucket.reserve() <= 0.2
@@ -0,0 +1,67 @@
+"""
+Request coalescing tests.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from catdog.aio import AsyncSingleFlight
+from catdog.singleflight import SingleFlight
+
+
+def test_threads_share_call():
+    """Testing that concurrent threads share one call."""
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return 'breed'
+
+    threads = [threading.Thread(
+        target=lambda: results.append(flight.do('key', fetch)))
+        for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ['breed'] * 10
+    assert flight.coalesced == 9
+    assert flight.calls == {}
+
+
+def test_threads_share_error():
+    """Testing that the error of the shared call is raised to everyone."""
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        flight.do('key', fail)
+    assert flight.calls == {}
+
+
+def test_coroutines_share_call():
+    """Testing that concurrent coroutines share one call."""
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'image'
+
+    async def run():
+        return await asyncio.gather(*[flight.do('key', fetch)
+                                      for _ in range(10)])
+
+    assert asyncio.run(run()) == ['image'] * 10
+    assert len(calls) == 1
+    assert flight.calls == {}
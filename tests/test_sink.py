@@ -0,0 +1,75 @@
+"""
+JSON Lines sink tests.
+"""
+import zlib
+
+import pytest
+
+from catdog import Breed, Dog, DogApi
+from catdog.sink import JsonLinesSink, iter_models
+
+
+@pytest.mark.parametrize('name', ['dogs.jsonl', 'dogs.jsonl.gz'])
+def test_round_trip(tmpdir, name):
+    """Testing that models are written in batches and read back lazily."""
+    file_loc = str(tmpdir.join(name))
+    dogs = [Dog(id='dog%d' % i, breeds=[Breed(id=i, name='Breed %d' % i)],
+                sub_id='user') for i in range(25)]
+
+    with JsonLinesSink(file_loc, batch_size=10) as sink:
+        for dog in dogs:
+            sink.write(dog)
+        assert len(sink.buffer) == 5
+
+    # appending to an existing file keeps it readable
+    with JsonLinesSink(file_loc) as sink:
+        sink.write(dogs[0])
+
+    loaded = iter_models(file_loc, Dog)
+    first = next(loaded)
+    assert isinstance(first.breeds[0], Breed)
+    assert first.sub_id == 'user'
+    assert [dog.to_dict() for dog in loaded] == \
+        [dog.to_dict() for dog in dogs[1:] + dogs[:1]]
+
+
+def test_save_without_url(tmpdir):
+    """Testing that models without url are saved to one JSON Lines file."""
+    api = DogApi('test-key', compress_metadata=True)
+    breeds = [Breed(id=i, name='Breed %d' % i) for i in range(3)]
+
+    report = api.save_all(breeds, out_dir=str(tmpdir))
+    assert report.failed == 0
+    assert {result.path for result in report} == \
+        {str(tmpdir.join('Breed.jsonl.gz'))}
+
+    loaded = list(iter_models(report[0].path, Breed))
+    assert [breed.name for breed in loaded] == \
+        ['Breed 0', 'Breed 1', 'Breed 2']
+    api.close()
+
+
+def test_save_writes_record(tmpdir):
+    """Testing that a direct save call writes the record right away."""
+    api = DogApi('test-key')
+    out_file_loc, size = api.save(Breed(id=1, name='x'), out_dir=str(tmpdir))
+    assert out_file_loc == str(tmpdir.join('Breed.jsonl'))
+    assert tmpdir.join('Breed.jsonl').size() == size
+    assert [breed.name for breed in iter_models(out_file_loc, Breed)] == ['x']
+    api.close()
+
+
+def test_save_compressed_records(tmpdir):
+    """Testing that direct saves share one gzip member."""
+    api = DogApi('test-key', compress_metadata=True)
+    for i in range(5):
+        out_file_loc = api.save(Breed(id=i, name='Breed %d' % i),
+                                out_dir=str(tmpdir))[0]
+    api.close()
+
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    with open(out_file_loc, 'rb') as in_file:
+        decompressor.decompress(in_file.read())
+    assert decompressor.eof and decompressor.unused_data == b''
+    assert [breed.id for breed in iter_models(out_file_loc, Breed)] == \
+        list(range(5))